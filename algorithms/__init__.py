@@ -3,6 +3,11 @@
 from .collaborativefiltering import CollaborativeFiltering
 from .truncatedsvd import TruncatedSVD
 from .mostpopular import MostPopular
-from .baselines import Baseline, default_baseline
+from .implicitals import ImplicitALS
+from .randomwalk import RandomWalk
+from .ease import EASE
+from .twostage import TwoStage
+from .blend import Blend
+from .baselines import Baseline, Trending, Sketched, default_baseline
 
 DefaultAlgorithm = CollaborativeFiltering
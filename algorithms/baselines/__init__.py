@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from .baseline import Baseline
+from .trending import Trending
+from .sketched import Sketched
 
 default_baseline = Baseline
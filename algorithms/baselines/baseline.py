@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
+from numpy import argsort, asarray, tile
 from ...datastructures import Transactions
 
 
@@ -13,6 +14,14 @@ class Baseline:
         Whether article popularity is evaluated as number of unique buyers
         (``True``) or number of times bought (``False``). Defaults to ``True``.
 
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()`.
+        Defaults to 1000.
+
+    version : int
+        Counter that increases whenever settings or data change in a way
+        that may change the ratings. Read-only.
+
     Methods
     -------
     operating_on(data) : `Baseline`
@@ -23,6 +32,15 @@ class Baseline:
         Returns an array with ratings of all articles. The higher the rating,
         the more highly recommended the article with that rating's index is.
 
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        `max_number_of_items` most popular articles in descending order,
+        sliced from a ranking that is computed only once.
+
     Examples
     --------
     >>> baseline = Baseline().operating_on(data)
@@ -33,10 +51,15 @@ class Baseline:
     >>> baseline.for_one()
     array([ 1.,  5.,  7.,  1.,  1.])
 
+    >>> baseline.top_for_one(max_number_of_items=2)
+    (array([2, 1]), array([ 7.,  5.]))
+
     """
 
     def __init__(self):
         self.__binarize = True
+        self.__block_size = 1000
+        self.__version = 0
         self.__depending_on_whether_we = {True : self.__count_unique_buyers,
                                           False: self.__sum_over_all_buys}
         self.__class_prefix = '_' + self.__class__.__name__ + '__'
@@ -50,9 +73,24 @@ class Baseline:
     def binarize(self, binarize):
         self.__check_boolean_type_of(binarize)
         if binarize != self.binarize:
-            self.__delete_precomputed()
+            self.__version += 1
         self.__binarize = binarize
 
+    @property
+    def version(self):
+        """Increases whenever settings or data that affect ratings change."""
+        return self.__version
+
+    @property
+    def block_size(self):
+        """Maximum number of customers scored at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_integer_type_and_range_of(block_size)
+        self.__block_size = block_size
+
     def operating_on(self, data):
         """Set data object for the baseline algorithm to operate on.
 
@@ -75,7 +113,10 @@ class Baseline:
         """
         self.__data = self.__transactions_type_checked(data)
         self.__delete_precomputed()
+        self.__version += 1
         self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.top_for_one = self.__top_for_one
         return self
 
     @property
@@ -92,27 +133,115 @@ class Baseline:
         array([ 1.,  5.,  7.,  1.,  1.])
 
         """
+        return self.__popularity().copy()
+
+    def __for_many(self, targets):
+        """Yields blocks of article popularity, one row per customer.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the popularity of all articles (columns)
+            repeated for up to `block_size` customers (rows).
+
+        Examples
+        --------
+        >>> baseline = Baseline().operating_on(data)
+        >>> next(baseline.for_many([3, 4]))
+        array([[ 1.,  5.,  7.,  1.,  1.],
+               [ 1.,  5.,  7.,  1.,  1.]])
+
+        """
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            yield tile(self.__popularity(), (block.size, 1))
+
+    def __top_for_one(self, target=None, max_number_of_items=5):
+        """Returns the most popular articles and their popularity.
+
+        Parameters
+        ----------
+        target : int, optional
+            Ignored, the most popular articles are the same for everyone.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their popularity,
+            sorted by popularity in descending order.
+
+        Examples
+        --------
+        >>> baseline = Baseline().operating_on(data)
+        >>> baseline.top_for_one(max_number_of_items=2)
+        (array([2, 1]), array([ 7.,  5.]))
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        items, popularity = self.__ranking()
+        return items[:head].copy(), popularity[:head].copy()
+
+    def __popularity(self):
         return self.__depending_on_whether_we[self.binarize]()
 
+    def __ranking(self):
+        if self.binarize not in self.__rankings:
+            popularity = self.__popularity()
+            items = argsort(-popularity, kind='mergesort')
+            self.__rankings[self.binarize] = (items, popularity[items])
+        return self.__rankings[self.binarize]
+
     def __count_unique_buyers(self):
         if not self.__has('number_of_buyers'):
             self.__number_of_buyers = self.__data.matrix.bool_by_col.sum(0).A1
-        return self.__number_of_buyers.copy()
+        return self.__number_of_buyers
 
     def __sum_over_all_buys(self):
         if not self.__has('number_of_buys'):
             self.__number_of_buys = self.__data.matrix.by_col.sum(0).A1
-        return self.__number_of_buys.copy()
+        return self.__number_of_buys
 
     def __delete_precomputed(self):
         if self.__has('number_of_buyers'):
             delattr(self, self.__class_prefix + 'number_of_buyers')
         if self.__has('number_of_buys'):
             delattr(self, self.__class_prefix + 'number_of_buys')
+        self.__rankings = {}
 
     def __has(self, attribute):
         return hasattr(self, self.__class_prefix + attribute)
 
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_integer_type_and_range_of(block_size):
+        error_message = '"block_size" must be a positive integer!'
+        if not isinstance(block_size, int):
+            log.error('Attempt to set block_size to non-integer type.')
+            raise TypeError(error_message)
+        if block_size < 1:
+            log.error('Attempt to set block_size to value < 1.')
+            raise ValueError(error_message)
+
     @staticmethod
     def __check_boolean_type_of(binarize):
         if not isinstance(binarize, bool):
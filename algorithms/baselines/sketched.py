@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from heapq import nlargest
+from numpy import argpartition, argsort, array, asarray, tile
+from ...datastructures import Transactions
+from ...datastructures.auxiliary import HyperLogLogs, CountMinSketch
+
+
+class Sketched:
+    """Baseline recommendation based on article popularity in a stream.
+
+    Purchase events are consumed one at a time and counted in probabilistic
+    sketches, so that memory stays fixed and small no matter how many
+    customers there are. Unique buyers per article are estimated with one
+    HyperLogLog counter each, the number of times an article was bought
+    with a Count-Min sketch. The currently most popular articles are
+    tracked as heavy hitters so that the top of the ranking is available
+    without looking at all articles.
+
+    Attributes
+    ----------
+    binarize : bool, optional
+        Whether article popularity is evaluated as (estimated) number of
+        unique buyers (``True``) or number of times bought (``False``).
+        Defaults to ``True``.
+
+    precision : int, optional
+        Each HyperLogLog counter uses 2**`precision` one-byte registers and
+        has a relative standard error of about 1.04 / sqrt(2**`precision`).
+        Must be between 4 and 16. Defaults to 8.
+
+    width : int, optional
+        Number of counters per row of the Count-Min sketch. Defaults to 2048.
+
+    depth : int, optional
+        Number of rows of the Count-Min sketch. Defaults to 4.
+
+    number_of_heavy_hitters : int, optional
+        Number of most popular articles tracked while consuming events.
+        Defaults to 100.
+
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()`.
+        Defaults to 1000.
+
+    refresh_every : int, optional
+        Number of purchase events changing the popularity after which the
+        `version` is increased. Recommendations cached on the `version`
+        lag behind by at most that many events. Defaults to 100.
+
+    number_of_events : int
+        Number of purchase events consumed so far. Read-only.
+
+    memory : int
+        Number of bytes taken up by the sketches. Read-only.
+
+    version : int
+        Counter that increases whenever settings or data change the ratings
+        and after every `refresh_every` events that did. Read-only.
+
+    Methods
+    -------
+    operating_on(data) : `Sketched`
+        Returns the `Sketched` instance it is called on with the `data`
+        object attached to it. It then `has_data` and reveals the methods ...
+
+    update(customer, article) : `Sketched`
+        Consumes one purchase event of an `article` ID by a `customer` ID.
+
+    for_one() : array
+        Returns an array with ratings of all articles. The higher the rating,
+        the more highly recommended the article with that rating's index is.
+
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        `max_number_of_items` most popular articles in descending order,
+        taken from the heavy hitters whenever there are enough of them.
+
+    Examples
+    --------
+    >>> sketched = Sketched().operating_on(data)
+    >>> sketched.update('some customer', 'bestPyHoodieMedium')
+    >>> sketched.for_one()
+    array([ 0.,  1.,  0.,  0.,  0.])
+
+    >>> recommendation = RecoBasedOn(data)
+    >>> recommendation.baseline = sketched
+
+    """
+
+    def __init__(self):
+        self.__binarize = True
+        self.__precision = 8
+        self.__width = 2048
+        self.__depth = 4
+        self.__number_of_heavy_hitters = 100
+        self.__block_size = 1000
+        self.__refresh_every = 100
+        self.__version = 0
+        self.__number_of_events = 0
+        self.__number_of_changes = 0
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def binarize(self):
+        """Count number of: buyers (``True``) or times bought (``False``)."""
+        return self.__binarize
+
+    @binarize.setter
+    def binarize(self, binarize):
+        self.__check_boolean_type_of(binarize)
+        if binarize != self.binarize:
+            self.__bump_version()
+        self.__binarize = binarize
+
+    @property
+    def precision(self):
+        """Number of bits selecting one of the registers of a HyperLogLog."""
+        return self.__precision
+
+    @precision.setter
+    def precision(self, precision):
+        self.__check_integer_type_and_range_of(precision, 'precision')
+        if not 4 <= precision <= 16:
+            log.error('Attempt to set precision to value outside [4, 16].')
+            raise ValueError('"precision" must be between 4 and 16!')
+        self.__precision = precision
+        self.__reset_sketches()
+
+    @property
+    def width(self):
+        """Number of counters per row of the Count-Min sketch."""
+        return self.__width
+
+    @width.setter
+    def width(self, width):
+        self.__check_integer_type_and_range_of(width, 'width')
+        self.__width = width
+        self.__reset_sketches()
+
+    @property
+    def depth(self):
+        """Number of rows of the Count-Min sketch."""
+        return self.__depth
+
+    @depth.setter
+    def depth(self, depth):
+        self.__check_integer_type_and_range_of(depth, 'depth')
+        self.__depth = depth
+        self.__reset_sketches()
+
+    @property
+    def number_of_heavy_hitters(self):
+        """Number of most popular articles tracked while consuming events."""
+        return self.__number_of_heavy_hitters
+
+    @number_of_heavy_hitters.setter
+    def number_of_heavy_hitters(self, number_of_heavy_hitters):
+        self.__check_integer_type_and_range_of(number_of_heavy_hitters,
+                                               'number_of_heavy_hitters')
+        self.__number_of_heavy_hitters = number_of_heavy_hitters
+        self.__reset_sketches()
+
+    @property
+    def block_size(self):
+        """Maximum number of customers scored at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_integer_type_and_range_of(block_size, 'block_size')
+        self.__block_size = block_size
+
+    @property
+    def refresh_every(self):
+        """Number of popularity-changing events per increase of version."""
+        return self.__refresh_every
+
+    @refresh_every.setter
+    def refresh_every(self, refresh_every):
+        self.__check_integer_type_and_range_of(refresh_every, 'refresh_every')
+        self.__refresh_every = refresh_every
+
+    @property
+    def number_of_events(self):
+        return self.__number_of_events
+
+    @property
+    def memory(self):
+        if not self.has_data:
+            return 0
+        return self.__unique_buyers.nbytes + self.__times_bought.nbytes
+
+    @property
+    def version(self):
+        """Increases when settings, data or enough events change ratings."""
+        return self.__version
+
+    def operating_on(self, data):
+        """Set data object for the baseline algorithm to operate on.
+
+        Only the article IDs are taken from the data. Sketches filled so
+        far are kept if the same data object is attached again.
+
+        Parameters
+        ----------
+        data : `Transactions`
+            Instance of `bestPy.datastructures.Transactions`.
+
+        Returns
+        -------
+        The instance of `Sketched` it is called on, now with the previously
+        hidden `update()`, `for_one()`, `for_many()` and `top_for_one()`
+        methods enabled and the data attached.
+
+        Examples
+        --------
+        >>> sketched = Sketched().operating_on(data)
+        >>> sketched.has_data
+        True
+
+        """
+        data = self.__transactions_type_checked(data)
+        if not (self.has_data and (data is self.__data)):
+            self.__data = data
+            self.__reset_sketches()
+        self.update = self.__update
+        self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.top_for_one = self.__top_for_one
+        return self
+
+    @property
+    def has_data(self):
+        return self.__has('data')
+
+    def __update(self, customer, article):
+        """Consumes one purchase event in constant time and memory.
+
+        Parameters
+        ----------
+        customer : object
+            ID of the customer who made the purchase.
+
+        article : object
+            ID of the article that was bought.
+
+        Returns
+        -------
+        The instance of `Sketched` it is called on.
+
+        Examples
+        --------
+        >>> sketched = Sketched().operating_on(data)
+        >>> sketched.update('some customer', 'bestPyBaseCap')
+
+        """
+        item = self.__data.item.index_of.get(article)
+        if item is None:
+            log.debug('Skipping purchase event of unknown article.')
+            return self
+        times_bought = self.__times_bought.add(item)
+        self.__track(self.__heavy_hitters[False], item, times_bought)
+        register_grew = self.__unique_buyers.add(item, customer)
+        if register_grew:
+            buyers = self.__unique_buyers.estimate(item)
+            self.__track(self.__heavy_hitters[True], item, buyers)
+        self.__number_of_events += 1
+        # Repeat buyers do not change the number of unique buyers.
+        if register_grew or not self.__binarize:
+            self.__number_of_changes += 1
+            if self.__number_of_changes >= self.__refresh_every:
+                self.__bump_version()
+        return self
+
+    def __for_one(self, target=None):
+        """Returns array with the estimated popularity of all articles.
+
+        Examples
+        --------
+        >>> sketched = Sketched().operating_on(data)
+        >>> sketched.for_one()
+        array([ 0.,  1.,  0.,  0.,  0.])
+
+        """
+        return self.__popularity()
+
+    def __for_many(self, targets):
+        """Yields blocks of estimated article popularity, one row per customer.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the popularity of all articles (columns)
+            repeated for up to `block_size` customers (rows).
+
+        """
+        targets = asarray(targets, dtype=int)
+        popularity = self.__popularity()
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            yield tile(popularity, (block.size, 1))
+
+    def __top_for_one(self, target=None, max_number_of_items=5):
+        """Returns the most popular articles and their estimated popularity.
+
+        Parameters
+        ----------
+        target : int, optional
+            Ignored, the most popular articles are the same for everyone.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their popularity,
+            sorted by popularity in descending order.
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        hitters = self.__heavy_hitters[self.__binarize]
+        if head <= len(hitters):
+            top = nlargest(head, hitters.items(), key=lambda hit: hit[1])
+            items, popularity = zip(*top)
+            return array(items, dtype=int), array(popularity, dtype=float)
+        popularity = self.__popularity()
+        head = min(head, popularity.size)
+        top = argpartition(popularity, -head)[-head:]
+        top = top[argsort(-popularity[top], kind='mergesort')]
+        return top, popularity[top]
+
+    def __track(self, hitters, item, estimate):
+        """Keep `item` among the heavy hitters if it is popular enough."""
+        if item in hitters or len(hitters) < self.__number_of_heavy_hitters:
+            hitters[item] = estimate
+            return
+        weakest = min(hitters, key=hitters.get)
+        if estimate > hitters[weakest]:
+            del hitters[weakest]
+            hitters[item] = estimate
+
+    def __popularity(self):
+        if self.__binarize:
+            return self.__unique_buyers.estimates()
+        return self.__times_bought.estimates().astype(float)
+
+    def __reset_sketches(self):
+        if not self.has_data:
+            return
+        if self.__number_of_events > 0:
+            log.warning('Resetting the sketches filled with {} purchase'
+                        ' events.'.format(self.__number_of_events))
+        n_items = self.__data.item.count
+        self.__unique_buyers = HyperLogLogs(n_items, self.__precision)
+        self.__times_bought = CountMinSketch(n_items, self.__width,
+                                             self.__depth)
+        self.__heavy_hitters = {True: {}, False: {}}
+        self.__number_of_events = 0
+        self.__bump_version()
+
+    def __bump_version(self):
+        self.__version += 1
+        self.__number_of_changes = 0
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_integer_type_and_range_of(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __check_boolean_type_of(value):
+        if not isinstance(value, bool):
+            log.error('Attempt to set "binarize" to non-boolean type.')
+            raise TypeError('Attribute "binarize" must be True or False!')
+
+    @staticmethod
+    def __transactions_type_checked(data):
+        if not isinstance(data, Transactions):
+            log.error('Attempt to set incompatible data type.'
+                      ' Must be <Transactions>.')
+            raise TypeError('Data must be of type <Transactions>!')
+        return data
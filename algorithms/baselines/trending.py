@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from datetime import datetime
+from numpy import argpartition, argsort, asarray, fromiter, tile, zeros
+from ...datastructures import Transactions
+
+MAX_EXPONENT = 512.0
+
+
+class Trending:
+    """Baseline recommendation based on recent article popularity.
+
+    Popularity is counted from a stream of timestamped purchase events,
+    either over a sliding time window or with exponentially decaying
+    weights. Each event is processed in constant time, so that the
+    popularity is always up to date without re-reading any data.
+
+    Attributes
+    ----------
+    window : float, optional
+        Length of the sliding time window in seconds. Purchases older than
+        that, relative to the latest event, do not count anymore. Defaults
+        to 86400, i.e., 24 hours.
+
+    number_of_buckets : int, optional
+        Number of time buckets the window is divided into. The window
+        slides in steps of `window` / `number_of_buckets`. Defaults to 24.
+
+    half_life : float, optional
+        If set, purchases are not counted within a sliding window but with
+        a weight that halves every `half_life` seconds. Defaults to
+        ``None``, meaning that the sliding window is used.
+
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()`.
+        Defaults to 1000.
+
+    refresh_every : int, optional
+        Number of counted purchase events after which the `version` is
+        increased. Recommendations cached on the `version` lag behind by
+        at most that many events. Defaults to 100.
+
+    number_of_events : int
+        Number of purchase events consumed so far. Read-only.
+
+    number_of_skipped_events : int
+        Number of events that were skipped because the article is unknown
+        or the event is older than the window. Read-only.
+
+    version : int
+        Counter that increases whenever settings or data change and after
+        every `refresh_every` counted events. Read-only.
+
+    Methods
+    -------
+    operating_on(data) : `Trending`
+        Returns the `Trending` instance it is called on with the `data`
+        object attached to it. It then `has_data` and reveals the methods ...
+
+    update(timestamp, customer, article) : `Trending`
+        Consumes one purchase event. `timestamp` is either a number of
+        seconds or a `datetime` object, `article` an article ID.
+
+    for_one() : array
+        Returns an array with ratings of all articles. The higher the rating,
+        the more highly recommended the article with that rating's index is.
+
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        `max_number_of_items` currently most popular articles in descending
+        order.
+
+    Examples
+    --------
+    >>> trending = Trending().operating_on(data)
+    >>> trending.window = 3600
+    >>> trending.update(1490000000, 'some customer', 'bestPyHoodieMedium')
+    >>> trending.for_one()
+    array([ 0.,  1.,  0.,  0.,  0.])
+
+    >>> recommendation = RecoBasedOn(data)
+    >>> recommendation.baseline = trending
+
+    """
+
+    def __init__(self):
+        self.__window = 86400.0
+        self.__number_of_buckets = 24
+        self.__half_life = None
+        self.__block_size = 1000
+        self.__refresh_every = 100
+        self.__version = 0
+        self.__number_of_events = 0
+        self.__number_of_changes = 0
+        self.__number_of_skipped_events = 0
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def window(self):
+        """Length of the sliding time window in seconds."""
+        return self.__window
+
+    @window.setter
+    def window(self, window):
+        self.__check_positive_number_type_and_value_of(window, 'window')
+        self.__window = float(window)
+        self.__reset_counts()
+
+    @property
+    def number_of_buckets(self):
+        """Number of time buckets the sliding window is divided into."""
+        return self.__number_of_buckets
+
+    @number_of_buckets.setter
+    def number_of_buckets(self, number_of_buckets):
+        self.__check_integer_type_and_range_of(number_of_buckets,
+                                               'number_of_buckets')
+        self.__number_of_buckets = number_of_buckets
+        self.__reset_counts()
+
+    @property
+    def half_life(self):
+        """Time in seconds after which the weight of a purchase halves."""
+        return self.__half_life
+
+    @half_life.setter
+    def half_life(self, half_life):
+        if half_life is not None:
+            self.__check_positive_number_type_and_value_of(half_life,
+                                                           'half_life')
+            half_life = float(half_life)
+        self.__half_life = half_life
+        self.__reset_counts()
+
+    @property
+    def block_size(self):
+        """Maximum number of customers scored at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_integer_type_and_range_of(block_size, 'block_size')
+        self.__block_size = block_size
+
+    @property
+    def refresh_every(self):
+        """Number of counted events per increase of version."""
+        return self.__refresh_every
+
+    @refresh_every.setter
+    def refresh_every(self, refresh_every):
+        self.__check_integer_type_and_range_of(refresh_every, 'refresh_every')
+        self.__refresh_every = refresh_every
+
+    @property
+    def number_of_events(self):
+        return self.__number_of_events
+
+    @property
+    def number_of_skipped_events(self):
+        return self.__number_of_skipped_events
+
+    @property
+    def version(self):
+        """Increases with settings, data, and every `refresh_every` events."""
+        return self.__version
+
+    def operating_on(self, data):
+        """Set data object for the baseline algorithm to operate on.
+
+        Only the article IDs are taken from the data. Counts consumed
+        so far are kept if the same data object is attached again.
+
+        Parameters
+        ----------
+        data : `Transactions`
+            Instance of `bestPy.datastructures.Transactions`.
+
+        Returns
+        -------
+        The instance of `Trending` it is called on, now with the previously
+        hidden `update()`, `for_one()`, `for_many()` and `top_for_one()`
+        methods enabled and the data attached.
+
+        Examples
+        --------
+        >>> trending = Trending().operating_on(data)
+        >>> trending.has_data
+        True
+
+        """
+        data = self.__transactions_type_checked(data)
+        if not (self.has_data and (data is self.__data)):
+            self.__data = data
+            self.__reset_counts()
+        self.update = self.__update
+        self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.top_for_one = self.__top_for_one
+        return self
+
+    @property
+    def has_data(self):
+        return self.__has('data')
+
+    def __update(self, timestamp, customer, article):
+        """Consumes one purchase event in constant time.
+
+        Parameters
+        ----------
+        timestamp : float or datetime
+            Time of the purchase, either in seconds or as `datetime` object.
+
+        customer : object
+            ID of the customer who made the purchase.
+
+        article : object
+            ID of the article that was bought.
+
+        Returns
+        -------
+        The instance of `Trending` it is called on.
+
+        Examples
+        --------
+        >>> trending = Trending().operating_on(data)
+        >>> trending.update(1490000000, 'some customer', 'bestPyBaseCap')
+
+        """
+        seconds = self.__seconds_from(timestamp)
+        item = self.__data.item.index_of.get(article)
+        if item is None:
+            log.debug('Skipping purchase event of unknown article.')
+            self.__number_of_skipped_events += 1
+            return self
+        if self.__half_life is None:
+            counted = self.__counted_in_window(seconds, item)
+        else:
+            counted = self.__counted_with_decay(seconds, item)
+        if counted:
+            self.__number_of_events += 1
+            self.__number_of_changes += 1
+            if self.__number_of_changes >= self.__refresh_every:
+                self.__bump_version()
+        else:
+            log.debug('Skipping purchase event older than the time window.')
+            self.__number_of_skipped_events += 1
+        return self
+
+    def __for_one(self, target=None):
+        """Returns array with the current popularity of all articles.
+
+        Examples
+        --------
+        >>> trending = Trending().operating_on(data)
+        >>> trending.for_one()
+        array([ 0.,  1.,  0.,  0.,  0.])
+
+        """
+        return self.__popularity()
+
+    def __for_many(self, targets):
+        """Yields blocks of current article popularity, one row per customer.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the popularity of all articles (columns)
+            repeated for up to `block_size` customers (rows).
+
+        """
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            yield tile(self.__popularity(), (block.size, 1))
+
+    def __top_for_one(self, target=None, max_number_of_items=5):
+        """Returns the currently most popular articles and their popularity.
+
+        Parameters
+        ----------
+        target : int, optional
+            Ignored, the most popular articles are the same for everyone.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their popularity,
+            sorted by popularity in descending order.
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        popularity = self.__popularity()
+        head = min(head, popularity.size)
+        top = argpartition(popularity, -head)[-head:]
+        top = top[argsort(-popularity[top], kind='mergesort')]
+        return top, popularity[top]
+
+    def __counted_in_window(self, seconds, item):
+        bucket = int(seconds // self.__bucket_width())
+        if self.__latest_bucket is None:
+            self.__latest_bucket = bucket
+        if bucket > self.__latest_bucket:
+            self.__advance_to(bucket)
+        if bucket <= self.__latest_bucket - self.__number_of_buckets:
+            return False
+        counts = self.__bucket_counts[bucket % self.__number_of_buckets]
+        counts[item] = counts.get(item, 0) + 1
+        self.__window_counts[item] += 1
+        return True
+
+    def __advance_to(self, bucket):
+        """Empty the buckets that fall out of the window, oldest first.
+
+        Each bucket only keeps the counts of the articles bought within
+        it, so that emptying it touches only these articles instead of
+        all of them.
+
+        """
+        first = max(self.__latest_bucket + 1,
+                    bucket - self.__number_of_buckets + 1)
+        for expired in range(first, bucket + 1):
+            counts = self.__bucket_counts[expired % self.__number_of_buckets]
+            if counts:
+                items = fromiter(counts.keys(), dtype=int, count=len(counts))
+                self.__window_counts[items] -= fromiter(
+                    counts.values(), dtype=int, count=len(counts))
+                counts.clear()
+        self.__latest_bucket = bucket
+
+    def __counted_with_decay(self, seconds, item):
+        if self.__reference_time is None:
+            self.__reference_time = seconds
+        exponent = (seconds - self.__reference_time) / self.__half_life
+        if exponent > MAX_EXPONENT:
+            self.__decayed_counts *= 2.0**(-exponent)
+            self.__reference_time = seconds
+            exponent = 0.0
+        self.__decayed_counts[item] += 2.0**exponent
+        self.__latest_time = max(self.__latest_time, seconds)
+        return True
+
+    def __popularity(self):
+        if self.__half_life is None:
+            return self.__window_counts.astype(float)
+        if self.__reference_time is None:
+            return self.__decayed_counts.copy()
+        exponent = (self.__latest_time - self.__reference_time)
+        return self.__decayed_counts * 2.0**(-exponent / self.__half_life)
+
+    def __bucket_width(self):
+        return self.__window / self.__number_of_buckets
+
+    def __reset_counts(self):
+        if not self.has_data:
+            return
+        if self.__number_of_events > 0:
+            log.warning('Resetting the popularity counted from {} purchase'
+                        ' events.'.format(self.__number_of_events))
+        n_items = self.__data.item.count
+        self.__bucket_counts = [{} for _ in range(self.__number_of_buckets)]
+        self.__window_counts = zeros(n_items, dtype=int)
+        self.__latest_bucket = None
+        self.__decayed_counts = zeros(n_items)
+        self.__reference_time = None
+        self.__latest_time = float('-inf')
+        self.__number_of_events = 0
+        self.__number_of_skipped_events = 0
+        self.__bump_version()
+
+    def __bump_version(self):
+        self.__version += 1
+        self.__number_of_changes = 0
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    @staticmethod
+    def __seconds_from(timestamp):
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        if isinstance(timestamp, bool) or not isinstance(timestamp,
+                                                         (int, float)):
+            log.error('Attempt to update popularity with a timestamp that is'
+                      ' neither a number nor a datetime object.')
+            raise TypeError('Timestamp must be a number or a datetime!')
+        return float(timestamp)
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_integer_type_and_range_of(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __check_positive_number_type_and_value_of(value, name):
+        error_message = '"{}" must be a positive number!'.format(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            log.error('Attempt to set {} to non-numeric type.'.format(name))
+            raise TypeError(error_message)
+        if value <= 0:
+            log.error('Attempt to set {} to value <= 0.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __transactions_type_checked(data):
+        if not isinstance(data, Transactions):
+            log.error('Attempt to set incompatible data type.'
+                      ' Must be <Transactions>.')
+            raise TypeError('Data must be of type <Transactions>!')
+        return data
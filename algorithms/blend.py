@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import argpartition, argsort, asarray, einsum, maximum, newaxis
+from numpy import sqrt, vstack
+from .collaborativefiltering import CollaborativeFiltering
+from .truncatedsvd import TruncatedSVD
+from .mostpopular import MostPopular
+from .versioning import combined_version, version_before_replacing
+from ..datastructures import Transactions
+
+
+class Blend:
+    """Hybrid recommendation by a weighted sum of several algorithms.
+
+    Each of the blended algorithms rates all articles for a customer. The
+    ratings of every algorithm are first normalized separately, so that
+    algorithms with very different rating scales can be mixed, and then
+    summed with the given weights. This is done one algorithm at a time,
+    in place, in a single array and, with `for_many()`, for whole blocks of
+    customers at a time.
+
+    Attributes
+    ----------
+    algorithms : tuple
+        Names of the blended algorithms. Defaults to
+        `CollaborativeFiltering`, `TruncatedSVD`, and `MostPopular`.
+        Read-only, see `blending()`.
+
+    weights : tuple
+        One non-negative weight per blended algorithm. Reset to all 1.0
+        whenever the algorithms are replaced with `blending()`.
+
+    normalization : str, optional
+        How the ratings of each algorithm are normalized for each customer
+        before they are weighted. One of 'none' (ratings are used as they
+        are), 'max' (divided by their largest absolute value), 'minmax'
+        (rescaled to the interval from 0 to 1), or 'zscore' (shifted by
+        their mean and divided by their standard deviation). With the
+        latter two, ratings that are all the same are normalized to zero.
+        Defaults to 'minmax'.
+
+    block_size : int, optional
+        Maximum number of customers rated together by `for_many()`.
+        Defaults to 250.
+
+    version : int
+        Counter that increases whenever settings or blended algorithms
+        change in a way that may change the ratings. Read-only.
+
+    Methods
+    -------
+    blending(*algorithms) : `Blend`
+        Returns the `Blend` instance it is called on with the blended
+        algorithm objects replaced by `algorithms`.
+
+    operating_on(data) : `Blend`
+        Returns the `Blend` instance it is called on with the `data` object
+        attached to it and to all blended algorithms. It then `has_data`
+        and reveals the methods ...
+
+    for_one(target) : array
+        Returns an array with the blended ratings of all articles for the
+        customer with the internal integer index `target`.
+
+    for_many(targets) : generator
+        Yields 2-D arrays with the blended ratings of all articles (columns)
+        for up to `block_size` of the customers (rows) in `targets` at a
+        time.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        `max_number_of_items` articles with the highest blended rating for
+        the customer with the internal integer index `target`, in
+        descending order.
+
+    Examples
+    --------
+    >>> algorithm = Blend().blending(CollaborativeFiltering(),
+    ...                              TruncatedSVD(), MostPopular())
+    >>> algorithm.weights = (0.6, 0.3, 0.1)
+    >>> algorithm.normalization = 'max'
+    >>> recommendation = RecoBasedOn(data).using(algorithm)
+
+    """
+
+    def __init__(self):
+        self.__algorithms = (CollaborativeFiltering(),
+                             TruncatedSVD(),
+                             MostPopular())
+        self.__weights = (1.0, 1.0, 1.0)
+        self.__normalization = 'minmax'
+        self.__block_size = 250
+        self.__version = 0
+        self.__normalized_by = {'none'  : self.__unchanged,
+                                'max'   : self.__divided_by_max,
+                                'minmax': self.__min_max_scaled,
+                                'zscore': self.__standardized}
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def algorithms(self):
+        """Names of the blended algorithms."""
+        return tuple(algorithm.__class__.__name__
+                     for algorithm in self.__algorithms)
+
+    @property
+    def weights(self):
+        """One non-negative weight per blended algorithm."""
+        return self.__weights
+
+    @weights.setter
+    def weights(self, weights):
+        weights = self.__weights_checked(weights)
+        if weights != self.__weights:
+            self.__version += 1
+        self.__weights = weights
+
+    @property
+    def normalization(self):
+        """How the ratings of each algorithm are normalized."""
+        return self.__normalization
+
+    @normalization.setter
+    def normalization(self, normalization):
+        self.__check_choice_of(normalization)
+        if normalization != self.__normalization:
+            self.__version += 1
+        self.__normalization = normalization
+
+    @property
+    def block_size(self):
+        """Maximum number of customers rated at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_positive_integer(block_size, 'block_size')
+        self.__block_size = block_size
+
+    @property
+    def version(self):
+        """Increases whenever settings or blended algorithms change.
+
+        Sums the own counter and the versions of all blended algorithms.
+        When the algorithms are replaced, the counter first skips their
+        sum, so no earlier version is ever reported again. The version is
+        ``None`` while any of the blended algorithms has none.
+
+        """
+        return combined_version(self.__version, self.__algorithms)
+
+    def blending(self, *algorithms):
+        """Set the algorithm objects to blend.
+
+        Parameters
+        ----------
+        *algorithms : objects
+            Algorithm objects. Those with a `for_many()` method rate whole
+            blocks of customers at once, all others rate one customer at a
+            time with their `for_one()` method.
+
+        Returns
+        -------
+        The instance of `Blend` it is called on with the algorithms set and
+        all their weights reset to 1.0.
+
+        Examples
+        --------
+        >>> algorithm = Blend().blending(Baseline(), RandomWalk())
+        >>> algorithm.weights
+        (1.0, 1.0)
+
+        """
+        if not algorithms:
+            log.error('Attempt to blend no algorithms.')
+            raise ValueError('At least one algorithm to blend is required!')
+        for algorithm in algorithms:
+            self.__check_base_attributes_of(algorithm)
+        self.__version = version_before_replacing(self.__version,
+                                                  self.__algorithms)
+        if self.has_data:
+            algorithms = tuple(self.__attached(algorithm)
+                               for algorithm in algorithms)
+        self.__algorithms = tuple(algorithms)
+        self.__weights = (1.0,) * len(algorithms)
+        return self
+
+    def operating_on(self, data):
+        """Set data object for the algorithm to operate on.
+
+        Parameters
+        ----------
+        data : `Transactions`
+            Instance of `bestPy.datastructures.Transactions`.
+
+        Returns
+        -------
+        The instance of `Blend` it is called on, now with the previously
+        hidden `for_one()`, `for_many()`, and `top_for_one()` methods
+        enabled and the data attached.
+
+        Examples
+        --------
+        >>> algorithm = Blend().operating_on(data)
+        >>> algorithm.has_data
+        True
+
+        """
+        self.__data = self.__transactions_type_checked(data)
+        self.__algorithms = tuple(self.__attached(algorithm)
+                                  for algorithm in self.__algorithms)
+        self.__version += 1
+        self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.top_for_one = self.__top_for_one
+        return self
+
+    @property
+    def has_data(self):
+        return self.__has('data')
+
+    def __for_one(self, target):
+        """Blend the ratings of all algorithms for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        array : float
+            Blended suitability ratings of all items for the target customer.
+
+        Examples
+        --------
+        >>> ratings = Blend().operating_on(data)
+        >>> customer = 245
+        >>> ratings.for_one(customer)
+        array([ 0.        ,  1.09876543, ...,  0.06451613])
+
+        """
+        return self.__blended(self.__row_of_ratings_from, target)[0]
+
+    def __for_many(self, targets):
+        """Blend the ratings of all algorithms for blocks of customers.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the blended suitability ratings of all articles
+            (columns) for up to `block_size` of the target customers (rows).
+
+        """
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            yield self.__blended(self.__block_of_ratings_from, block)
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the articles with the highest blended rating.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their blended ratings,
+            sorted by rating in descending order.
+
+        Examples
+        --------
+        >>> ratings = Blend().operating_on(data)
+        >>> customer = 245
+        >>> ratings.top_for_one(customer, 2)
+        (array([ 7, 19]), array([ 2.62820513,  2.57692308]))
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        item_scores = self.__for_one(target)
+        head = min(head, item_scores.size)
+        top = argpartition(item_scores, -head)[-head:]
+        top = top[argsort(-item_scores[top], kind='mergesort')]
+        return top, item_scores[top]
+
+    def __blended(self, ratings_from, targets):
+        """Weighted sum of the normalized ratings of all algorithms.
+
+        The 2-D ratings (customers times articles) of one algorithm at a
+        time are normalized and weighted in place and then added to the
+        ratings of the first, so that memory does not grow with the number
+        of blended algorithms.
+
+        """
+        blended = None
+        for algorithm, weight in zip(self.__algorithms, self.__weights):
+            ratings = asarray(ratings_from(algorithm, targets), dtype=float)
+            self.__normalized_by[self.__normalization](ratings)
+            ratings *= weight
+            if blended is None:
+                blended = ratings
+            else:
+                blended += ratings
+        return blended
+
+    @staticmethod
+    def __row_of_ratings_from(algorithm, target):
+        return algorithm.for_one(target)[newaxis, :]
+
+    @staticmethod
+    def __block_of_ratings_from(algorithm, block):
+        if hasattr(algorithm, 'for_many'):
+            blocks = list(algorithm.for_many(block))
+            return blocks[0] if len(blocks) == 1 else vstack(blocks)
+        return vstack([algorithm.for_one(target) for target in block])
+
+    @staticmethod
+    def __unchanged(ratings):
+        pass
+
+    @staticmethod
+    def __divided_by_max(ratings):
+        largest = maximum(ratings.max(axis=1), -ratings.min(axis=1))
+        largest[largest == 0.0] = 1.0
+        ratings /= largest[:, newaxis]
+
+    @staticmethod
+    def __min_max_scaled(ratings):
+        smallest = ratings.min(axis=1, keepdims=True)
+        spread = ratings.max(axis=1, keepdims=True) - smallest
+        spread[spread == 0.0] = 1.0
+        ratings -= smallest
+        ratings /= spread
+
+    @staticmethod
+    def __standardized(ratings):
+        ratings -= ratings.mean(axis=1, keepdims=True)
+        spread = sqrt(einsum('ij,ij->i', ratings, ratings) / ratings.shape[1])
+        spread[spread == 0.0] = 1.0
+        ratings /= spread[:, newaxis]
+
+    def __attached(self, algorithm):
+        algorithm = algorithm.operating_on(self.__data)
+        self.__check_data_attributes_of(algorithm)
+        return algorithm
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    def __weights_checked(self, weights):
+        error_message = ('"weights" must be one non-negative number'
+                         ' per algorithm!')
+        try:
+            weights = tuple(weights)
+        except TypeError:
+            log.error('Attempt to set weights to non-iterable type.')
+            raise TypeError(error_message)
+        if any(isinstance(weight, bool) or
+               not isinstance(weight, (int, float)) for weight in weights):
+            log.error('Attempt to set weights to non-numeric type.')
+            raise TypeError(error_message)
+        if len(weights) != len(self.__algorithms):
+            log.error('Attempt to set {} weights for {} algorithms.'.format(
+                len(weights), len(self.__algorithms)))
+            raise ValueError(error_message)
+        if any(weight < 0 for weight in weights):
+            log.error('Attempt to set weights to values < 0.')
+            raise ValueError(error_message)
+        return tuple(float(weight) for weight in weights)
+
+    def __check_choice_of(self, normalization):
+        if normalization not in self.__normalized_by:
+            log.error('Attempt to set normalization to unknown value.')
+            raise ValueError('Attribute "normalization" must be one of:'
+                             ' {}!'.format(', '.join(
+                                 sorted(self.__normalized_by))))
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_positive_integer(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __transactions_type_checked(data):
+        if not isinstance(data, Transactions):
+            log.error('Attempt to set incompatible data type.'
+                      ' Must be <Transactions>.')
+            raise TypeError('Data must be of type <Transactions>!')
+        return data
+
+    @staticmethod
+    def __check_base_attributes_of(algorithm):
+        """Check methods of blended algorithms before they get data."""
+        if not hasattr(algorithm, 'operating_on'):
+            log.error('Attempt to set object lacking mandatory'
+                      ' "operating_on()" method.')
+            raise AttributeError('Object lacks "operating_on()" method!')
+        if not callable(algorithm.operating_on):
+            log.error('The "operating_on()" method of this object'
+                      ' is not callable.')
+            raise TypeError('"operating_on()" method of object not callable!')
+        if not hasattr(algorithm, 'has_data'):
+            log.error('Attempt to set object lacking mandatory'
+                      ' "has_data" attribute.')
+            raise AttributeError('Object lacks "has_data" attribute!')
+
+    @staticmethod
+    def __check_data_attributes_of(algorithm):
+        """Check methods of blended algorithms after they got data."""
+        if not algorithm.has_data:
+            log.error("Object's 'has_data' attribute returned False"
+                      " after attaching data.")
+            raise ValueError('Cannot attach data to object!')
+        if not hasattr(algorithm, 'for_one'):
+            log.error('Attempt to set object lacking mandatory'
+                      ' "for_one()" method.')
+            raise AttributeError('Object lacks "for_one()" method!')
+        if not callable(algorithm.for_one):
+            log.error('Attempt to set object with a "for_one()" method'
+                      ' that is not callable.')
+            raise TypeError('"for_one()" method of object not callable!')
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
+from numpy import arange, argpartition, asarray, bincount, cumsum, diff, full
+from numpy import lexsort, minimum, ones, repeat, unique, zeros
 from .similarities import default_similarity, all_similarities
+from .neighbourhood import neighbour_scores, largest
+from .versioning import combined_version, version_before_replacing
 from .baselines import default_baseline
 from ..datastructures import Transactions
 
@@ -25,6 +29,20 @@ class CollaborativeFiltering:
         Fall-back algorithm needed for customers that only bought articles
         no one else bought. Defaults to `bestPy.algorithms.Baseline`.
 
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()`.
+        Defaults to 1000.
+
+    max_similar_items : int, optional
+        Number of most similar articles kept per article in the table
+        that `similar_to_one()` and `similar_to_many()` look up.
+        Defaults to 100.
+
+    version : int
+        Counter that increases whenever settings or data of the algorithm
+        or of its baseline change in a way that may change the ratings.
+        Read-only.
+
     Methods
     -------
     operating_on(data) : `CollaborativeFiltering`
@@ -36,6 +54,38 @@ class CollaborativeFiltering:
         the internal integer index `target`. The higher the rating,
         the more highly recommended the article is for customer `target`.
 
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    for_history(history) : array
+        Returns an array with ratings of all articles for a customer, new
+        or not, with the given purchase `history`, computed from the
+        existing similarity matrix.
+
+    sparse_for_one(target) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of
+        only the articles with a non-zero rating for the customer with the
+        internal integer index `target`, in no particular order.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        (up to) `max_number_of_items` highest-rated articles for the customer
+        with the internal integer index `target`, in descending order.
+        Only the neighbours of articles bought by `target` are visited.
+
+    similar_to_one(item, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the similarities
+        of the (up to) `max_number_of_items` articles most similar to the
+        article with the internal integer index `item`, in descending order.
+
+    similar_to_many(items, max_number_of_items) : tuple
+        Returns two 2-D arrays with the indices and the similarities of the
+        (up to) `max_number_of_items` articles (columns) most similar to
+        each of the articles with the internal integer indices in `items`
+        (rows). Rows with fewer similar articles are padded with index -1
+        and similarity -inf.
+
     Examples
     --------
     >>> ratings = CollaborativeFiltering().operating_on(data)
@@ -53,12 +103,18 @@ class CollaborativeFiltering:
     >>> ratings.for_one(customer)
     array([ 0.16129032,  0.09677419, ...., 0.06451613])
 
+    >>> ratings.top_for_one(customer, 2)
+    (array([ 7, 19]), array([ 0.62820513,  0.57692308]))
+
     """
 
     def __init__(self):
         self.__binarize = True
         self.__similarity = default_similarity
         self.__baseline = default_baseline()
+        self.__block_size = 1000
+        self.__max_similar_items = 100
+        self.__version = 0
         self.__class_prefix = '_' + self.__class__.__name__ + '__'
 
     @property
@@ -68,7 +124,10 @@ class CollaborativeFiltering:
 
     @binarize.setter
     def binarize(self, binarize):
-        self.__binarize = self.__boolean_type_checked(binarize)
+        binarize = self.__boolean_type_checked(binarize)
+        if binarize != self.__binarize:
+            self.__version += 1
+        self.__binarize = binarize
 
     @property
     def similarity(self):
@@ -80,6 +139,7 @@ class CollaborativeFiltering:
         similarity = self.__permitted(similarity)
         if similarity != self.__similarity:
             self.__delete_sim_mat()
+            self.__version += 1
         self.__similarity = similarity
 
     @property
@@ -89,11 +149,49 @@ class CollaborativeFiltering:
 
     @baseline.setter
     def baseline(self, baseline):
-        self.__baseline = self.__base_attribute_checked(baseline)
+        baseline = self.__base_attribute_checked(baseline)
+        self.__version = version_before_replacing(self.__version,
+                                                  [self.__baseline])
+        self.__baseline = baseline
         if self.has_data:
             self.__baseline = self.__baseline.operating_on(self.__data)
             self.__baseline = self.__data_attribute_checked(self.__baseline)
 
+    @property
+    def version(self):
+        """Increases whenever settings or data that affect ratings change.
+
+        The version of the baseline for uncomparable customers is added.
+        Replacing the baseline first skips all versions the old one added,
+        so the version never returns to an earlier value. It is ``None``
+        while the baseline has no version.
+
+        """
+        return combined_version(self.__version, [self.__baseline])
+
+    @property
+    def block_size(self):
+        """Maximum number of customers scored at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__block_size = self.__type_and_range_checked(block_size,
+                                                          'block_size')
+
+    @property
+    def max_similar_items(self):
+        """Number of most similar articles kept per article."""
+        return self.__max_similar_items
+
+    @max_similar_items.setter
+    def max_similar_items(self, max_similar_items):
+        max_similar_items = self.__type_and_range_checked(max_similar_items,
+                                                          'max_similar_items')
+        if max_similar_items != self.__max_similar_items:
+            self.__delete_similar_items()
+        self.__max_similar_items = max_similar_items
+
     def operating_on(self, data):
         """Set data object for the algorithm to operate on.
 
@@ -118,9 +216,16 @@ class CollaborativeFiltering:
         self.__baseline = self.__baseline.operating_on(data)
         self.__baseline = self.__data_attribute_checked(self.__baseline)
         self.__delete_sim_mat()
+        self.__version += 1
         self.__depending_on_whether_we = {True: self.__data.matrix.bool_by_row,
                                           False: self.__data.matrix.by_row}
         self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.for_history = self.__for_history
+        self.sparse_for_one = self.__sparse_for_one
+        self.top_for_one = self.__top_for_one
+        self.similar_to_one = self.__similar_to_one
+        self.similar_to_many = self.__similar_to_many
         return self
 
     @property
@@ -155,22 +260,316 @@ class CollaborativeFiltering:
         history_vector = self.__depending_on_whether_we[self.binarize][target]
         return history_vector.dot(self.__similarity_matrix()).A[0]
 
+    def __for_many(self, targets):
+        """Make recommendations for blocks of target customers.
+
+        The purchase histories of up to `block_size` customers are stacked
+        into one sparse matrix and multiplied with the similarity matrix
+        in a single sparse-sparse product.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the suitability ratings of all articles (columns)
+            for up to `block_size` of the target customers (rows).
+
+        Examples
+        --------
+        >>> ratings = CollaborativeFiltering().operating_on(data)
+        >>> customers = [245, 246]
+        >>> next(ratings.for_many(customers))
+        array([[ 0.16129032,  0.09677419, ...., 0.06451613],
+               [ 0.03225806,  0.12903226, ...., 0.        ]])
+
+        """
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            history = self.__depending_on_whether_we[self.binarize][block]
+            block_ratings = history.dot(self.__similarity_matrix()).toarray()
+            for row in self.__data._uncomparable_users[block].nonzero()[0]:
+                log.info('Uncomparable user with ID {}. Returning baseline'
+                         ' recommendation.'.format(
+                             self.__data.user.id_of[block[row]]))
+                block_ratings[row] = self.__baseline.for_one(block[row])
+            yield block_ratings
+
+    def __for_history(self, history):
+        """Make a recommendation from a purchase history alone.
+
+        Only the neighbour lists of the articles in the history are visited,
+        just like for a known customer. Neither the data nor the similarity
+        matrix are changed.
+
+        Parameters
+        ----------
+        history : array-like
+            Internally used integer indices of the articles bought. Articles
+            bought more than once may be repeated and then count multiple
+            times unless `binarize` is ``True``.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of all items for a customer with that
+            purchase history.
+
+        Examples
+        --------
+        >>> algorithm = CollaborativeFiltering().operating_on(data)
+        >>> algorithm.for_history([3, 17, 17])
+        array([ 0.03125   ,  0.        , ...., 0.015625  ])
+
+        """
+        bought, times = unique(self.__history_checked(history),
+                               return_counts=True)
+        times = ones(bought.size) if self.binarize else times.astype(float)
+        items, scores = neighbour_scores(self.__neighbours(), bought, times)
+        item_scores = zeros(self.__data.item.count)
+        item_scores[items] = scores
+        return item_scores
+
+    def __sparse_for_one(self, target):
+        """Rate only the articles reachable from the target's purchases.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings, in no
+            particular order. All other articles are rated 0.
+
+        Examples
+        --------
+        >>> ratings = CollaborativeFiltering().operating_on(data)
+        >>> customer = 245
+        >>> ratings.sparse_for_one(customer)
+        (array([ 2,  7, 19]), array([ 0.21794872,  0.62820513,  0.57692308]))
+
+        """
+        if self.__no_one_else_bought_items_bought_by(target):
+            log.info('Uncomparable user with ID {}. Returning baseline'
+                     ' recommendation.'.format(self.__data.user.id_of[target]))
+            item_scores = self.__baseline.for_one(target)
+            items = item_scores.nonzero()[0]
+            return items, item_scores[items]
+        return self.__neighbour_scores_of(target)
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the highest-rated articles for the target customer.
+
+        The purchase history is multiplied with the similarity matrix as a
+        sparse row, so that only the neighbour lists of the articles bought
+        by the target customer are visited. The top articles are then
+        selected by partitioning the few articles reached and sorting only
+        the selected ones.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings,
+            sorted by rating in descending order.
+
+        Examples
+        --------
+        >>> ratings = CollaborativeFiltering().operating_on(data)
+        >>> customer = 245
+        >>> ratings.top_for_one(customer, 2)
+        (array([ 7, 19]), array([ 0.62820513,  0.57692308]))
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        if self.__no_one_else_bought_items_bought_by(target):
+            log.info('Uncomparable user with ID {}. Returning baseline'
+                     ' recommendation.'.format(self.__data.user.id_of[target]))
+            return self.__top_of_baseline_for(target, head)
+        items, scores = self.__neighbour_scores_of(target)
+        return largest(items, scores, head)
+
+    def __similar_to_one(self, item, max_number_of_items=5):
+        """Find the articles most similar to the target article.
+
+        Parameters
+        ----------
+        item : int
+            Internally used integer index of the target article.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+            No more than `max_similar_items` articles are returned.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their similarities to
+            the target article, sorted by similarity in descending order.
+
+        Examples
+        --------
+        >>> ratings = CollaborativeFiltering().operating_on(data)
+        >>> ratings.similar_to_one(7, 2)
+        (array([19,  2]), array([ 0.83333333,  0.5       ]))
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        items, similarities, counts = self.__similar_items()
+        head = min(head, counts[item])
+        return items[item, :head].copy(), similarities[item, :head].copy()
+
+    def __similar_to_many(self, items, max_number_of_items=5):
+        """Find the articles most similar to each of the target articles.
+
+        Parameters
+        ----------
+        items : array-like
+            Internally used integer indices of the target articles.
+
+        max_number_of_items : int, optional
+            The maximum number of articles per target article to return.
+            Defaults to 5. No more than `max_similar_items` articles
+            are returned.
+
+        Returns
+        -------
+        tuple
+            2-D array of article indices and 2-D array of their similarities
+            to the target articles, one row per target article, sorted by
+            similarity in descending order. Rows with fewer similar articles
+            are padded with index -1 and similarity -inf.
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        table, similarities, _ = self.__similar_items()
+        items = asarray(items, dtype=int)
+        return table[items, :head], similarities[items, :head]
+
+    def __similar_items(self):
+        """Table of the most similar articles, one row per article.
+
+        All columns of the similarity matrix are sorted together by column,
+        descending similarity, and descending article index (to break ties),
+        after dropping the similarity of each article with itself. The rank
+        of each entry within its column then tells where to put it in the
+        table. This is done only once, so that looking up the articles most
+        similar to any given one is a mere slice of a table row.
+
+        """
+        if not self.__has('similar_items_table'):
+            matrix = self.__similarity_matrix().tocsc()
+            n_items = matrix.shape[1]
+            columns = repeat(arange(n_items), diff(matrix.indptr))
+            keep = (matrix.indices != columns) & (matrix.data != 0)
+            rows = matrix.indices[keep]
+            columns = columns[keep]
+            similarities = matrix.data[keep]
+            order = lexsort((-rows, -similarities, columns))
+            counts = bincount(columns, minlength=n_items)
+            ranks = arange(order.size) - repeat(cumsum(counts) - counts,
+                                                counts)
+            kept = ranks < self.__max_similar_items
+            top, ranks = order[kept], ranks[kept]
+            shape = (n_items, self.__max_similar_items)
+            table = full(shape, -1, dtype=int)
+            table[columns[top], ranks] = rows[top]
+            table_similarities = full(shape, float('-inf'))
+            table_similarities[columns[top], ranks] = similarities[top]
+            self.__similar_items_table = (
+                table, table_similarities,
+                minimum(counts, self.__max_similar_items))
+        return self.__similar_items_table
+
+    def __top_of_baseline_for(self, target, head):
+        if hasattr(self.__baseline, 'top_for_one'):
+            return self.__baseline.top_for_one(target, head)
+        item_scores = self.__baseline.for_one(target)
+        head = min(head, item_scores.size)
+        top_items = argpartition(item_scores, -head)[-head:]
+        return largest(top_items, item_scores[top_items], head)
+
+    def __neighbour_scores_of(self, target):
+        history = self.__depending_on_whether_we[self.binarize]
+        row = slice(history.indptr[target], history.indptr[target + 1])
+        return neighbour_scores(self.__neighbours(), history.indices[row],
+                                history.data[row])
+
     def __similarity_matrix(self):
         if not self.__has('sim_mat'):
             self.__sim_mat = self.__similarity(self.__data)
         return self.__sim_mat
 
+    def __neighbours(self):
+        """Similarity matrix in CSR format, one neighbour list per row."""
+        if not self.__has('neighbours_by_row'):
+            self.__neighbours_by_row = self.__similarity_matrix().tocsr()
+        return self.__neighbours_by_row
+
     def __delete_sim_mat(self):
         if self.__has('sim_mat'):
             delattr(self, self.__class_prefix + 'sim_mat')
+        if self.__has('neighbours_by_row'):
+            delattr(self, self.__class_prefix + 'neighbours_by_row')
+        self.__delete_similar_items()
+
+    def __delete_similar_items(self):
+        if self.__has('similar_items_table'):
+            delattr(self, self.__class_prefix + 'similar_items_table')
 
     def __no_one_else_bought_items_bought_by(self, target):
-        items_bought_by_target = self.__data.matrix.by_row[target].indices
-        return self.__data._users_who_bought(items_bought_by_target).size == 1
+        return self.__data._uncomparable_users[target]
 
     def __has(self, attribute):
         return hasattr(self, self.__class_prefix + attribute)
 
+
+    def __history_checked(self, history):
+        history = asarray(history, dtype=int).ravel()
+        n_items = self.__data.item.count
+        if ((history < 0) | (history >= n_items)).any():
+            log.error('Attempt to rate a history with unknown articles.')
+            raise IndexError('Article indices must be between 0 and {}!'
+                             .format(n_items - 1))
+        return history
+
+    @staticmethod
+    def __type_and_range_checked(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+        return value
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
     @staticmethod
     def __permitted(similarity):
         if similarity not in all_similarities:
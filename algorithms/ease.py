@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import argpartition, argsort, asarray, diag_indices, empty
+from numpy import dtype as numpy_dtype, ix_, tril_indices, unique
+from scipy.linalg import get_lapack_funcs
+from .baselines import default_baseline
+from .versioning import combined_version, version_before_replacing
+from ..datastructures import Transactions
+
+
+class EASE:
+    """Recommendation with a closed-form, shallow article-article model.
+
+    EASE (Steck) learns the weights with which the articles a customer
+    bought add up to the ratings of all articles by ridge regression of
+    the purchase matrix on itself, with the trivial solution of every
+    article predicting itself excluded. The solution follows in closed
+    form from the inverse of the regularized article-article Gram matrix.
+    That inverse is computed in place by (multithreaded) LAPACK, so the
+    dense weight matrix must fit into memory. How much memory is needed
+    is estimated before any computation and catalogs that would need
+    more than `max_memory` are refused.
+
+    Attributes
+    ----------
+    regularization : float, optional
+        Weight of the L2 penalty on the article-article weights, added to
+        the diagonal of the Gram matrix. Defaults to 500.
+
+    dtype : str, optional
+        Floating-point type of the weights, either ``'float64'`` or, to
+        halve memory and speed up the matrix products, ``'float32'``.
+        Defaults to ``'float64'``.
+
+    max_memory : int, optional
+        Maximum number of bytes the dense weights and one block of ratings
+        may take up. Defaults to 4 GiB.
+
+    required_memory : int
+        Estimated number of bytes needed for the attached data. Read-only.
+
+    baseline : object, object
+        Fall-back algorithm needed for customers that only bought articles
+        no one else bought. Defaults to `bestPy.algorithms.Baseline`.
+
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()` and of
+        articles whose Gram-matrix columns are computed together.
+        Defaults to 1000.
+
+    version : int
+        Counter that increases whenever settings or data of the algorithm
+        or of its baseline change in a way that may change the ratings.
+        Read-only.
+
+    Methods
+    -------
+    operating_on(data) : `EASE`
+        Returns the `EASE` instance it is called on with the `data` object
+        attached. It then `has_data` and reveals the methods ...
+
+    for_one(target) : array
+        Returns an array with ratings of all articles for the customer with
+        the internal integer index `target`. The higher the rating,
+        the more highly recommended the article is for customer `target`.
+
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time,
+        each block computed with one dense matrix-matrix product.
+
+    for_items(target, items) : array
+        Returns an array with the ratings of only the articles with the
+        internal integer indices `items` for the customer `target`.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        `max_number_of_items` highest-rated articles in descending order.
+
+    Examples
+    --------
+    >>> ratings = EASE().operating_on(data)
+    >>> ratings.required_memory
+    611200200
+
+    >>> customer = 245
+    >>> ratings.for_one(customer)
+    array([ 0.00170218,  0.00041206, ...,  0.00003554])
+
+    """
+
+    def __init__(self):
+        self.__regularization = 500.0
+        self.__dtype = 'float64'
+        self.__max_memory = 4 * 2**30
+        self.__baseline = default_baseline()
+        self.__block_size = 1000
+        self.__version = 0
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def regularization(self):
+        """Weight of the L2 penalty on the article-article weights."""
+        return self.__regularization
+
+    @regularization.setter
+    def regularization(self, regularization):
+        self.__check_non_negative_number(regularization, 'regularization')
+        regularization = float(regularization)
+        if regularization != self.__regularization:
+            self.__delete_weights()
+            self.__version += 1
+        self.__regularization = regularization
+
+    @property
+    def dtype(self):
+        """Floating-point type of the weights."""
+        return self.__dtype
+
+    @dtype.setter
+    def dtype(self, dtype):
+        if dtype not in ('float32', 'float64'):
+            log.error('Attempt to set dtype to unsupported type.')
+            raise ValueError('Attribute "dtype" must be "float32" or'
+                             ' "float64"!')
+        if dtype != self.__dtype:
+            self.__delete_weights()
+            self.__version += 1
+        self.__dtype = dtype
+
+    @property
+    def max_memory(self):
+        """Maximum number of bytes the weights may take up."""
+        return self.__max_memory
+
+    @max_memory.setter
+    def max_memory(self, max_memory):
+        self.__check_positive_integer(max_memory, 'max_memory')
+        self.__max_memory = max_memory
+
+    @property
+    def required_memory(self):
+        """Estimated number of bytes needed for the attached data."""
+        if not self.has_data:
+            return 0
+        n_items = self.__data.item.count
+        itemsize = numpy_dtype(self.__dtype).itemsize
+        return itemsize * n_items * (n_items + self.__block_size)
+
+    @property
+    def baseline(self):
+        """Baseline algorithm used for uncomparable customers."""
+        return self.__baseline.__class__.__name__
+
+    @baseline.setter
+    def baseline(self, baseline):
+        baseline = self.__base_attribute_checked(baseline)
+        self.__version = version_before_replacing(self.__version,
+                                                  [self.__baseline])
+        self.__baseline = baseline
+        if self.has_data:
+            self.__baseline = self.__baseline.operating_on(self.__data)
+            self.__baseline = self.__data_attribute_checked(self.__baseline)
+
+    @property
+    def version(self):
+        """Increases whenever settings or data that affect ratings change.
+
+        The version of the baseline for customers who only bought articles
+        no one else bought counts as well. On a change of baseline, the
+        versions of the old one are skipped, so that earlier values are
+        never repeated. ``None`` as long as the baseline has no version.
+
+        """
+        return combined_version(self.__version, [self.__baseline])
+
+    @property
+    def block_size(self):
+        """Maximum number of customers or articles processed at once."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_positive_integer(block_size, 'block_size')
+        self.__block_size = block_size
+
+    def operating_on(self, data):
+        """Set data object for the algorithm to operate on.
+
+        Parameters
+        ----------
+        data : `Transactions`
+            Instance of `bestPy.datastructures.Transactions`.
+
+        Returns
+        -------
+        The instance of `EASE` it is called on, now with the previously
+        hidden `for_one()`, `for_many()`, `for_items()` and `top_for_one()`
+        methods enabled and the data attached.
+
+        Raises
+        ------
+        MemoryError
+            If the weights for the articles in `data` would take up more
+            than `max_memory` bytes.
+
+        Examples
+        --------
+        >>> algorithm = EASE().operating_on(data)
+        >>> algorithm.has_data
+        True
+
+        """
+        data = self.__transactions_type_checked(data)
+        self.__check_memory_needed_for(data.item.count)
+        self.__data = data
+        self.__baseline = self.__baseline.operating_on(data)
+        self.__baseline = self.__data_attribute_checked(self.__baseline)
+        self.__delete_weights()
+        self.__version += 1
+        self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.for_items = self.__for_items
+        self.top_for_one = self.__top_for_one
+        return self
+
+    @property
+    def has_data(self):
+        return self.__has('data')
+
+    def __for_one(self, target):
+        """Make an actual recommendation for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of all items for the target customer.
+
+        Examples
+        --------
+        >>> ratings = EASE().operating_on(data)
+        >>> customer = 245
+        >>> ratings.for_one(customer)
+        array([ 0.00170218,  0.00041206, ...,  0.00003554])
+
+        """
+        if self.__no_one_else_bought_items_bought_by(target):
+            log.info('Uncomparable user with ID {}. Returning baseline'
+                     ' recommendation.'.format(self.__data.user.id_of[target]))
+            return self.__baseline.for_one(target)
+        history_vector = self.__data.matrix.bool_by_row[target]
+        return self.__weights()[history_vector.indices].sum(axis=0)
+
+    def __for_many(self, targets):
+        """Make recommendations for blocks of target customers.
+
+        Only the rows of the weight matrix belonging to articles bought by
+        anyone in a block are needed. The purchase histories of the block,
+        restricted to these articles, are densified and multiplied with
+        them in a single call to BLAS.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the suitability ratings of all articles (columns)
+            for up to `block_size` of the target customers (rows).
+
+        """
+        weights = self.__weights()
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            history = self.__data.matrix.bool_by_row[block]
+            bought = unique(history.indices)
+            history = history[:, bought].toarray().astype(weights.dtype)
+            block_ratings = history.dot(weights[bought])
+            for row in self.__data._uncomparable_users[block].nonzero()[0]:
+                log.info('Uncomparable user with ID {}. Returning baseline'
+                         ' recommendation.'.format(
+                             self.__data.user.id_of[block[row]]))
+                block_ratings[row] = self.__baseline.for_one(block[row])
+            yield block_ratings
+
+    def __for_items(self, target, items):
+        """Rate only selected articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        items : array-like
+            Internally used integer indices of the articles to rate.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of the selected articles, in the order
+            given by `items`.
+
+        """
+        items = asarray(items, dtype=int)
+        if self.__no_one_else_bought_items_bought_by(target):
+            log.info('Uncomparable user with ID {}. Returning baseline'
+                     ' recommendation.'.format(self.__data.user.id_of[target]))
+            return self.__baseline.for_one(target)[items]
+        bought = self.__data.matrix.bool_by_row[target].indices
+        return self.__weights()[ix_(bought, items)].sum(axis=0)
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the highest-rated articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings,
+            sorted by rating in descending order.
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        item_scores = self.__for_one(target)
+        head = min(head, item_scores.size)
+        top = argpartition(item_scores, -head)[-head:]
+        top = top[argsort(-item_scores[top], kind='mergesort')]
+        return top, item_scores[top]
+
+    def __weights(self):
+        if not self.__has('article_weights'):
+            self.__check_memory_needed_for(self.__data.item.count)
+            self.__article_weights = self.__fitted_weights()
+        return self.__article_weights
+
+    def __fitted_weights(self):
+        """Closed-form EASE solution, computed in one dense array.
+
+        The Gram matrix is assembled column block by column block, so that
+        the sparse intermediate products stay small. Being symmetric and
+        positive definite, it is inverted in place via its Cholesky
+        factor, which takes about half the operations of an LU-based
+        inverse. LAPACK only fills the upper triangle, which is then
+        mirrored block by block. With P the inverse, the weights are
+        -P / diag(P), column by column, with zeros on the diagonal.
+
+        """
+        bought = self.__data.matrix.bool_by_col
+        n_items = bought.shape[1]
+        gram = empty((n_items, n_items), dtype=self.__dtype, order='F')
+        for start in range(0, n_items, self.block_size):
+            columns = slice(start, start + self.block_size)
+            gram[:, columns] = bought.T.dot(bought[:, columns]).toarray()
+        diagonal = diag_indices(n_items)
+        gram[diagonal] += self.__regularization
+        potrf, potri = get_lapack_funcs(('potrf', 'potri'), (gram,))
+        factor, info = potrf(gram, lower=False, overwrite_a=True, clean=False)
+        if info == 0:
+            weights, info = potri(factor, lower=False, overwrite_c=True)
+        if info != 0:
+            log.error('Regularized Gram matrix is not positive definite.')
+            raise ValueError('Cannot invert Gram matrix! Increase the'
+                             ' "regularization".')
+        for start in range(0, n_items, self.block_size):
+            stop = start + self.block_size
+            weights[stop:, start:stop] = weights[start:stop, stop:].T
+            square = weights[start:stop, start:stop]
+            below = tril_indices(square.shape[0], -1)
+            square[below] = square.T[below]
+        weights /= -weights[diagonal]
+        weights[diagonal] = 0.0
+        return weights
+
+    def __check_memory_needed_for(self, n_items):
+        itemsize = numpy_dtype(self.__dtype).itemsize
+        required = itemsize * n_items * (n_items + self.__block_size)
+        if required > self.__max_memory:
+            log.error('EASE would need about {:.1f} GB for {} articles, more'
+                      ' than max_memory.'.format(required / 1e9, n_items))
+            raise MemoryError('Catalog too large for EASE! Reduce the number'
+                              ' of articles or increase "max_memory".')
+
+    def __delete_weights(self):
+        if self.__has('article_weights'):
+            delattr(self, self.__class_prefix + 'article_weights')
+
+    def __no_one_else_bought_items_bought_by(self, target):
+        return self.__data._uncomparable_users[target]
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_positive_integer(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __check_non_negative_number(value, name):
+        error_message = '"{}" must be a non-negative number!'.format(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            log.error('Attempt to set {} to non-numeric type.'.format(name))
+            raise TypeError(error_message)
+        if value < 0:
+            log.error('Attempt to set {} to value < 0.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __transactions_type_checked(data):
+        if not isinstance(data, Transactions):
+            log.error('Attempt to set incompatible data type.'
+                      ' Must be <Transactions>.')
+            raise TypeError('Data must be of type <Transactions>!')
+        return data
+
+    @staticmethod
+    def __base_attribute_checked(baseline):
+        """Check methods and attributes of baseline before data is attached."""
+        if not hasattr(baseline, 'operating_on'):
+            log.error('Attempt to set baseline object lacking mandatory'
+                      ' "operating_on()" method.')
+            raise AttributeError('Baseline lacks "operating_on()" method!')
+        if not callable(baseline.operating_on):
+            log.error('The "operating_on()" method of the baseline object'
+                      ' is not callable.')
+            raise TypeError('Operating_on() method of baseline not callable!')
+        if not hasattr(baseline, 'has_data'):
+            log.error('Attempt to set baseline object lacking mandatory'
+                      ' "has_data" attribute.')
+            raise AttributeError('Baseline lacks "has_data" attribute!')
+        return baseline
+
+    @staticmethod
+    def __data_attribute_checked(baseline):
+        """Check methods and attributes of baseline after data is attached."""
+        if not baseline.has_data:
+            log.error("Baseline object's 'has_data' attribute returned False"
+                      " after attaching data.")
+            raise ValueError('Cannot attach data to baseline object!')
+        if not hasattr(baseline, 'for_one'):
+            log.error('Attempt to set baseline object lacking mandatory'
+                      ' "for_one()" method.')
+            raise AttributeError('Baseline lacks "for_one()" method!')
+        if not callable(baseline.for_one):
+            log.error('The "for_one()" method of the baseline object'
+                      ' is not callable.')
+            raise TypeError('"for_one()" method of baseline not callable!')
+        return baseline
@@ -0,0 +1,487 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from concurrent.futures import ThreadPoolExecutor
+from numpy import arange, argpartition, argsort, asarray, diff, eye, errstate
+from numpy import dtype as numpy_dtype, repeat
+from numpy.random import RandomState
+from scipy.sparse import csr_matrix
+from ..datastructures import Transactions
+
+SEED = 0
+
+
+class ImplicitALS:
+    """Recommendation based on matrix factorization of implicit feedback.
+
+    Purchases are not taken as ratings but as preferences held with a
+    confidence that grows with the number of times an article was bought
+    (Hu, Koren & Volinsky). Articles not bought count as weak evidence
+    against a preference instead of as known zeros. Customer and article
+    factors are fitted with weighted alternating least squares, each step
+    solved approximately with a few conjugate-gradient iterations
+    (Takács, Pilászy & Tikk), block by block and in parallel threads.
+
+    Attributes
+    ----------
+    binarize : bool, optional
+        Whether the confidence in a purchase is the same for every article
+        bought (``True``) or grows with the number of times it was bought
+        (``False``). Defaults to ``True``.
+
+    number_of_factors : int, optional
+        Number of latent variables thought to charaterize both the customers
+        and the articles. Defaults to 20.
+
+    alpha : float, optional
+        Confidence in a preference is 1 + `alpha` times the number of times
+        an article was bought (or 1 if it was never bought). Defaults to 40.
+
+    regularization : float, optional
+        Weight of the L2 penalty on the factors. Defaults to 0.1.
+
+    number_of_iterations : int, optional
+        Number of alternating sweeps over customers and articles.
+        Defaults to 10.
+
+    number_of_cg_steps : int, optional
+        Number of conjugate-gradient steps per customer or article and
+        sweep, starting from the previous factors. Defaults to 3.
+
+    number_of_threads : int, optional
+        Number of threads that update blocks of `block_size` customers or
+        articles concurrently. Defaults to 1.
+
+    dtype : str, optional
+        Floating-point type of the factors, either ``'float64'`` or, to
+        halve memory and speed up the matrix products, ``'float32'``.
+        Defaults to ``'float64'``.
+
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()` and of
+        customers or articles updated together while fitting.
+        Defaults to 1000.
+
+    version : int
+        Counter that increases whenever settings or data change in a way
+        that may change the ratings. Read-only.
+
+    Methods
+    -------
+    operating_on(data) : `ImplicitALS`
+        Returns the `ImplicitALS` instance it is called on with the `data`
+        object attached to it. It then `has_data` and reveals the method ...
+
+    for_one(target) : array
+        Returns an array with ratings of all articles for the customer with
+        the internal integer index `target`. The higher the rating,
+        the more highly recommended the article is for the `target` customer.
+
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    for_items(target, items) : array
+        Returns an array with the ratings of only the articles with the
+        internal integer indices `items` for the customer `target`.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        `max_number_of_items` highest-rated articles in descending order.
+
+    Examples
+    --------
+    >>> ratings = ImplicitALS().operating_on(data)
+    >>> ratings.has_data
+    True
+
+    >>> ratings.number_of_threads = 4
+    >>> ratings.dtype = 'float32'
+    >>> customer = 245
+    >>> ratings.for_one(customer)
+    array([ 0.01702182,  0.00412063, ...,  0.00035541], dtype=float32)
+
+    """
+
+    def __init__(self):
+        self.__binarize = True
+        self.__number_of_factors = 20
+        self.__alpha = 40.0
+        self.__regularization = 0.1
+        self.__number_of_iterations = 10
+        self.__number_of_cg_steps = 3
+        self.__number_of_threads = 1
+        self.__dtype = 'float64'
+        self.__block_size = 1000
+        self.__version = 0
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def binarize(self):
+        """Confidence from: a purchase (``True``) or purchase counts."""
+        return self.__binarize
+
+    @binarize.setter
+    def binarize(self, binarize):
+        self.__check_boolean_type_of(binarize)
+        self.__change('binarize', binarize)
+
+    @property
+    def number_of_factors(self):
+        """Number of latent variables characterizing cutomers and articles."""
+        return self.__number_of_factors
+
+    @number_of_factors.setter
+    def number_of_factors(self, number_of_factors):
+        self.__check_positive_integer(number_of_factors, 'number_of_factors')
+        self.__change('number_of_factors', number_of_factors)
+
+    @property
+    def alpha(self):
+        """Growth of the confidence with the number of times bought."""
+        return self.__alpha
+
+    @alpha.setter
+    def alpha(self, alpha):
+        self.__check_non_negative_number(alpha, 'alpha')
+        self.__change('alpha', float(alpha))
+
+    @property
+    def regularization(self):
+        """Weight of the L2 penalty on the factors."""
+        return self.__regularization
+
+    @regularization.setter
+    def regularization(self, regularization):
+        self.__check_non_negative_number(regularization, 'regularization')
+        self.__change('regularization', float(regularization))
+
+    @property
+    def number_of_iterations(self):
+        """Number of alternating sweeps over customers and articles."""
+        return self.__number_of_iterations
+
+    @number_of_iterations.setter
+    def number_of_iterations(self, number_of_iterations):
+        self.__check_positive_integer(number_of_iterations,
+                                      'number_of_iterations')
+        self.__change('number_of_iterations', number_of_iterations)
+
+    @property
+    def number_of_cg_steps(self):
+        """Number of conjugate-gradient steps per update."""
+        return self.__number_of_cg_steps
+
+    @number_of_cg_steps.setter
+    def number_of_cg_steps(self, number_of_cg_steps):
+        self.__check_positive_integer(number_of_cg_steps,
+                                      'number_of_cg_steps')
+        self.__change('number_of_cg_steps', number_of_cg_steps)
+
+    @property
+    def number_of_threads(self):
+        """Number of threads updating blocks of factors concurrently."""
+        return self.__number_of_threads
+
+    @number_of_threads.setter
+    def number_of_threads(self, number_of_threads):
+        self.__check_positive_integer(number_of_threads, 'number_of_threads')
+        self.__number_of_threads = number_of_threads
+
+    @property
+    def dtype(self):
+        """Floating-point type of the factors."""
+        return self.__dtype
+
+    @dtype.setter
+    def dtype(self, dtype):
+        if dtype not in ('float32', 'float64'):
+            log.error('Attempt to set dtype to unsupported type.')
+            raise ValueError('Attribute "dtype" must be "float32" or'
+                             ' "float64"!')
+        self.__change('dtype', dtype)
+
+    @property
+    def version(self):
+        """Increases whenever settings or data that affect ratings change."""
+        return self.__version
+
+    @property
+    def block_size(self):
+        """Maximum number of rows scored or updated at once."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_positive_integer(block_size, 'block_size')
+        self.__block_size = block_size
+
+    def operating_on(self, data):
+        """Set data object for the algorithm to operate on.
+
+        Parameters
+        ----------
+        data : `Transactions`
+            Instance of `bestPy.datastructures.Transactions`.
+
+        Returns
+        -------
+        The instance of `ImplicitALS` it is called on, now with the
+        previously hidden `for_one()` method enabled and the data attached.
+
+        Examples
+        --------
+        >>> algorithm = ImplicitALS().operating_on(data)
+        >>> algorithm.has_data
+        True
+
+        """
+        self.__data = self.__transactions_type_checked(data)
+        self.__delete_factors()
+        self.__version += 1
+        self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.for_items = self.__for_items
+        self.top_for_one = self.__top_for_one
+        return self
+
+    @property
+    def has_data(self):
+        return self.__has('data')
+
+    def __for_one(self, target):
+        """Make an actual recommendation for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of all items for the target customer.
+
+        Examples
+        --------
+        >>> ratings = ImplicitALS().operating_on(data)
+        >>> customer = 245
+        >>> ratings.for_one(customer)
+        array([ 0.01702182,  0.00412063, ...,  0.00035541])
+
+        """
+        customer_factors, article_factors = self.__factors()
+        return article_factors.dot(customer_factors[target])
+
+    def __for_many(self, targets):
+        """Make recommendations for blocks of target customers.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the suitability ratings of all articles (columns)
+            for up to `block_size` of the target customers (rows).
+
+        """
+        customer_factors, article_factors = self.__factors()
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            yield customer_factors[block].dot(article_factors.T)
+
+    def __for_items(self, target, items):
+        """Rate only selected articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        items : array-like
+            Internally used integer indices of the articles to rate.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of the selected articles, in the order
+            given by `items`.
+
+        """
+        customer_factors, article_factors = self.__factors()
+        items = asarray(items, dtype=int)
+        return article_factors[items].dot(customer_factors[target])
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the highest-rated articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings,
+            sorted by rating in descending order.
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        item_scores = self.__for_one(target)
+        head = min(head, item_scores.size)
+        top = argpartition(item_scores, -head)[-head:]
+        top = top[argsort(-item_scores[top], kind='mergesort')]
+        return top, item_scores[top]
+
+    def __factors(self):
+        if not self.__has('customer_factors'):
+            self.__fit()
+        return self.__customer_factors, self.__article_factors
+
+    def __fit(self):
+        """Alternate between updating all customer and all article factors.
+
+        For a fixed set of article factors Y, the factors x of a customer
+        minimize the confidence-weighted squared error of their preferences,
+        i.e., they solve (Y'Y + Y'(C - 1)Y + regularization) x = Y'C p.
+        Only the articles bought contribute to the middle term, so that
+        the cost per step is linear in the number of purchases.
+
+        """
+        dtype = numpy_dtype(self.__dtype)
+        by_customer = self.__confidence_minus_one(self.__matrix(), dtype)
+        by_article = self.__confidence_minus_one(self.__matrix().T, dtype)
+        random = RandomState(SEED)
+        shape = (self.__data.user.count, self.__number_of_factors)
+        customers = (0.01 * random.standard_normal(shape)).astype(dtype)
+        shape = (self.__data.item.count, self.__number_of_factors)
+        articles = (0.01 * random.standard_normal(shape)).astype(dtype)
+        with ThreadPoolExecutor(self.__number_of_threads) as pool:
+            for _ in range(self.__number_of_iterations):
+                self.__update(customers, articles, by_customer, pool)
+                self.__update(articles, customers, by_article, pool)
+        self.__customer_factors = customers
+        self.__article_factors = articles
+
+    def __update(self, factors, fixed, confidence, pool):
+        """Update all rows of `factors` in place, block by block."""
+        gram = fixed.T.dot(fixed)
+        gram += self.__regularization * eye(gram.shape[0], dtype=gram.dtype)
+        starts = range(0, factors.shape[0], self.block_size)
+        blocks = [slice(start, start + self.block_size) for start in starts]
+        list(pool.map(lambda block: self.__conjugate_gradient(
+            factors, fixed, gram, confidence[block], block), blocks))
+
+    def __conjugate_gradient(self, factors, fixed, gram, confidence, block):
+        """A few CG steps for all rows in one block at once, in place."""
+        X = factors[block]
+
+        def times_A(P):
+            weights = confidence.data * self.__row_dot(P, fixed, confidence)
+            weighted = csr_matrix((weights, confidence.indices,
+                                   confidence.indptr), shape=confidence.shape)
+            return P.dot(gram) + weighted.dot(fixed)
+
+        preferences = confidence.copy()
+        preferences.data += 1
+        R = preferences.dot(fixed) - times_A(X)
+        P = R.copy()
+        squared_residuals = (R * R).sum(axis=1)
+        for _ in range(self.__number_of_cg_steps):
+            AP = times_A(P)
+            with errstate(divide='ignore', invalid='ignore'):
+                step = squared_residuals / (P * AP).sum(axis=1)
+            step[~(squared_residuals > 0)] = 0
+            X += step[:, None] * P
+            R -= step[:, None] * AP
+            new_squared_residuals = (R * R).sum(axis=1)
+            with errstate(divide='ignore', invalid='ignore'):
+                ratio = new_squared_residuals / squared_residuals
+            ratio[~(squared_residuals > 0)] = 0
+            P = R + ratio[:, None] * P
+            squared_residuals = new_squared_residuals
+
+    @staticmethod
+    def __row_dot(P, fixed, confidence):
+        """Dot product of row u of P with row i of fixed for each (u, i)."""
+        rows = repeat(arange(confidence.shape[0]), diff(confidence.indptr))
+        return (P[rows] * fixed[confidence.indices]).sum(axis=1)
+
+    def __confidence_minus_one(self, matrix, dtype):
+        matrix = csr_matrix(matrix, dtype=dtype, copy=True)
+        matrix.data *= self.__alpha
+        return matrix
+
+    def __matrix(self):
+        if self.__binarize:
+            return self.__data.matrix.bool_by_row
+        return self.__data.matrix.by_row
+
+    def __change(self, name, value):
+        attribute = self.__class_prefix + name
+        if value != getattr(self, attribute):
+            self.__delete_factors()
+            self.__version += 1
+        setattr(self, attribute, value)
+
+    def __delete_factors(self):
+        for attribute in ('customer_factors', 'article_factors'):
+            if self.__has(attribute):
+                delattr(self, self.__class_prefix + attribute)
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_positive_integer(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __check_non_negative_number(value, name):
+        error_message = '"{}" must be a non-negative number!'.format(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            log.error('Attempt to set {} to non-numeric type.'.format(name))
+            raise TypeError(error_message)
+        if value < 0:
+            log.error('Attempt to set {} to value < 0.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __check_boolean_type_of(binarize):
+        if not isinstance(binarize, bool):
+            log.error('Attempt to set "binarize" to non-boolean type.')
+            raise TypeError('Attribute "binarize" must be True or False!')
+
+    @staticmethod
+    def __transactions_type_checked(data):
+        if not isinstance(data, Transactions):
+            log.error('Attempt to set incompatible data type.'
+                      ' Must be <Transactions>.')
+            raise TypeError('Data must be of type <Transactions>!')
+        return data
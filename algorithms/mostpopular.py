@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
+from heapq import nlargest
+from itertools import chain
+from operator import itemgetter
+from numpy import array, asarray, tile
 from ..datastructures import Transactions
 from .baselines import Baseline
 
@@ -18,6 +22,14 @@ class MostPopular:
         unique buyers (``True``) or number of times bought (``False``).
         Defaults to ``True``.
 
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()`.
+        Defaults to 1000.
+
+    version : int
+        Counter that increases whenever settings or data change in a way
+        that may change the ratings. Read-only.
+
     Methods
     -------
     operating_on(data) : `MostPopular`
@@ -29,6 +41,15 @@ class MostPopular:
         the internal integer index `target`. The higher the rating,
         the more highly recommended the article is for customer `target`.
 
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        (up to) `max_number_of_items` highest-rated articles for the customer
+        with the internal integer index `target`, in descending order.
+
     Examples
     --------
     >>> ratings = MostPopular().operating_on(data)
@@ -45,6 +66,8 @@ class MostPopular:
 
     def __init__(self):
         self.__baseline = Baseline()
+        self.__block_size = 1000
+        self.__version = 0
         self.__class_prefix = '_' + self.__class__.__name__ + '__'
 
     @property
@@ -57,8 +80,24 @@ class MostPopular:
         self.__check_boolean_type_of(binarize)
         if binarize != self.binarize:
             self.__delete_precomputed()
+            self.__version += 1
         self.__baseline.binarize = binarize
 
+    @property
+    def version(self):
+        """Increases whenever settings or data that affect ratings change."""
+        return self.__version
+
+    @property
+    def block_size(self):
+        """Maximum number of customers scored at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_integer_type_and_range_of(block_size)
+        self.__block_size = block_size
+
     def operating_on(self, data):
         """Set data object for the algorithm to operate on.
 
@@ -82,7 +121,10 @@ class MostPopular:
         self.__data = self.__transactions_type_checked(data)
         self.__baseline = self.__baseline.operating_on(data)
         self.__delete_precomputed()
+        self.__version += 1
         self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.top_for_one = self.__top_for_one
         return self
 
     @property
@@ -110,18 +152,100 @@ class MostPopular:
         array([ 0.16129032,  0.09677419,  ..., 0.06451613])
 
         """
-        target_agnostic = self.__precomputed()
+        target_agnostic = self.__precomputed().copy()
         target_specific = self.__data.matrix.by_row[target]
         target_agnostic[target_specific.indices] = target_specific.data
         return target_agnostic
 
+    def __for_many(self, targets):
+        """Make recommendations for blocks of target customers.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the suitability ratings of all articles (columns)
+            for up to `block_size` of the target customers (rows).
+
+        Examples
+        --------
+        >>> ratings = MostPopular().operating_on(data)
+        >>> customers = [245, 246]
+        >>> next(ratings.for_many(customers))
+        array([[ 0.16129032,  0.09677419,  ..., 0.06451613],
+               [ 0.16129032,  2.        ,  ..., 0.06451613]])
+
+        """
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            block_ratings = tile(self.__precomputed(), (block.size, 1))
+            target_specific = self.__data.matrix.by_row[block].tocoo()
+            block_ratings[target_specific.row,
+                          target_specific.col] = target_specific.data
+            yield block_ratings
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the highest-rated articles for the target customer.
+
+        The few articles bought by the target customer are merged with the
+        precomputed popularity ranking of the baseline in a small heap, so
+        no array over all articles is created or copied.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings,
+            sorted by rating in descending order.
+
+        Examples
+        --------
+        >>> ratings = MostPopular().operating_on(data)
+        >>> customer = 245
+        >>> ratings.top_for_one(customer, 2)
+        (array([ 7, 19]), array([ 2.        ,  0.16129032]))
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        target_specific = self.__data.matrix.by_row[target]
+        bought = set(target_specific.indices.tolist())
+        popular, popularity = self.__baseline.top_for_one(
+            max_number_of_items=head + len(bought))
+        normalization = self.__normalization()
+        target_agnostic = ((rating / normalization, item)
+                           for rating, item
+                           in zip(popularity.tolist(), popular.tolist())
+                           if item not in bought)
+        candidates = chain(zip(target_specific.data.tolist(),
+                               target_specific.indices.tolist()),
+                           target_agnostic)
+        # Ties keep the order of the baseline ranking.
+        top = nlargest(head, candidates, key=itemgetter(0))
+        top_ratings, top_items = tuple(zip(*top)) if top else ((), ())
+        return array(top_items, dtype=int), array(top_ratings, dtype=float)
+
     def __precomputed(self):
         if not self.__has('scaled_baseline'):
-            depending_on = {True : self.__data.number_of_userItem_pairs,
-                            False: self.__data.number_of_transactions}
             self.__scaled_baseline = (self.__baseline.for_one() /
-                                      depending_on[self.binarize])
-        return self.__scaled_baseline.copy()
+                                      self.__normalization())
+        return self.__scaled_baseline
+
+    def __normalization(self):
+        depending_on = {True : self.__data.number_of_userItem_pairs,
+                        False: self.__data.number_of_transactions}
+        return depending_on[self.binarize]
 
     def __delete_precomputed(self):
         if self.__has('scaled_baseline'):
@@ -130,6 +254,28 @@ class MostPopular:
     def __has(self, attribute):
         return hasattr(self, self.__class_prefix + attribute)
 
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_integer_type_and_range_of(block_size):
+        error_message = '"block_size" must be a positive integer!'
+        if not isinstance(block_size, int):
+            log.error('Attempt to set block_size to non-integer type.')
+            raise TypeError(error_message)
+        if block_size < 1:
+            log.error('Attempt to set block_size to value < 1.')
+            raise ValueError(error_message)
+
     @staticmethod
     def __check_boolean_type_of(binarize):
         if not isinstance(binarize, bool):
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from numpy import argpartition, asarray, concatenate, flatnonzero, lexsort
+from numpy import partition
+from scipy.sparse import csr_matrix
+
+
+def neighbour_scores(neighbours, bought, times):
+    """Neighbour lists of the bought articles, summed weighted by times.
+
+    The purchase history is multiplied with the neighbour matrix as a
+    sparse row, so that only the neighbour lists of the bought articles
+    are visited and the cost does not grow with the number of articles.
+
+    Parameters
+    ----------
+    neighbours : scipy.sparse.csr_matrix
+        Square article-article matrix with the neighbours of each article
+        and their weights in one row.
+
+    bought : array-like
+        Internally used integer indices of the bought articles.
+
+    times : array-like
+        How often (or how much) each of the articles in `bought` counts.
+
+    Returns
+    -------
+    tuple
+        Array of the indices of all articles reached and array of their
+        summed scores, in no particular order.
+
+    """
+    bought = asarray(bought, dtype=int)
+    history = csr_matrix((asarray(times, dtype=float), bought,
+                          [0, bought.size]), shape=(1, neighbours.shape[0]))
+    scores = history.dot(neighbours)
+    return scores.indices, scores.data
+
+
+def largest(items, scores, head):
+    """Top `head` articles by descending score, ties by descending index.
+
+    The top articles are selected by partitioning, and only these are
+    sorted, so the cost is O(len(`items`) + `head` log `head`) unless very
+    many articles are tied at the last place selected.
+
+    Parameters
+    ----------
+    items : array-like
+        Internally used integer indices of articles.
+
+    scores : array-like
+        The scores of the articles in `items`.
+
+    head : int
+        The maximum number of articles to return.
+
+    Returns
+    -------
+    tuple
+        Array of article indices and array of their scores, sorted by
+        score in descending order.
+
+    """
+    items = asarray(items, dtype=int)
+    scores = asarray(scores, dtype=float)
+    if head < scores.size:
+        threshold = partition(scores, -head)[-head]
+        above = flatnonzero(scores > threshold)
+        tied = flatnonzero(scores == threshold)
+        missing = head - above.size
+        if missing < tied.size:
+            tied = tied[argpartition(-items[tied], missing - 1)[:missing]]
+        top = concatenate((above, tied))
+        items, scores = items[top], scores[top]
+    top = lexsort((-items, -scores))
+    return items[top], scores[top]
@@ -0,0 +1,515 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import arange, argpartition, asarray, bincount, concatenate
+from numpy import cumsum, diff, lexsort, repeat
+from scipy.sparse import csr_matrix, vstack
+from .baselines import default_baseline
+from .neighbourhood import neighbour_scores, largest
+from .versioning import combined_version, version_before_replacing
+from ..datastructures import Transactions
+
+
+class RandomWalk:
+    """Article-article recommendation from random walks on the purchase graph.
+
+    Customers and articles form a bipartite graph. The probability of
+    walking from one article to another in two steps, via a customer who
+    bought both, serves as their similarity (P3alpha, Cooper et al.).
+    Dividing by the popularity of the destination article to the power of
+    `beta` lets less popular articles compete (RP3beta, Paudel et al.).
+    The article-article transition matrix is computed block by block and
+    pruned to the `number_of_neighbours` most likely destinations of each
+    article on the fly, so that it stays sparse and small even when a
+    full similarity matrix would not fit into memory.
+
+    Attributes
+    ----------
+    binarize : bool, optional
+        Whether a customer's purchase history should be reduced to whether or
+        not an article as bought (``True``), or whether the number of times
+        articles were bought should count (``False``). Defaults to ``True``.
+
+    alpha : float, optional
+        Exponent applied to all one-step transition probabilities. Values
+        above 1 sharpen, values below 1 flatten the walk. Defaults to 1.
+
+    beta : float, optional
+        Exponent of the popularity of the destination article that
+        transition probabilities are divided by. Defaults to 0, which
+        recovers P3alpha.
+
+    number_of_neighbours : int, optional
+        Number of most likely destination articles kept per article.
+        Defaults to 100.
+
+    baseline : object, object
+        Fall-back algorithm needed for customers that only bought articles
+        no one else bought. Defaults to `bestPy.algorithms.Baseline`.
+
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()` and of
+        articles whose transition probabilities are computed together.
+        Defaults to 1000.
+
+    version : int
+        Counter that increases whenever settings or data of the algorithm
+        or of its baseline change in a way that may change the ratings.
+        Read-only.
+
+    Methods
+    -------
+    operating_on(data) : `RandomWalk`
+        Returns the `RandomWalk` instance it is called on with the `data`
+        object attached. It then `has_data` and reveals the methods ...
+
+    for_one(target) : array
+        Returns an array with ratings of all articles for the customer with
+        the internal integer index `target`. The higher the rating,
+        the more highly recommended the article is for customer `target`.
+
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    sparse_for_one(target) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of
+        only the articles with a non-zero rating for the customer with the
+        internal integer index `target`, in no particular order.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        (up to) `max_number_of_items` highest-rated articles for the customer
+        with the internal integer index `target`, in descending order.
+        Only the neighbours of articles bought by `target` are visited.
+
+    Examples
+    --------
+    >>> ratings = RandomWalk().operating_on(data)
+    >>> ratings.beta = 0.5
+    >>> customer = 245
+    >>> ratings.for_one(customer)
+    array([ 0.00512031,  0.        , ...., 0.00143387])
+
+    >>> ratings.top_for_one(customer, 2)
+    (array([ 7, 19]), array([ 0.04126513,  0.03311046]))
+
+    """
+
+    def __init__(self):
+        self.__binarize = True
+        self.__alpha = 1.0
+        self.__beta = 0.0
+        self.__number_of_neighbours = 100
+        self.__baseline = default_baseline()
+        self.__block_size = 1000
+        self.__version = 0
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def binarize(self):
+        """Count number of: times bought (``True``) or buyers (``False``)."""
+        return self.__binarize
+
+    @binarize.setter
+    def binarize(self, binarize):
+        self.__check_boolean_type_of(binarize)
+        self.__change('binarize', binarize)
+
+    @property
+    def alpha(self):
+        """Exponent applied to the one-step transition probabilities."""
+        return self.__alpha
+
+    @alpha.setter
+    def alpha(self, alpha):
+        self.__check_non_negative_number(alpha, 'alpha')
+        self.__change('alpha', float(alpha))
+
+    @property
+    def beta(self):
+        """Exponent of the destination popularity to divide by."""
+        return self.__beta
+
+    @beta.setter
+    def beta(self, beta):
+        self.__check_non_negative_number(beta, 'beta')
+        self.__change('beta', float(beta))
+
+    @property
+    def number_of_neighbours(self):
+        """Number of most likely destination articles kept per article."""
+        return self.__number_of_neighbours
+
+    @number_of_neighbours.setter
+    def number_of_neighbours(self, number_of_neighbours):
+        self.__check_positive_integer(number_of_neighbours,
+                                      'number_of_neighbours')
+        self.__change('number_of_neighbours', number_of_neighbours)
+
+    @property
+    def baseline(self):
+        """Baseline algorithm used for uncomparable customers."""
+        return self.__baseline.__class__.__name__
+
+    @baseline.setter
+    def baseline(self, baseline):
+        baseline = self.__base_attribute_checked(baseline)
+        self.__version = version_before_replacing(self.__version,
+                                                  [self.__baseline])
+        self.__baseline = baseline
+        if self.has_data:
+            self.__baseline = self.__baseline.operating_on(self.__data)
+            self.__baseline = self.__data_attribute_checked(self.__baseline)
+
+    @property
+    def version(self):
+        """Increases whenever settings or data that affect ratings change.
+
+        Includes the version of the baseline that customers are scored
+        with when the walk reaches no article. Setting a new baseline first
+        skips what the old one contributed, so that no earlier value is
+        ever reported again. ``None`` if the baseline has no version.
+
+        """
+        return combined_version(self.__version, [self.__baseline])
+
+    @property
+    def block_size(self):
+        """Maximum number of customers or articles processed at once."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_positive_integer(block_size, 'block_size')
+        self.__block_size = block_size
+
+    def operating_on(self, data):
+        """Set data object for the algorithm to operate on.
+
+        Parameters
+        ----------
+        data : `Transactions`
+            Instance of `bestPy.datastructures.Transactions`.
+
+        Returns
+        -------
+        The instance of `RandomWalk` it is called on, now with the previously
+        hidden `for_one()`, `for_many()`, `sparse_for_one()` and
+        `top_for_one()` methods enabled and the data attached.
+
+        Examples
+        --------
+        >>> algorithm = RandomWalk().operating_on(data)
+        >>> algorithm.has_data
+        True
+
+        """
+        self.__data = self.__transactions_type_checked(data)
+        self.__baseline = self.__baseline.operating_on(data)
+        self.__baseline = self.__data_attribute_checked(self.__baseline)
+        self.__delete_transitions()
+        self.__version += 1
+        self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.sparse_for_one = self.__sparse_for_one
+        self.top_for_one = self.__top_for_one
+        return self
+
+    @property
+    def has_data(self):
+        return self.__has('data')
+
+    def __for_one(self, target):
+        """Make an actual recommendation for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of all items for the target customer.
+
+        Examples
+        --------
+        >>> ratings = RandomWalk().operating_on(data)
+        >>> customer = 245
+        >>> ratings.for_one(customer)
+        array([ 0.00512031,  0.        , ...., 0.00143387])
+
+        """
+        if self.__no_one_else_bought_items_bought_by(target):
+            log.info('Uncomparable user with ID {}. Returning baseline'
+                     ' recommendation.'.format(self.__data.user.id_of[target]))
+            return self.__baseline.for_one(target)
+        history_vector = self.__matrix()[target]
+        return history_vector.dot(self.__transitions()).toarray()[0]
+
+    def __for_many(self, targets):
+        """Make recommendations for blocks of target customers.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the suitability ratings of all articles (columns)
+            for up to `block_size` of the target customers (rows).
+
+        """
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            history = self.__matrix()[block]
+            block_ratings = history.dot(self.__transitions()).toarray()
+            for row in self.__data._uncomparable_users[block].nonzero()[0]:
+                log.info('Uncomparable user with ID {}. Returning baseline'
+                         ' recommendation.'.format(
+                             self.__data.user.id_of[block[row]]))
+                block_ratings[row] = self.__baseline.for_one(block[row])
+            yield block_ratings
+
+    def __sparse_for_one(self, target):
+        """Rate only the articles reachable from the target's purchases.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings, in no
+            particular order. All other articles are rated 0.
+
+        Examples
+        --------
+        >>> ratings = RandomWalk().operating_on(data)
+        >>> customer = 245
+        >>> ratings.sparse_for_one(customer)
+        (array([ 2,  7, 19]), array([ 0.21794872,  0.62820513,  0.57692308]))
+
+        """
+        if self.__no_one_else_bought_items_bought_by(target):
+            log.info('Uncomparable user with ID {}. Returning baseline'
+                     ' recommendation.'.format(self.__data.user.id_of[target]))
+            item_scores = self.__baseline.for_one(target)
+            items = item_scores.nonzero()[0]
+            return items, item_scores[items]
+        return self.__neighbour_scores_of(target)
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the highest-rated articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings,
+            sorted by rating in descending order.
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        if self.__no_one_else_bought_items_bought_by(target):
+            log.info('Uncomparable user with ID {}. Returning baseline'
+                     ' recommendation.'.format(self.__data.user.id_of[target]))
+            return self.__top_of_baseline_for(target, head)
+        items, scores = self.__neighbour_scores_of(target)
+        return largest(items, scores, head)
+
+    def __top_of_baseline_for(self, target, head):
+        if hasattr(self.__baseline, 'top_for_one'):
+            return self.__baseline.top_for_one(target, head)
+        item_scores = self.__baseline.for_one(target)
+        head = min(head, item_scores.size)
+        top_items = argpartition(item_scores, -head)[-head:]
+        return largest(top_items, item_scores[top_items], head)
+
+    def __neighbour_scores_of(self, target):
+        history = self.__matrix()
+        row = slice(history.indptr[target], history.indptr[target + 1])
+        return neighbour_scores(self.__transitions(), history.indices[row],
+                                history.data[row])
+
+    def __transitions(self):
+        """Pruned article-article transition probabilities in CSR format."""
+        if not self.__has('transitions_by_row'):
+            self.__transitions_by_row = self.__pruned_transitions()
+        return self.__transitions_by_row
+
+    def __pruned_transitions(self):
+        """Two-step walks from blocks of articles, pruned block by block.
+
+        Row-normalizing the customer-article matrix gives the probabilities
+        of a customer walking to an article, row-normalizing its transpose
+        those of an article walking to a customer. Their product for one
+        block of articles at a time only ever holds the full neighbourhood
+        of `block_size` articles before it is pruned.
+
+        """
+        matrix = self.__matrix()
+        to_article = self.__row_normalized(matrix)
+        to_customer = self.__row_normalized(matrix.T.tocsr())
+        popularity = asarray(matrix.sum(axis=0)).ravel()
+        popularity[popularity == 0] = 1.0
+        penalty = popularity ** -self.__beta
+        n_items = matrix.shape[1]
+        blocks = []
+        for start in range(0, n_items, self.block_size):
+            block = to_customer[start:start + self.block_size]
+            walks = block.dot(to_article).tocsr()
+            walks.data *= penalty[walks.indices]
+            blocks.append(self.__pruned(walks, start))
+        if not blocks:
+            return csr_matrix((0, n_items))
+        return vstack(blocks, format='csr')
+
+    def __row_normalized(self, matrix):
+        """Rows of `matrix` scaled to sum to one, raised to power `alpha`."""
+        matrix = csr_matrix(matrix, dtype=float, copy=True)
+        sums = asarray(matrix.sum(axis=1)).ravel()
+        sums[sums == 0] = 1.0
+        matrix.data /= repeat(sums, diff(matrix.indptr))
+        matrix.data **= self.__alpha
+        return matrix
+
+    def __pruned(self, walks, first):
+        """The `number_of_neighbours` most likely walks to other articles.
+
+        Row r of `walks` starts from article `first` + r. Walks back to
+        that same article are dropped before pruning so that they do not
+        take up a place among the neighbours.
+
+        """
+        rows = repeat(arange(walks.shape[0]), diff(walks.indptr))
+        elsewhere = (walks.indices != rows + first) & (walks.data > 0)
+        rows = rows[elsewhere]
+        data = walks.data[elsewhere]
+        indices = walks.indices[elsewhere]
+        order = lexsort((indices, -data, rows))
+        lengths = bincount(rows, minlength=walks.shape[0])
+        starts = cumsum(lengths) - lengths
+        ranks = arange(order.size) - starts[rows[order]]
+        keep = order[ranks < self.__number_of_neighbours]
+        keep = keep[lexsort((indices[keep], rows[keep]))]
+        lengths = bincount(rows[keep], minlength=walks.shape[0])
+        indptr = concatenate(([0], cumsum(lengths)))
+        return csr_matrix((data[keep], indices[keep], indptr),
+                          shape=walks.shape)
+
+    def __matrix(self):
+        if self.__binarize:
+            return self.__data.matrix.bool_by_row
+        return self.__data.matrix.by_row
+
+    def __change(self, name, value):
+        attribute = self.__class_prefix + name
+        if value != getattr(self, attribute):
+            self.__delete_transitions()
+            self.__version += 1
+        setattr(self, attribute, value)
+
+    def __delete_transitions(self):
+        if self.__has('transitions_by_row'):
+            delattr(self, self.__class_prefix + 'transitions_by_row')
+
+    def __no_one_else_bought_items_bought_by(self, target):
+        return self.__data._uncomparable_users[target]
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_positive_integer(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __check_non_negative_number(value, name):
+        error_message = '"{}" must be a non-negative number!'.format(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            log.error('Attempt to set {} to non-numeric type.'.format(name))
+            raise TypeError(error_message)
+        if value < 0:
+            log.error('Attempt to set {} to value < 0.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __check_boolean_type_of(binarize):
+        if not isinstance(binarize, bool):
+            log.error('Attempt to set "binarize" to non-boolean type.')
+            raise TypeError('Attribute "binarize" must be True or False!')
+
+    @staticmethod
+    def __transactions_type_checked(data):
+        if not isinstance(data, Transactions):
+            log.error('Attempt to set incompatible data type.'
+                      ' Must be <Transactions>.')
+            raise TypeError('Data must be of type <Transactions>!')
+        return data
+
+    @staticmethod
+    def __base_attribute_checked(baseline):
+        """Check methods and attributes of baseline before data is attached."""
+        if not hasattr(baseline, 'operating_on'):
+            log.error('Attempt to set baseline object lacking mandatory'
+                      ' "operating_on()" method.')
+            raise AttributeError('Baseline lacks "operating_on()" method!')
+        if not callable(baseline.operating_on):
+            log.error('The "operating_on()" method of the baseline object'
+                      ' is not callable.')
+            raise TypeError('Operating_on() method of baseline not callable!')
+        if not hasattr(baseline, 'has_data'):
+            log.error('Attempt to set baseline object lacking mandatory'
+                      ' "has_data" attribute.')
+            raise AttributeError('Baseline lacks "has_data" attribute!')
+        return baseline
+
+    @staticmethod
+    def __data_attribute_checked(baseline):
+        """Check methods and attributes of baseline after data is attached."""
+        if not baseline.has_data:
+            log.error("Baseline object's 'has_data' attribute returned False"
+                      " after attaching data.")
+            raise ValueError('Cannot attach data to baseline object!')
+        if not hasattr(baseline, 'for_one'):
+            log.error('Attempt to set baseline object lacking mandatory'
+                      ' "for_one()" method.')
+            raise AttributeError('Baseline lacks "for_one()" method!')
+        if not callable(baseline.for_one):
+            log.error('The "for_one()" method of the baseline object'
+                      ' is not callable.')
+            raise TypeError('"for_one()" method of baseline not callable!')
+        return baseline
@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
-from numpy import diag
+from numpy import arange, argpartition, argsort, asarray, diag, diff, full
+from numpy import hstack, sqrt, unique, vstack, zeros, zeros_like
+from numpy.linalg import LinAlgError, cholesky, qr, svd
+from numpy.random import RandomState
+from scipy.linalg import solve_triangular
+from scipy.sparse import csr_matrix
 from scipy.sparse.linalg import svds
 from ..datastructures import Transactions
+from ..datastructures.auxiliary import InnerProductIndex
+
+SEED = 0
 
 
 class TruncatedSVD:
@@ -18,12 +26,64 @@ class TruncatedSVD:
 
     number_of_factors : integer, optional
         Number of latent variables thought to charaterize both the customers
-        and the articles. Defaults to 20.
+        and the articles. Defaults to 20. Lowering it reuses the factors
+        already computed, raising it computes (at least twice) more factors,
+        starting from the ones already there.
 
     max_number_of_factors : integer
         Maximum value that `number_of_factors` can be set to. Depends on the
         data and is, therefore, not availabel before calling ...
 
+    solver : str, optional
+        Either ``'arpack'`` to compute the truncated SVD with the iterative
+        `scipy.sparse.linalg.svds` or ``'randomized'`` to use a randomized
+        range finder (Halko, Martinsson & Tropp), which mostly consists of
+        dense matrix products and is much faster for many factors.
+        Defaults to ``'arpack'``.
+
+    oversampling : int, optional
+        Number of random directions sampled on top of `number_of_factors`
+        by the randomized solver. Defaults to 10.
+
+    power_iterations : int, optional
+        Number of power iterations the randomized solver performs to
+        sharpen the decay of the singular values. Defaults to 2.
+
+    incremental : bool, optional
+        Whether attaching new data that only appends customers, articles,
+        and purchases to the previously attached data updates the existing
+        factors (Brand's rank-k update) instead of recomputing the SVD from
+        scratch. Defaults to ``False``.
+
+    max_drift : float, optional
+        Incremental updates are kept as long as the relative error of the
+        factors with respect to the data grows by no more than `max_drift`
+        compared to the last full computation. Otherwise, the SVD is fully
+        recomputed. Defaults to 0.05.
+
+    drift : float
+        Increase of the relative error of the factors since the last full
+        computation of the SVD, as measured after the latest incremental
+        update. Read-only.
+
+    number_of_clusters : int, optional
+        If larger than 0, `top_for_one()` searches an inverted-file index
+        that groups the article factors into this many clusters, instead of
+        rating all articles. Defaults to 0, i.e., exact search.
+
+    number_of_probes : int, optional
+        Number of clusters closest to the customer that are searched by
+        `top_for_one()`. More probes mean higher recall but slower search.
+        Defaults to 8.
+
+    block_size : int, optional
+        Maximum number of customers scored together by `for_many()`.
+        Defaults to 1000.
+
+    version : int
+        Counter that increases whenever settings or data change in a way
+        that may change the ratings. Read-only.
+
     Methods
     -------
     operating_on(data) : `TruncatedSVD`
@@ -35,6 +95,29 @@ class TruncatedSVD:
         the internal integer index `target`. The higher the rating,
         the more highly recommended the article is for the `target` customer.
 
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    fold_in(history) : array
+        Returns the latent factors of a customer, new or not, from the
+        internal integer indices of the articles in the purchase `history`,
+        projected onto the existing article factors.
+
+    for_history(history) : array
+        Returns an array with ratings of all articles for a customer, new
+        or not, with the given purchase `history`, without recomputing
+        the SVD.
+
+    for_items(target, items) : array
+        Returns an array with the ratings of only the articles with the
+        internal integer indices `items` for the customer `target`.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        `max_number_of_items` highest-rated articles in descending order,
+        found approximately if `number_of_clusters` is larger than 0.
+
     Examples
     --------
     >>> ratings = TruncatedSVD().operating_on(data)
@@ -50,12 +133,40 @@ class TruncatedSVD:
     >>> ratings.for_one(customer)
     array([ 0.16129032,  0.09677419, ...., 0.06451613])
 
+    >>> basket = [3, 17, 17]
+    >>> ratings.for_history(basket)
+    array([ 0.03125   ,  0.        , ...., 0.015625  ])
+
+    >>> ratings.solver = 'randomized'
+    >>> ratings.number_of_factors = 200
+
+    >>> ratings.number_of_clusters = 64
+    >>> ratings.top_for_one(customer, 2)
+    (array([ 7, 19]), array([ 0.62820513,  0.57692308]))
+
+    >>> ratings.incremental = True
+    >>> ratings = ratings.operating_on(more_data)
+    >>> ratings.drift
+    0.0034626
+
     """
 
     def __init__(self):
         super().__setattr__('_TruncatedSVD__has_data', False)
         self.__binarize = True
         self.__number_of_factors = 20
+        self.__solver = 'arpack'
+        self.__oversampling = 10
+        self.__power_iterations = 2
+        self.__incremental = False
+        self.__max_drift = 0.05
+        self.__drift = 0.0
+        self.__number_of_clusters = 0
+        self.__number_of_probes = 8
+        self.__block_size = 1000
+        self.__version = 0
+        self.__decompose_with = {'arpack'    : self.__arpack_svd,
+                                 'randomized': self.__randomized_svd}
         self.__class_prefix = '_' + self.__class__.__name__ + '__'
 
     def __setattr__(self, name, value):
@@ -74,6 +185,7 @@ class TruncatedSVD:
         self.__check_boolean_type_of(binarize)
         if binarize != self.binarize:
             self.__delete_USV_matrices()
+            self.__version += 1
         self.__binarize = binarize
 
     @property
@@ -87,7 +199,116 @@ class TruncatedSVD:
         previous_number_of_factors = self.number_of_factors
         self.__set(number_of_factors)
         if self.number_of_factors != previous_number_of_factors:
+            self.__delete_selected_factors()
+            self.__version += 1
+
+    @property
+    def solver(self):
+        """Solver used for the SVD, either 'arpack' or 'randomized'."""
+        return self.__solver
+
+    @solver.setter
+    def solver(self, solver):
+        self.__check_choice_of(solver)
+        if solver != self.solver:
             self.__delete_USV_matrices()
+            self.__version += 1
+        self.__solver = solver
+
+    @property
+    def oversampling(self):
+        """Number of extra random directions of the randomized solver."""
+        return self.__oversampling
+
+    @oversampling.setter
+    def oversampling(self, oversampling):
+        self.__check_non_negative_integer(oversampling, 'oversampling')
+        self.__change_randomized_setting('oversampling', oversampling)
+
+    @property
+    def power_iterations(self):
+        """Number of power iterations of the randomized solver."""
+        return self.__power_iterations
+
+    @power_iterations.setter
+    def power_iterations(self, power_iterations):
+        self.__check_non_negative_integer(power_iterations,
+                                          'power_iterations')
+        self.__change_randomized_setting('power_iterations', power_iterations)
+
+    @property
+    def incremental(self):
+        """Update factors instead of recomputing them when data grows."""
+        return self.__incremental
+
+    @incremental.setter
+    def incremental(self, incremental):
+        if not isinstance(incremental, bool):
+            log.error('Attempt to set "incremental" to non-boolean type.')
+            raise TypeError('Attribute "incremental" must be True or False!')
+        self.__incremental = incremental
+
+    @property
+    def max_drift(self):
+        """Tolerated increase of the relative error of the factors."""
+        return self.__max_drift
+
+    @max_drift.setter
+    def max_drift(self, max_drift):
+        error_message = '"max_drift" must be a non-negative number!'
+        if not isinstance(max_drift, (int, float)):
+            log.error('Attempt to set max_drift to non-numeric type.')
+            raise TypeError(error_message)
+        if max_drift < 0:
+            log.error('Attempt to set max_drift to value < 0.')
+            raise ValueError(error_message)
+        self.__max_drift = max_drift
+
+    @property
+    def drift(self):
+        """Increase of the relative error since the last full SVD."""
+        return self.__drift
+
+    @property
+    def number_of_clusters(self):
+        """Clusters of the article index used by `top_for_one()`."""
+        return self.__number_of_clusters
+
+    @number_of_clusters.setter
+    def number_of_clusters(self, number_of_clusters):
+        self.__check_non_negative_integer(number_of_clusters,
+                                          'number_of_clusters')
+        if number_of_clusters != self.number_of_clusters:
+            self.__delete_index()
+            self.__version += 1
+        self.__number_of_clusters = number_of_clusters
+
+    @property
+    def number_of_probes(self):
+        """Number of index clusters searched by `top_for_one()`."""
+        return self.__number_of_probes
+
+    @number_of_probes.setter
+    def number_of_probes(self, number_of_probes):
+        self.__check_positive_integer(number_of_probes, 'number_of_probes')
+        if number_of_probes != self.number_of_probes:
+            self.__version += 1
+        self.__number_of_probes = number_of_probes
+
+    @property
+    def version(self):
+        """Increases whenever settings or data that affect ratings change."""
+        return self.__version
+
+    @property
+    def block_size(self):
+        """Maximum number of customers scored at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_positive_integer(block_size, 'block_size')
+        self.__block_size = block_size
 
     def operating_on(self, data):
         """Set data object for the algorithm to operate on.
@@ -112,13 +333,24 @@ class TruncatedSVD:
         278
 
         """
+        data = self.__transactions_type_checked(data)
+        previous = self.__data if self.has_data else None
         self.__has_data = False
-        self.__data = self.__transactions_type_checked(data)
+        self.__data = data
         self.max_number_of_factors = self.__data.matrix.min_shape - 1
         self.__has_data = True
         self.__reset(self.number_of_factors)
-        self.__delete_USV_matrices()
+        if self.__can_update_factors_from(previous):
+            self.__update_factors_from(previous)
+        else:
+            self.__delete_USV_matrices()
+        self.__version += 1
         self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.for_items = self.__for_items
+        self.fold_in = self.__fold_in
+        self.for_history = self.__for_history
+        self.top_for_one = self.__top_for_one
         return self
 
     @property
@@ -151,20 +383,368 @@ class TruncatedSVD:
             self.__compute_USV_matrices()
         return self.__U[target].dot(self.__SV)
 
+    def __for_many(self, targets):
+        """Make recommendations for blocks of target customers.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the suitability ratings of all articles (columns)
+            for up to `block_size` of the target customers (rows).
+
+        Examples
+        --------
+        >>> ratings = TruncatedSVD().operating_on(data)
+        >>> customers = [245, 246]
+        >>> next(ratings.for_many(customers))
+        array([[ 0.16129032,  0.09677419, ...., 0.06451613],
+               [ 0.03225806,  0.12903226, ...., 0.        ]])
+
+        """
+        if not self.__has('U'):
+            self.__compute_USV_matrices()
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            yield self.__U[block].dot(self.__SV)
+
+    def __for_items(self, target, items):
+        """Rate only selected articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        items : array-like
+            Internally used integer indices of the articles to rate.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of the selected articles, in the order
+            given by `items`.
+
+        """
+        if not self.__has('U'):
+            self.__compute_USV_matrices()
+        return self.__U[target].dot(self.__SV[:, asarray(items, dtype=int)])
+
+    def __fold_in(self, history):
+        """Project a purchase history onto the existing article factors.
+
+        Parameters
+        ----------
+        history : array-like
+            Internally used integer indices of the articles bought. Articles
+            bought more than once may be repeated and then count multiple
+            times unless `binarize` is ``True``.
+
+        Returns
+        -------
+        array : float
+            Latent factors of a customer with that purchase history, i.e.,
+            what the row of `U` would be if the customer had been there when
+            the SVD was computed.
+
+        Examples
+        --------
+        >>> algorithm = TruncatedSVD().operating_on(data)
+        >>> algorithm.number_of_factors = 3
+        >>> algorithm.fold_in([3, 17, 17])
+        array([ 0.01282707, -0.00490187,  0.01853604])
+
+        """
+        if not self.__has('U'):
+            self.__compute_USV_matrices()
+        projected = self.__V[:, self.__history_checked(history)].sum(axis=1)
+        nonzero = self.__s > 0
+        factors = zeros_like(projected)
+        factors[nonzero] = projected[nonzero] / self.__s[nonzero]
+        return factors
+
+    def __for_history(self, history):
+        """Make a recommendation from a purchase history alone.
+
+        Parameters
+        ----------
+        history : array-like
+            Internally used integer indices of the articles bought. Articles
+            bought more than once may be repeated and then count multiple
+            times unless `binarize` is ``True``.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of all items for a customer with that
+            purchase history, computed from the existing decomposition.
+
+        Examples
+        --------
+        >>> algorithm = TruncatedSVD().operating_on(data)
+        >>> algorithm.for_history([3, 17, 17])
+        array([ 0.03125   ,  0.        , ...., 0.015625  ])
+
+        """
+        return self.__fold_in(history).dot(self.__SV)
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the highest-rated articles for the target customer.
+
+        If `number_of_clusters` is 0, all articles are rated and the top
+        ones are selected by partitioning. Otherwise, only the articles in
+        the `number_of_probes` index clusters closest to the customer's
+        factors are rated, so that the cost no longer grows with the total
+        number of articles, at the price of possibly missing some.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings,
+            sorted by rating in descending order.
+
+        Examples
+        --------
+        >>> ratings = TruncatedSVD().operating_on(data)
+        >>> ratings.number_of_clusters = 64
+        >>> customer = 245
+        >>> ratings.top_for_one(customer, 2)
+        (array([ 7, 19]), array([ 0.62820513,  0.57692308]))
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        if not self.__has('U'):
+            self.__compute_USV_matrices()
+        if self.__number_of_clusters > 0:
+            return self.__index().search(self.__U[target], head,
+                                         self.__number_of_probes)
+        item_scores = self.__U[target].dot(self.__SV)
+        head = min(head, item_scores.size)
+        top = argpartition(item_scores, -head)[-head:]
+        top = top[argsort(-item_scores[top], kind='mergesort')]
+        return top, item_scores[top]
+
+    def __index(self):
+        if not self.__has('item_index'):
+            self.__item_index = InnerProductIndex(self.__SV.T,
+                                                  self.__number_of_clusters)
+        return self.__item_index
+
     def __compute_USV_matrices(self):
-        self.__U, s, V = svds(self.__matrix(), k=self.number_of_factors)
-        self.__SV = diag(s).dot(V)
+        """Select the leading factors, computing more only if necessary.
+
+        Factors are kept at the highest rank computed so far, sorted by
+        singular value, so that any smaller number of factors is just a
+        slice. If more are requested, at least twice as many as before are
+        computed, starting from the factors already there.
+
+        """
+        if self.__number_of_computed_factors() < self.number_of_factors:
+            previous = self.__computed_factors()
+            decompose = self.__decompose_with[self.__solver]
+            U, s, V = decompose(self.__matrix(), self.__rank_to_compute(),
+                                previous)
+            order = argsort(-s, kind='mergesort')
+            self.__all_U, self.__all_s = U[:, order], s[order]
+            self.__all_V = V[order]
+        k = self.number_of_factors
+        self.__U, self.__s = self.__all_U[:, :k], self.__all_s[:k]
+        self.__V = self.__all_V[:k]
+        self.__SV = diag(self.__s).dot(self.__V)
+        self.__error_of_full_svd = self.__relative_error()
+        self.__drift = 0.0
+
+    def __number_of_computed_factors(self):
+        return self.__all_s.size if self.__has('all_s') else 0
+
+    def __computed_factors(self):
+        if self.__has('all_s'):
+            return self.__all_U, self.__all_V
+        return None
+
+    def __rank_to_compute(self):
+        if not self.__has('all_s'):
+            return self.number_of_factors
+        doubled = min(2 * self.__all_s.size, self.max_number_of_factors)
+        return max(self.number_of_factors, doubled)
+
+    def __can_update_factors_from(self, previous):
+        if not (self.__incremental and self.__has('U')):
+            return False
+        if self.__U.shape[1] != self.number_of_factors:
+            return False
+        return (self.__extends(previous.user, self.__data.user) and
+                self.__extends(previous.item, self.__data.item))
+
+    def __update_factors_from(self, previous):
+        """Brand's rank-k update for the rows that changed since `previous`.
+
+        Changed rows are folded in chunks of at most `block_size` rows, which
+        bounds the size of the dense intermediate matrices.
+
+        """
+        self.__delete_computed_factors()
+        self.__delete_index()
+        shape = self.__data.matrix.by_row.shape
+        old = self.__padded(self.__matrix_of(previous), shape)
+        difference = (self.__matrix() - old).tocsr()
+        difference.eliminate_zeros()
+        self.__U = self.__zero_padded(self.__U, shape[0])
+        W = self.__zero_padded(self.__V.T, shape[1])
+        changed = (diff(difference.indptr) > 0).nonzero()[0]
+        for start in range(0, changed.size, self.block_size):
+            rows = changed[start:start + self.block_size]
+            W = self.__brand_update(rows, difference[rows], W)
+        self.__V = W.T
+        self.__SV = diag(self.__s).dot(self.__V)
+        self.__drift = self.__relative_error() - self.__error_of_full_svd
+        if self.__drift > self.__max_drift:
+            log.info('Factors drifted by {:.4f} > {}. Recomputing the SVD.'
+                     .format(self.__drift, self.__max_drift))
+            self.__delete_USV_matrices()
+
+    def __brand_update(self, rows, changes, W):
+        """Update U, s, and W = V.T to the SVD of U s W.T + E_rows changes."""
+        k = self.number_of_factors
+        M = self.__U[rows].T
+        P = -self.__U.dot(M)
+        P[rows, arange(rows.size)] += 1.0
+        P_basis, _ = qr(P)
+        N = changes.dot(W).T
+        Q = changes.T.toarray() - W.dot(N)
+        Q_basis, _ = qr(Q)
+        left = vstack((M, P_basis.T.dot(P)))
+        right = vstack((N, Q_basis.T.dot(Q)))
+        K = left.dot(right.T)
+        K[:k, :k] += diag(self.__s)
+        K_U, self.__s, K_V = svd(K)
+        self.__s = self.__s[:k]
+        self.__U = hstack((self.__U, P_basis)).dot(K_U[:, :k])
+        return hstack((W, Q_basis)).dot(K_V[:k].T)
+
+    def __relative_error(self):
+        """Frobenius norm of data minus factor product relative to data."""
+        matrix = self.__matrix()
+        squared_norm = matrix.multiply(matrix).sum()
+        if squared_norm == 0:
+            return 0.0
+        projected = (self.__U * matrix.dot(self.__V.T)).sum(axis=0)
+        residual = (squared_norm - 2.0 * self.__s.dot(projected) +
+                    self.__s.dot(self.__s))
+        return sqrt(max(residual, 0.0) / squared_norm)
+
+    def __history_checked(self, history):
+        history = asarray(history, dtype=int).ravel()
+        n_items = self.__data.item.count
+        if ((history < 0) | (history >= n_items)).any():
+            log.error('Attempt to fold in purchases of unknown articles.')
+            raise IndexError('Article indices must be between 0 and {}!'
+                             .format(n_items - 1))
+        if self.__binarize:
+            return unique(history)
+        return history
+
+    @staticmethod
+    def __arpack_svd(matrix, k, previous=None):
+        """Truncated SVD with ARPACK, started close to `previous` factors."""
+        if previous is None:
+            return svds(matrix, k=k)
+        U, V = previous
+        if matrix.shape[0] >= matrix.shape[1]:
+            start = V.sum(axis=0)
+        else:
+            start = U.sum(axis=1)
+        random = RandomState(SEED)
+        start = start + random.standard_normal(start.size) / sqrt(start.size)
+        return svds(matrix, k=k, v0=start)
+
+    def __randomized_svd(self, matrix, k, previous=None):
+        """Truncated SVD from a randomized range finder (Halko et al.).
+
+        The range of the matrix is sampled with a random Gaussian matrix
+        and sharpened by power iterations. Only the shorter side is
+        re-orthonormalized in between, always with Cholesky QR, because
+        that consists of matrix products and is much faster than a
+        Householder QR of tall matrices. Right singular vectors of
+        `previous` factors, if any, replace part of the random sample.
+
+        """
+        if matrix.shape[0] < matrix.shape[1]:
+            if previous is not None:
+                previous = previous[1].T, previous[0].T
+            V, s, U = self.__randomized_svd(matrix.T.tocsr(), k, previous)
+            return U.T, s, V.T
+        n_samples = min(k + self.__oversampling, min(matrix.shape))
+        random = RandomState(SEED)
+        sample = random.standard_normal((matrix.shape[1], n_samples))
+        if previous is not None:
+            known = previous[1][:n_samples].T
+            sample[:, :known.shape[1]] = known
+        Y = matrix.dot(sample)
+        for _ in range(self.__power_iterations):
+            Y = matrix.dot(self.__orthonormalized(matrix.T.dot(Y)))
+        Q = self.__orthonormalized(Y)
+        U, s, V = svd(matrix.T.dot(Q).T, full_matrices=False)
+        return Q.dot(U[:, :k]), s[:k], V[:k]
+
+    @staticmethod
+    def __orthonormalized(Y):
+        """Orthonormal basis of the columns of Y via Cholesky QR, twice."""
+        try:
+            for _ in range(2):
+                L = cholesky(Y.T.dot(Y))
+                Y = solve_triangular(L, Y.T, lower=True).T
+            return Y
+        except LinAlgError:
+            return qr(Y)[0]
+
+    def __change_randomized_setting(self, name, value):
+        attribute = self.__class_prefix + name
+        if value != getattr(self, attribute):
+            if self.__solver == 'randomized':
+                self.__delete_USV_matrices()
+                self.__version += 1
+        super().__setattr__(attribute, value)
 
     def __delete_USV_matrices(self):
-        if self.__has('U'):
-            delattr(self, self.__class_prefix + 'U')
-        if self.__has('SV'):
-            delattr(self, self.__class_prefix + 'SV')
+        self.__delete_selected_factors()
+        self.__delete_computed_factors()
+
+    def __delete_index(self):
+        if self.__has('item_index'):
+            delattr(self, self.__class_prefix + 'item_index')
+
+    def __delete_selected_factors(self):
+        self.__delete_index()
+        for attribute in ('U', 's', 'V', 'SV'):
+            if self.__has(attribute):
+                delattr(self, self.__class_prefix + attribute)
+
+    def __delete_computed_factors(self):
+        for attribute in ('all_U', 'all_s', 'all_V'):
+            if self.__has(attribute):
+                delattr(self, self.__class_prefix + attribute)
 
     def __matrix(self):
+        return self.__matrix_of(self.__data)
+
+    def __matrix_of(self, data):
         if self.__binarize:
-            return self.__data.matrix.bool_by_row
-        return self.__data.matrix.by_row
+            return data.matrix.bool_by_row
+        return data.matrix.by_row
 
     def __set(self, number_of_factors):
         if not self.has_data:
@@ -194,6 +774,64 @@ class TruncatedSVD:
             log.error('Attempt to set number_of_factors to value < 1.')
             raise ValueError(error_message)
 
+    @staticmethod
+    def __extends(old_index, new_index):
+        if new_index.count < old_index.count:
+            return False
+        return all(new_index.index_of.get(identifier) == index
+                   for identifier, index in old_index.index_of.items())
+
+    @staticmethod
+    def __padded(matrix, shape):
+        matrix = matrix.tocsr()
+        missing_rows = shape[0] - matrix.shape[0]
+        indptr = hstack((matrix.indptr, full(missing_rows, matrix.indptr[-1],
+                                             dtype=matrix.indptr.dtype)))
+        return csr_matrix((matrix.data, matrix.indices, indptr), shape=shape)
+
+    @staticmethod
+    def __zero_padded(factors, number_of_rows):
+        missing = zeros((number_of_rows - factors.shape[0], factors.shape[1]))
+        return vstack((factors, missing))
+
+    @staticmethod
+    def __check_non_negative_integer(value, name):
+        error_message = '"{}" must be a non-negative integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 0:
+            log.error('Attempt to set {} to value < 0.'.format(name))
+            raise ValueError(error_message)
+
+    def __check_choice_of(self, solver):
+        if solver not in self.__decompose_with:
+            log.error('Attempt to set solver to unknown value.')
+            raise ValueError('Attribute "solver" must be one of: {}!'.format(
+                ', '.join(sorted(self.__decompose_with))))
+
+    @staticmethod
+    def __check_positive_integer(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
     @staticmethod
     def __check_boolean_type_of(binarize):
         if not isinstance(binarize, bool):
@@ -0,0 +1,523 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import arange, argpartition, argsort, asarray, concatenate, cumsum
+from numpy import diff, full, isin, newaxis, repeat, split, unique, vstack
+from numpy import zeros
+from .collaborativefiltering import CollaborativeFiltering
+from .truncatedsvd import TruncatedSVD
+from .baselines import default_baseline
+from .versioning import combined_version, version_before_replacing
+from ..datastructures import Transactions
+
+
+class TwoStage:
+    """Recommendation by re-rating candidates gathered from cheap sources.
+
+    Rating all articles for every customer gets expensive with large
+    catalogs. Instead, a few candidate articles are first collected from
+    one or more cheap sources, e.g., the neighbours of the articles a
+    customer bought (`CollaborativeFiltering`), the most popular articles
+    (`Baseline`), or the hits of an approximate index (`TruncatedSVD` with
+    `number_of_clusters` > 0). Only these candidates are then rated by the
+    (expensive) scorer, so that the cost per customer grows with the number
+    of candidates instead of with the number of articles.
+
+    Attributes
+    ----------
+    sources : tuple
+        Names of the algorithms candidates are gathered from. Defaults to
+        `CollaborativeFiltering` and `Baseline`. Read-only, see
+        `generating_from()`.
+
+    scorer : str
+        Name of the algorithm that rates the candidates. Defaults to
+        `TruncatedSVD`. Read-only, see `scoring_with()`.
+
+    number_of_candidates : int, optional
+        Maximum number of candidate articles taken from each source.
+        Defaults to 100.
+
+    block_size : int, optional
+        Maximum number of customers rated together by `for_many()`.
+        Defaults to 1000.
+
+    version : int
+        Counter that increases whenever settings, sources, or scorer change
+        in a way that may change the ratings. Read-only.
+
+    Methods
+    -------
+    generating_from(*sources) : `TwoStage`
+        Returns the `TwoStage` instance it is called on with the algorithm
+        objects candidates are gathered from replaced by `sources`.
+
+    scoring_with(scorer) : `TwoStage`
+        Returns the `TwoStage` instance it is called on with the algorithm
+        object that rates the candidates replaced by `scorer`.
+
+    operating_on(data) : `TwoStage`
+        Returns the `TwoStage` instance it is called on with the `data`
+        object attached to it and to all sources and the scorer. It then
+        `has_data` and reveals the methods ...
+
+    candidates_for(target) : array
+        Returns the sorted, internal integer indices of the candidate
+        articles for the customer with the internal integer index `target`.
+        Articles the customer already bought are never candidates, so that
+        they do not take up places among the few candidates.
+
+    for_one(target) : array
+        Returns an array with ratings of all articles for the customer with
+        the internal integer index `target`. Articles that are not among
+        the candidates are rated -inf.
+
+    for_many(targets) : generator
+        Yields 2-D arrays with the ratings of all articles (columns) for
+        up to `block_size` of the customers (rows) in `targets` at a time.
+
+    sparse_for_one(target) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of
+        only the candidate articles for the customer with the internal
+        integer index `target`.
+
+    top_for_one(target, max_number_of_items) : tuple
+        Returns a tuple of two arrays with the indices and the ratings of the
+        (up to) `max_number_of_items` highest-rated candidate articles for
+        the customer with the internal integer index `target`, in
+        descending order.
+
+    Examples
+    --------
+    >>> svd = TruncatedSVD()
+    >>> svd.number_of_clusters = 64
+    >>> algorithm = TwoStage().generating_from(CollaborativeFiltering(),
+    ...                                        Baseline(), svd)
+    >>> algorithm = algorithm.scoring_with(EASE())
+    >>> recommendation = RecoBasedOn(data).using(algorithm)
+
+    """
+
+    def __init__(self):
+        self.__sources = (CollaborativeFiltering(), default_baseline())
+        self.__scorer = TruncatedSVD()
+        self.__number_of_candidates = 100
+        self.__block_size = 1000
+        self.__version = 0
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def sources(self):
+        """Names of the algorithms candidates are gathered from."""
+        return tuple(source.__class__.__name__ for source in self.__sources)
+
+    @property
+    def scorer(self):
+        """Name of the algorithm that rates the candidates."""
+        return self.__scorer.__class__.__name__
+
+    @property
+    def number_of_candidates(self):
+        """Maximum number of candidate articles taken from each source."""
+        return self.__number_of_candidates
+
+    @number_of_candidates.setter
+    def number_of_candidates(self, number_of_candidates):
+        self.__check_positive_integer(number_of_candidates,
+                                      'number_of_candidates')
+        if number_of_candidates != self.__number_of_candidates:
+            self.__version += 1
+        self.__number_of_candidates = number_of_candidates
+
+    @property
+    def block_size(self):
+        """Maximum number of customers rated at once by `for_many()`."""
+        return self.__block_size
+
+    @block_size.setter
+    def block_size(self, block_size):
+        self.__check_positive_integer(block_size, 'block_size')
+        self.__block_size = block_size
+
+    @property
+    def version(self):
+        """Increases whenever settings, sources, or scorer change.
+
+        The versions of sources and scorer are added. Before either is
+        replaced, the own counter skips what all of them contributed, so
+        that the version never returns to an earlier value. ``None`` if
+        any source or the scorer has no version.
+
+        """
+        return combined_version(self.__version, self.__algorithms())
+
+    def generating_from(self, *sources):
+        """Set the algorithm objects that candidates are gathered from.
+
+        Parameters
+        ----------
+        *sources : objects
+            Algorithm objects. Those with a `top_for_one()` method only
+            contribute their top articles without rating all of them.
+
+        Returns
+        -------
+        The instance of `TwoStage` it is called on with the sources set.
+
+        Examples
+        --------
+        >>> algorithm = TwoStage().generating_from(Baseline())
+        >>> algorithm.sources
+        ('Baseline',)
+
+        """
+        if not sources:
+            log.error('Attempt to set no candidate sources.')
+            raise ValueError('At least one candidate source is required!')
+        for source in sources:
+            self.__check_base_attributes_of(source)
+        self.__version = version_before_replacing(self.__version,
+                                                  self.__algorithms())
+        if self.has_data:
+            sources = tuple(self.__attached(source) for source in sources)
+        self.__sources = tuple(sources)
+        return self
+
+    def scoring_with(self, scorer):
+        """Set the algorithm object that rates the candidates.
+
+        Parameters
+        ----------
+        scorer : object
+            Algorithm object. If it has a `for_items()` method, only the
+            candidates are rated. Otherwise, its `for_one()` method rates
+            all articles and the candidates are picked from the result.
+
+        Returns
+        -------
+        The instance of `TwoStage` it is called on with the scorer set.
+
+        Examples
+        --------
+        >>> algorithm = TwoStage().scoring_with(EASE())
+        >>> algorithm.scorer
+        'EASE'
+
+        """
+        self.__check_base_attributes_of(scorer)
+        self.__version = version_before_replacing(self.__version,
+                                                  self.__algorithms())
+        if self.has_data:
+            scorer = self.__attached(scorer)
+        self.__scorer = scorer
+        return self
+
+    def operating_on(self, data):
+        """Set data object for the algorithm to operate on.
+
+        Parameters
+        ----------
+        data : `Transactions`
+            Instance of `bestPy.datastructures.Transactions`.
+
+        Returns
+        -------
+        The instance of `TwoStage` it is called on, now with the previously
+        hidden `candidates_for()`, `for_one()`, `for_many()`,
+        `sparse_for_one()`, and `top_for_one()` methods enabled and the
+        data attached.
+
+        Examples
+        --------
+        >>> algorithm = TwoStage().operating_on(data)
+        >>> algorithm.has_data
+        True
+
+        """
+        self.__data = self.__transactions_type_checked(data)
+        self.__sources = tuple(self.__attached(source)
+                               for source in self.__sources)
+        self.__scorer = self.__attached(self.__scorer)
+        self.__version += 1
+        self.candidates_for = self.__candidates_for
+        self.for_one = self.__for_one
+        self.for_many = self.__for_many
+        self.sparse_for_one = self.__sparse_for_one
+        self.top_for_one = self.__top_for_one
+        return self
+
+    @property
+    def has_data(self):
+        return self.__has('data')
+
+    def __candidates_for(self, target):
+        """Gather the candidate articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        array : int
+            Sorted internal integer indices of the union of the (up to)
+            `number_of_candidates` top articles of each source among those
+            the target customer did not buy yet.
+
+        Examples
+        --------
+        >>> algorithm = TwoStage().operating_on(data)
+        >>> algorithm.candidates_for(245)
+        array([  2,   7,  19, ..., 8104])
+
+        """
+        return unique(concatenate([self.__top_items_of(source, target)
+                                   for source in self.__sources]))
+
+    def __for_one(self, target):
+        """Rate the candidate articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        array : float
+            Suitability ratings of all items for the target customer, -inf
+            for all articles that are not among the candidates.
+
+        Examples
+        --------
+        >>> ratings = TwoStage().operating_on(data)
+        >>> customer = 245
+        >>> ratings.for_one(customer)
+        array([ -inf,  -inf, ...., 0.06451613])
+
+        """
+        candidates, scores = self.__rated_candidates_for(target)
+        item_scores = full(self.__data.item.count, float('-inf'))
+        item_scores[candidates] = scores
+        return item_scores
+
+    def __for_many(self, targets):
+        """Rate the candidate articles for blocks of target customers.
+
+        Sources without a `top_for_one()` method rate whole blocks of
+        customers at once. If the scorer has no `for_items()` method, it
+        rates whole blocks of customers, too, and all articles that are no
+        candidates are then set to -inf in one go.
+
+        Parameters
+        ----------
+        targets : array-like
+            Internally used integer indices of the target customers.
+
+        Yields
+        ------
+        array : float
+            2-D array with the suitability ratings of all articles (columns)
+            for up to `block_size` of the target customers (rows), -inf for
+            all articles that are not among the candidates.
+
+        """
+        targets = asarray(targets, dtype=int)
+        for start in range(0, targets.size, self.block_size):
+            block = targets[start:start + self.block_size]
+            is_candidate = self.__candidates_in(block)
+            if not hasattr(self.__scorer, 'for_items'):
+                block_ratings = self.__block_of_ratings_from(self.__scorer,
+                                                             block)
+                block_ratings[~is_candidate] = float('-inf')
+                yield block_ratings
+                continue
+            rows, candidates = is_candidate.nonzero()
+            bounds = cumsum(is_candidate.sum(axis=1))[:-1]
+            scores = concatenate([
+                self.__scorer.for_items(target, candidates_of_target)
+                for target, candidates_of_target
+                in zip(block, split(candidates, bounds))])
+            block_ratings = full((block.size, self.__data.item.count),
+                                 float('-inf'))
+            block_ratings[rows, candidates] = scores
+            yield block_ratings
+
+    def __sparse_for_one(self, target):
+        """Rate only the candidate articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        Returns
+        -------
+        tuple
+            Array of the sorted indices of the candidate articles and array
+            of their ratings. All other articles are not rated at all.
+
+        Examples
+        --------
+        >>> ratings = TwoStage().operating_on(data)
+        >>> customer = 245
+        >>> ratings.sparse_for_one(customer)
+        (array([ 2,  7, 19]), array([ 0.21794872,  0.62820513,  0.57692308]))
+
+        """
+        return self.__rated_candidates_for(target)
+
+    def __top_for_one(self, target, max_number_of_items=5):
+        """Find the highest-rated candidate articles for the target customer.
+
+        Parameters
+        ----------
+        target : int
+            Internally used integer index of the target customer.
+
+        max_number_of_items : int, optional
+            The maximum number of articles to return. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            Array of article indices and array of their ratings,
+            sorted by rating in descending order.
+
+        Examples
+        --------
+        >>> ratings = TwoStage().operating_on(data)
+        >>> customer = 245
+        >>> ratings.top_for_one(customer, 2)
+        (array([ 7, 19]), array([ 0.62820513,  0.57692308]))
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        candidates, scores = self.__rated_candidates_for(target)
+        head = min(head, scores.size)
+        top = argpartition(scores, -head)[-head:]
+        top = top[argsort(-scores[top], kind='mergesort')]
+        return candidates[top], scores[top]
+
+    def __rated_candidates_for(self, target):
+        candidates = self.__candidates_for(target)
+        if hasattr(self.__scorer, 'for_items'):
+            return candidates, self.__scorer.for_items(target, candidates)
+        return candidates, self.__scorer.for_one(target)[candidates]
+
+    def __candidates_in(self, block):
+        """Boolean array marking the candidates of each target in a block."""
+        head = min(self.__number_of_candidates, self.__data.item.count)
+        is_candidate = zeros((block.size, self.__data.item.count), dtype=bool)
+        history = self.__data.matrix.by_row[block]
+        buyers = repeat(arange(block.size), diff(history.indptr))
+        for source in self.__sources:
+            if hasattr(source, 'top_for_one'):
+                tops = [self.__top_items_of(source, target)
+                        for target in block]
+                rows = concatenate([full(top.size, row, dtype=int)
+                                    for row, top in enumerate(tops)])
+                is_candidate[rows, concatenate(tops)] = True
+                continue
+            block_ratings = self.__block_of_ratings_from(source, block)
+            block_ratings[buyers, history.indices] = float('-inf')
+            tops = argpartition(block_ratings, -head, axis=1)[:, -head:]
+            is_candidate[arange(block.size)[:, newaxis], tops] = True
+        is_candidate[buyers, history.indices] = False
+        return is_candidate
+
+    def __top_items_of(self, source, target):
+        """Top articles of one source the target customer did not buy."""
+        by_row = self.__data.matrix.by_row
+        start, stop = by_row.indptr[target], by_row.indptr[target + 1]
+        bought = by_row.indices[start:stop]
+        if hasattr(source, 'top_for_one'):
+            head = min(self.__number_of_candidates + bought.size,
+                       self.__data.item.count)
+            top = asarray(source.top_for_one(target, head)[0], dtype=int)
+            return top[~isin(top, bought)][:self.__number_of_candidates]
+        head = min(self.__number_of_candidates, self.__data.item.count)
+        item_scores = source.for_one(target)
+        item_scores[bought] = float('-inf')
+        top = argpartition(item_scores, -head)[-head:]
+        return top[~isin(top, bought)]
+
+    @staticmethod
+    def __block_of_ratings_from(algorithm, block):
+        if hasattr(algorithm, 'for_many'):
+            return vstack(list(algorithm.for_many(block)))
+        return vstack([algorithm.for_one(target) for target in block])
+
+    def __attached(self, algorithm):
+        algorithm = algorithm.operating_on(self.__data)
+        self.__check_data_attributes_of(algorithm)
+        return algorithm
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    def __algorithms(self):
+        return self.__sources + (self.__scorer,)
+
+    @staticmethod
+    def __integer_type_and_range_checked(requested):
+        if not isinstance(requested, int):
+            log.error('Requested number of recommendations is not an integer.')
+            raise TypeError('Requested number of recommendations must be'
+                            ' a positive integer!')
+        if requested < 1:
+            log.error('Requested number of recommendations < 1.')
+            raise ValueError('Requested number of recommendations must be'
+                             ' a positive integer!')
+        return requested
+
+    @staticmethod
+    def __check_positive_integer(value, name):
+        error_message = '"{}" must be a positive integer!'.format(name)
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError(error_message)
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError(error_message)
+
+    @staticmethod
+    def __transactions_type_checked(data):
+        if not isinstance(data, Transactions):
+            log.error('Attempt to set incompatible data type.'
+                      ' Must be <Transactions>.')
+            raise TypeError('Data must be of type <Transactions>!')
+        return data
+
+    @staticmethod
+    def __check_base_attributes_of(algorithm):
+        """Check methods of sources and scorer before they get data."""
+        if not hasattr(algorithm, 'operating_on'):
+            log.error('Attempt to set object lacking mandatory'
+                      ' "operating_on()" method.')
+            raise AttributeError('Object lacks "operating_on()" method!')
+        if not callable(algorithm.operating_on):
+            log.error('The "operating_on()" method of this object'
+                      ' is not callable.')
+            raise TypeError('"operating_on()" method of object not callable!')
+        if not hasattr(algorithm, 'has_data'):
+            log.error('Attempt to set object lacking mandatory'
+                      ' "has_data" attribute.')
+            raise AttributeError('Object lacks "has_data" attribute!')
+
+    @staticmethod
+    def __check_data_attributes_of(algorithm):
+        """Check methods of sources and scorer after they got data."""
+        if not algorithm.has_data:
+            log.error("Object's 'has_data' attribute returned False"
+                      " after attaching data.")
+            raise ValueError('Cannot attach data to object!')
+        if not hasattr(algorithm, 'for_one'):
+            log.error('Attempt to set object lacking mandatory'
+                      ' "for_one()" method.')
+            raise AttributeError('Object lacks "for_one()" method!')
+        if not callable(algorithm.for_one):
+            log.error('Attempt to set object with a "for_one()" method'
+                      ' that is not callable.')
+            raise TypeError('"for_one()" method of object not callable!')
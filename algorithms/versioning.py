@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+
+def version_of(algorithm):
+    """The `version` of an algorithm object, ``None`` if it has none.
+
+    Objects without a `version` attribute (or with a `version` of
+    ``None``) may change their ratings at any time. Results computed from
+    them must therefore not be cached.
+
+    Parameters
+    ----------
+    algorithm : object
+        Algorithm object that may or may not have a `version` attribute.
+
+    Returns
+    -------
+    int or None
+        The version of the algorithm or ``None`` if it is not versioned.
+
+    """
+    return getattr(algorithm, 'version', None)
+
+
+def combined_version(own, algorithms):
+    """Own version of a composite algorithm plus those of its parts.
+
+    Parameters
+    ----------
+    own : int
+        Version counter of the composite algorithm itself.
+
+    algorithms : iterable
+        The algorithm objects the composite algorithm relies on.
+
+    Returns
+    -------
+    int or None
+        The sum of all versions or ``None`` if any of the `algorithms`
+        is not versioned.
+
+    """
+    versions = [version_of(algorithm) for algorithm in algorithms]
+    if None in versions:
+        return None
+    return own + sum(versions)
+
+
+def version_before_replacing(own, algorithms):
+    """Own version of a composite algorithm before parts are replaced.
+
+    The own version skips everything the replaced `algorithms` contributed
+    to the combined version, so that the combined version never returns to
+    an earlier value, no matter what versions the new algorithms report.
+
+    Parameters
+    ----------
+    own : int
+        Version counter of the composite algorithm itself.
+
+    algorithms : iterable
+        The algorithm objects about to be replaced.
+
+    Returns
+    -------
+    int
+        The new own version of the composite algorithm.
+
+    """
+    versions = (version_of(algorithm) for algorithm in algorithms)
+    return own + 1 + sum(version for version in versions
+                         if version is not None)
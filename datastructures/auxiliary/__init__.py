@@ -5,3 +5,6 @@ from .matrixfrom import MatrixFrom
 from .testdatafrom import TestDataFrom
 from .filefrom import FileFrom
 from .postgreSQLparams import PostgreSQLparams
+from .lrucache import LRUCache
+from .sketches import HyperLogLogs, CountMinSketch
+from .innerproductindex import InnerProductIndex
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import arange, argpartition, argsort, asarray, bincount, concatenate
+from numpy import cumsum, hstack, maximum, searchsorted, sqrt, zeros
+from numpy.random import RandomState
+
+CHUNK_SIZE = 4096
+
+
+class InnerProductIndex:
+    """Inverted-file index for approximate maximum-inner-product search.
+
+    Item vectors are augmented by one extra coordinate so that they all
+    have the same norm. Then, the largest inner product with a query is
+    found at the smallest euclidean distance, and the items can be
+    clustered with k-means. A search only scores the items in the
+    `number_of_probes` clusters closest to the query, trading recall
+    for speed.
+
+    """
+
+    def __init__(self, vectors, number_of_clusters,
+                 number_of_iterations=10, seed=0):
+        vectors = asarray(vectors, dtype=float)
+        self.__check_integer_type_and_range_of(number_of_clusters,
+                                               'number of clusters')
+        self.__check_integer_type_and_range_of(number_of_iterations,
+                                               'number of iterations')
+        number_of_clusters = min(number_of_clusters, vectors.shape[0])
+        augmented = self.__augmented(vectors)
+        centroids = self.__k_means(augmented, number_of_clusters,
+                                   number_of_iterations, seed)
+        clusters = self.__nearest(centroids, augmented)
+        members = argsort(clusters, kind='mergesort')
+        sizes = bincount(clusters, minlength=number_of_clusters)
+        self.__offsets = concatenate(([0], cumsum(sizes)))
+        self.__members = members
+        self.__vectors = vectors[members]
+        self.__centroids = centroids[:, :-1]
+        self.__squared_centroid_norms = (centroids**2).sum(axis=1)
+
+    @property
+    def number_of_clusters(self):
+        return self.__centroids.shape[0]
+
+    @property
+    def number_of_items(self):
+        return self.__members.size
+
+    def search(self, query, max_number_of_items, number_of_probes=1):
+        """Items with (approximately) the largest inner products with query.
+
+        The clusters closest to the query are visited until at least
+        `number_of_probes` clusters and `max_number_of_items` items have
+        been scored.
+
+        Returns
+        -------
+        tuple
+            Array of item indices and array of their inner products with
+            the query, sorted in descending order.
+
+        """
+        self.__check_integer_type_and_range_of(number_of_probes,
+                                               'number of probes')
+        query = asarray(query, dtype=float)
+        distances = (self.__squared_centroid_norms -
+                     2.0 * self.__centroids.dot(query))
+        probes = argsort(distances, kind='mergesort')
+        sizes = cumsum(self.__offsets[probes + 1] - self.__offsets[probes])
+        enough = searchsorted(sizes, min(max_number_of_items,
+                                         self.number_of_items)) + 1
+        probes = probes[:max(number_of_probes, enough)]
+        rows = concatenate([arange(self.__offsets[probe],
+                                   self.__offsets[probe + 1])
+                            for probe in probes])
+        scores = self.__vectors[rows].dot(query)
+        head = min(max_number_of_items, rows.size)
+        top = argpartition(scores, -head)[-head:]
+        top = top[argsort(-scores[top], kind='mergesort')]
+        return self.__members[rows[top]], scores[top]
+
+    def __k_means(self, points, number_of_clusters, iterations, seed):
+        random = RandomState(seed)
+        first = random.choice(points.shape[0], number_of_clusters,
+                              replace=False)
+        centroids = points[first].copy()
+        for _ in range(iterations):
+            clusters = self.__nearest(centroids, points)
+            sizes = bincount(clusters, minlength=number_of_clusters)
+            sums = zeros(centroids.shape)
+            for dimension in range(points.shape[1]):
+                sums[:, dimension] = bincount(clusters,
+                                              weights=points[:, dimension],
+                                              minlength=number_of_clusters)
+            filled = sizes > 0
+            centroids[filled] = sums[filled] / sizes[filled, None]
+        return centroids
+
+    @staticmethod
+    def __nearest(centroids, points):
+        """Index of the closest centroid for each point, chunk by chunk."""
+        squared_norms = (centroids**2).sum(axis=1)
+        nearest = zeros(points.shape[0], dtype=int)
+        for start in range(0, points.shape[0], CHUNK_SIZE):
+            chunk = points[start:start + CHUNK_SIZE]
+            distances = squared_norms - 2.0 * chunk.dot(centroids.T)
+            nearest[start:start + CHUNK_SIZE] = distances.argmin(axis=1)
+        return nearest
+
+    @staticmethod
+    def __augmented(vectors):
+        squared_norms = (vectors**2).sum(axis=1)
+        largest = squared_norms.max() if squared_norms.size else 0.0
+        extra = sqrt(maximum(largest - squared_norms, 0.0))
+        return hstack((vectors, extra[:, None]))
+
+    @staticmethod
+    def __check_integer_type_and_range_of(value, name):
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError('The {} must be a positive integer!'.format(name))
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError('The {} must be a positive integer!'.format(name))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from collections import OrderedDict
+from time import monotonic
+
+
+class LRUCache:
+    def __init__(self, max_size, time_to_live=None):
+        self.__max_size = self.__integer_type_and_range_checked(max_size)
+        self.__time_to_live = self.__type_and_range_checked(time_to_live)
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+    @property
+    def time_to_live(self):
+        return self.__time_to_live
+
+    @property
+    def size(self):
+        return len(self.__entries)
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def get(self, key):
+        """Cached value for key or None if absent or expired."""
+        try:
+            stored_at, value = self.__entries[key]
+        except KeyError:
+            self.__misses += 1
+            return None
+        if self.__expired(stored_at):
+            del self.__entries[key]
+            self.__misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry."""
+        if self.__max_size < 1:
+            return
+        self.__entries[key] = (monotonic(), value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        self.__entries.clear()
+
+    def __expired(self, stored_at):
+        if self.__time_to_live is None:
+            return False
+        return monotonic() - stored_at > self.__time_to_live
+
+    @staticmethod
+    def __integer_type_and_range_checked(max_size):
+        if not isinstance(max_size, int):
+            log.error('Attempt to set cache size to non-integer type.')
+            raise TypeError('Cache size must be an integer >= 0!')
+        if max_size < 0:
+            log.error('Attempt to set cache size to value < 0.')
+            raise ValueError('Cache size must be an integer >= 0!')
+        return max_size
+
+    @staticmethod
+    def __type_and_range_checked(time_to_live):
+        if time_to_live is None:
+            return time_to_live
+        if not isinstance(time_to_live, (int, float)):
+            log.error('Attempt to set time to live of cache entries'
+                      ' to non-numeric type.')
+            raise TypeError('Time to live must be a positive number!')
+        if time_to_live <= 0:
+            log.error('Attempt to set time to live of cache entries'
+                      ' to value <= 0.')
+            raise ValueError('Time to live must be a positive number!')
+        return time_to_live
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from hashlib import blake2b
+from numpy import arange, full, log as ln, minimum, zeros
+from numpy.random import RandomState
+
+HASH_BITS = 64
+MERSENNE_PRIME = 2**31 - 1
+
+
+def hash_of(key):
+    """Deterministic 64-bit hash of the string representation of `key`."""
+    digest = blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class HyperLogLogs:
+    """One HyperLogLog counter of distinct keys per slot, kept in one array.
+
+    Memory is `number_of_slots` * (2**`precision` + 12) bytes, independent
+    of how many distinct keys are counted. The relative standard error of
+    the estimates is about 1.04 / sqrt(2**`precision`). The harmonic sum
+    and the number of empty registers of each slot are kept up to date
+    while adding, so that estimates never need to look at the registers.
+
+    """
+
+    def __init__(self, number_of_slots, precision=8):
+        self.__check_integer_type_and_range_of(number_of_slots, 1,
+                                               'number of slots')
+        self.__check_integer_type_and_range_of(precision, 4,
+                                               'precision', 16)
+        self.__precision = precision
+        self.__registers = zeros((number_of_slots, 2**precision),
+                                 dtype='uint8')
+        self.__sums = full(number_of_slots, 2.0**precision)
+        self.__empty = full(number_of_slots, 2**precision, dtype='uint32')
+
+    @property
+    def precision(self):
+        return self.__precision
+
+    @property
+    def nbytes(self):
+        return (self.__registers.nbytes + self.__sums.nbytes +
+                self.__empty.nbytes)
+
+    def add(self, slot, key):
+        """Record `key` as seen in `slot`. Returns whether a register grew."""
+        hashed = hash_of(key)
+        remaining_bits = HASH_BITS - self.__precision
+        register = hashed >> remaining_bits
+        rest = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        old_rank = int(self.__registers[slot, register])
+        if rank > old_rank:
+            self.__registers[slot, register] = rank
+            self.__sums[slot] += 2.0**-rank - 2.0**-old_rank
+            if old_rank == 0:
+                self.__empty[slot] -= 1
+            return True
+        return False
+
+    def estimate(self, slot):
+        """Estimated number of distinct keys seen in one slot."""
+        return float(self.__estimated(slice(slot, slot + 1))[0])
+
+    def estimates(self):
+        """Estimated number of distinct keys seen in each slot."""
+        return self.__estimated(slice(None))
+
+    def __estimated(self, slots):
+        m = 2.0**self.__precision
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        raw = alpha * m * m / self.__sums[slots]
+        empty = self.__empty[slots].astype(float)
+        small = (raw <= 2.5 * m) & (empty > 0)
+        raw[small] = m * ln(m / empty[small])
+        return raw
+
+    @staticmethod
+    def __check_integer_type_and_range_of(value, lowest, name, highest=None):
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError('The {} must be an integer!'.format(name))
+        if value < lowest or (highest is not None and value > highest):
+            log.error('Attempt to set {} to value out of range.'.format(name))
+            raise ValueError('The {} is out of range!'.format(name))
+
+
+class CountMinSketch:
+    """Count-Min sketch of counts for integer keys in `range(number_of_keys)`.
+
+    Memory is `depth` * `width` integers, independent of how many keys
+    there are. The columns of a key are hashed whenever it is accessed
+    instead of being stored. Estimates never undercount and overcount by
+    at most e / `width` times the total count with probability
+    1 - exp(-`depth`).
+
+    """
+
+    def __init__(self, number_of_keys, width=2048, depth=4, seed=0):
+        self.__check_integer_type_and_range_of(number_of_keys,
+                                               'number of keys')
+        self.__check_integer_type_and_range_of(width, 'width')
+        self.__check_integer_type_and_range_of(depth, 'depth')
+        random = RandomState(seed)
+        self.__a = random.randint(1, MERSENNE_PRIME, size=depth)
+        self.__a = self.__a.astype('int64')
+        self.__b = random.randint(0, MERSENNE_PRIME, size=depth)
+        self.__b = self.__b.astype('int64')
+        self.__number_of_keys = number_of_keys
+        self.__width = width
+        self.__rows = arange(depth)
+        self.__table = zeros((depth, width), dtype='int64')
+        self.__total = 0
+
+    @property
+    def nbytes(self):
+        return (self.__table.nbytes + self.__a.nbytes + self.__b.nbytes +
+                self.__rows.nbytes)
+
+    @property
+    def total(self):
+        return self.__total
+
+    def add(self, key, count=1):
+        """Add `count` to `key` and return its new estimated count."""
+        columns = self.__columns_of(key)
+        self.__table[self.__rows, columns] += count
+        self.__total += count
+        return int(self.__table[self.__rows, columns].min())
+
+    def estimate(self, key):
+        return int(self.__table[self.__rows, self.__columns_of(key)].min())
+
+    def estimates(self):
+        """Estimated counts of all keys at once, hashed one row at a time."""
+        keys = arange(self.__number_of_keys, dtype='int64')
+        estimates = self.__table[0, self.__columns_of(keys, 0)]
+        for row in self.__rows[1:]:
+            minimum(estimates, self.__table[row, self.__columns_of(keys, row)],
+                    out=estimates)
+        return estimates
+
+    def __columns_of(self, key, row=slice(None)):
+        hashed = (self.__a[row] * key + self.__b[row]) % MERSENNE_PRIME
+        return hashed % self.__width
+
+    @staticmethod
+    def __check_integer_type_and_range_of(value, name):
+        if not isinstance(value, int):
+            log.error('Attempt to set {} to non-integer type.'.format(name))
+            raise TypeError('The {} must be a positive integer!'.format(name))
+        if value < 1:
+            log.error('Attempt to set {} to value < 1.'.format(name))
+            raise ValueError('The {} must be a positive integer!'.format(name))
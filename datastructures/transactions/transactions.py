@@ -62,6 +62,7 @@ class Transactions:
         self.__matrix = MatrixFrom(counts)
         self.__number_of_userItem_pairs = len(counts)
         self.__check_data_for_consistency()
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
 
     @classmethod
     def from_csv(cls, file, separator=';'):
@@ -140,6 +141,18 @@ class Transactions:
         """Array of customer indices who bought array of article indices"""
         return unique(self.matrix.by_col[:, items].indices)
 
+    @property
+    def _uncomparable_users(self):
+        """Boolean array flagging customers sharing no article with others."""
+        if not self.__has('uncomparable_users'):
+            shared_items = self.matrix.bool_by_col.getnnz(axis=0) > 1
+            shared_per_user = self.matrix.bool_by_row.dot(shared_items)
+            self.__uncomparable_users = shared_per_user == 0
+        return self.__uncomparable_users
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
     @staticmethod
     def __int_type_value_checked(n_trans):
         log_msg = ('Attempt to instantiate data object with number of'
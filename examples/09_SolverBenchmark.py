@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Compares the two solvers of the `TruncatedSVD` algorithm.
+
+For a range of factor counts, this script times how long it takes to
+compute the truncated SVD of the training data with ARPACK (`svds`) and
+with the randomized range finder, and it reports the `Benchmark` score
+each of them achieves on the held-out test data. Run it from within the
+examples folder, optionally passing the factor counts to try, e.g.,
+
+    $ python 09_SolverBenchmark.py 10 50 100 200
+
+"""
+
+# We only need the following two lines because the examples folder is a
+# subdirectory of the bestPy package.
+import sys
+sys.path.append('../..')
+
+from time import perf_counter
+from bestPy import write_log_to, RecoBasedOn, Benchmark
+from bestPy.algorithms import TruncatedSVD
+from bestPy.datastructures import TrainTest
+
+# Log only warnings and errors, hold out the last 4 unique purchases of
+# each customer, and also allow articles to be recommended back.
+write_log_to('logfile.txt', 30)
+file = './examples_data.csv'
+data = TrainTest.from_csv(file)
+data.split(4, False)
+
+factor_counts = [int(arg) for arg in sys.argv[1:]] or [10, 20, 50, 100, 200]
+solvers = ['arpack', 'randomized']
+
+print('{:>8} {:>11} {:>10} {:>8}'.format('factors', 'solver',
+                                         'seconds', 'score'))
+for number_of_factors in factor_counts:
+    for solver in solvers:
+        algorithm = TruncatedSVD()
+        algorithm.solver = solver
+        recommendation = RecoBasedOn(data.train).using(algorithm)
+        algorithm.number_of_factors = number_of_factors
+        # The SVD is computed lazily, on the first rating requested.
+        start = perf_counter()
+        algorithm.for_one(0)
+        seconds = perf_counter() - start
+        score = Benchmark(recommendation).against(data.test).score
+        print('{:>8} {:>11} {:>10.3f} {:>8.4f}'.format(
+            algorithm.number_of_factors, solver, seconds, score))
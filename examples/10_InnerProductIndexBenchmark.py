@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Recall and latency of approximate top-N search with `TruncatedSVD`.
+
+With `number_of_clusters` > 0, the `top_for_one()` method of the
+`TruncatedSVD` algorithm only rates the articles in the `number_of_probes`
+clusters of article factors closest to the customer. This script compares
+the articles found that way with the exact top articles and reports the
+average recall and the time per customer for a range of probes. Run it
+from within the examples folder, optionally passing the number of
+clusters, e.g.,
+
+    $ python 10_InnerProductIndexBenchmark.py 128
+
+"""
+
+# We only need the following two lines because the examples folder is a
+# subdirectory of the bestPy package.
+import sys
+sys.path.append('../..')
+
+from time import perf_counter
+from bestPy import write_log_to
+from bestPy.algorithms import TruncatedSVD
+from bestPy.datastructures import Transactions
+
+# Log only warnings and errors and factorize the example data.
+write_log_to('logfile.txt', 30)
+file = './examples_data.csv'
+data = Transactions.from_csv(file)
+algorithm = TruncatedSVD().operating_on(data)
+algorithm.solver = 'randomized'
+algorithm.number_of_factors = 50
+
+number_of_clusters = int(sys.argv[1]) if sys.argv[1:] else 128
+number_of_items = 10
+customers = range(0, data.user.count, 50)
+
+
+def top_items_and_seconds():
+    start = perf_counter()
+    tops = [set(algorithm.top_for_one(customer, number_of_items)[0])
+            for customer in customers]
+    return tops, (perf_counter() - start) / len(customers)
+
+
+# First, the exact top articles from rating all articles. The SVD is
+# computed lazily, so we trigger it before timing anything.
+_ = algorithm.top_for_one(0, number_of_items)
+exact, seconds = top_items_and_seconds()
+print('{:>8} {:>8} {:>12}'.format('probes', 'recall', 'ms/customer'))
+print('{:>8} {:>8.3f} {:>12.4f}'.format('exact', 1.0, 1000 * seconds))
+
+# Then, the approximate ones for an increasing number of probes.
+# The index is built lazily, too.
+algorithm.number_of_clusters = number_of_clusters
+_ = algorithm.top_for_one(0, number_of_items)
+probes = 1
+while probes <= number_of_clusters:
+    algorithm.number_of_probes = probes
+    approximate, seconds = top_items_and_seconds()
+    recall = sum(len(found & true) for found, true
+                 in zip(approximate, exact)) / (number_of_items * len(exact))
+    print('{:>8} {:>8.3f} {:>12.4f}'.format(probes, recall, 1000 * seconds))
+    probes *= 2
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Latency of sparse top-N queries against rating all articles.
+
+The `top_for_one()` method of `CollaborativeFiltering` multiplies the
+purchase history of a customer with the similarity matrix as a sparse
+row and selects the top articles among those reached by partitioning.
+This script compares its time per customer with that of rating all
+articles with `for_one()` and partitioning the dense result, and checks
+that both find equally highly rated articles. Run it from within the
+examples folder, optionally passing the similarity to use, e.g.,
+
+    $ python 11_NeighbourhoodTopBenchmark.py jaccard
+
+"""
+
+# We only need the following two lines because the examples folder is a
+# subdirectory of the bestPy package.
+import sys
+sys.path.append('../..')
+
+from time import perf_counter
+from numpy import allclose, argpartition, argsort
+from bestPy import write_log_to
+from bestPy.algorithms import CollaborativeFiltering
+from bestPy.algorithms.similarities import all_similarities
+from bestPy.datastructures import Transactions
+
+# Log only warnings and errors and compute the similarity matrix.
+write_log_to('logfile.txt', 30)
+file = './examples_data.csv'
+data = Transactions.from_csv(file)
+algorithm = CollaborativeFiltering().operating_on(data)
+similarity = sys.argv[1] if sys.argv[1:] else 'kulsinski'
+algorithm.similarity = {function.__name__: function
+                        for function in all_similarities}[similarity]
+
+number_of_items = 10
+customers = [customer for customer in range(0, data.user.count, 10)
+             if not data._uncomparable_users[customer]]
+
+
+def dense_top_for(customer):
+    item_scores = algorithm.for_one(customer)
+    top = argpartition(item_scores, -number_of_items)[-number_of_items:]
+    return item_scores[top[argsort(-item_scores[top])]]
+
+
+def sparse_top_for(customer):
+    return algorithm.top_for_one(customer, number_of_items)[1]
+
+
+def scores_and_seconds(top_for):
+    start = perf_counter()
+    scores = [top_for(customer) for customer in customers]
+    return scores, (perf_counter() - start) / len(customers)
+
+
+# The similarity matrix is computed lazily, so we trigger it first.
+_ = algorithm.top_for_one(customers[0], number_of_items)
+dense, dense_seconds = scores_and_seconds(dense_top_for)
+sparse, sparse_seconds = scores_and_seconds(sparse_top_for)
+agree = all(allclose(one[:len(other)], other)
+            for one, other in zip(dense, sparse))
+print('{:>12} {:>12}'.format('path', 'ms/customer'))
+print('{:>12} {:>12.4f}'.format('for_one', 1000 * dense_seconds))
+print('{:>12} {:>12.4f}'.format('top_for_one', 1000 * sparse_seconds))
+print('Top ratings agree: {}'.format(agree))
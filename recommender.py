@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
-from numpy import argpartition
+from numpy import arange, argpartition, argsort, array, asarray, concatenate
+from numpy import dtype, empty, flatnonzero, full, isfinite, isin, newaxis
+from numpy import take_along_axis, zeros
 from .algorithms import DefaultAlgorithm
 from .algorithms import default_baseline
+from .algorithms.versioning import version_of
 from .datastructures import Transactions
+from .datastructures.auxiliary import LRUCache
 
 RETURNING = True
 
@@ -39,6 +43,24 @@ class RecoBasedOn:
         Algorithm object to provide a cold-start recommendation for
         unknown customers. Defaults to `bestPy.algorithms.Baseline`.
 
+    sparse : bool, optional
+        Whether `for_one()` and `ranked_for_one()` ask algorithms that have
+        a `sparse_for_one()` method for the indices and ratings of only the
+        articles they rate at all (``True``), instead of for the ratings of
+        all articles (``False``). Defaults to ``False``.
+
+    filters : dict
+        Names of the registered article filters with the number of times
+        each was updated since it was registered. Read-only, see
+        `excluding()`, `updating()`, and `dropping()`.
+
+    cache_hits : int
+        Number of calls to `for_one()` answered from the result cache.
+
+    cache_misses : int
+        Number of calls to `for_one()` that had to compute recommendations
+        while the result cache was enabled.
+
     Methods
     -------
     using(algorithm) : `RecoBasedOn`
@@ -46,10 +68,52 @@ class RecoBasedOn:
         returns the instance of `RecoBasedOn` it is called on, with
         the recommendation algorithm set accordingly.
 
+    caching(max_size, time_to_live) : `RecoBasedOn`
+        Returns the instance of `RecoBasedOn` it is called on, with a
+        least-recently-used cache for the results of `for_one()` enabled.
+
+    excluding(name, targets) : `RecoBasedOn`
+        Returns the instance of `RecoBasedOn` it is called on, with a filter
+        `name` registered that excludes the articles with IDs in `targets`
+        from all recommendations.
+
+    updating(name, excluded, included) : `RecoBasedOn`
+        Returns the instance of `RecoBasedOn` it is called on, with the
+        articles with IDs in `excluded` added to and those with IDs in
+        `included` removed from the filter `name`.
+
+    dropping(name) : `RecoBasedOn`
+        Returns the instance of `RecoBasedOn` it is called on, with the
+        filter `name` removed.
+
     for_one(target, max_number_of_items) : generator
         Returns a generator of up to `max_number_of_items article` IDs,
         which are the recommendations for the customer with ID `target`.
 
+    ranked_for_one(target, max_number_of_items, structured) : generator
+        Returns a generator of up to `max_number_of_items` pairs of article
+        ID and rating, sorted by descending rating, for the customer with
+        ID `target`. Optionally returns a numpy structured array instead.
+
+    for_many(targets, max_number_of_items) : tuple
+        Returns two 2-D arrays with the internal indices and the ratings of
+        up to `max_number_of_items` recommended articles (columns) for each
+        of the customers with IDs in `targets` (rows).
+
+    for_basket(targets, max_number_of_items) : generator
+        Returns a generator of up to `max_number_of_items` article IDs,
+        which are the recommendations for an anonymous customer with the
+        articles with IDs in `targets` in their basket.
+
+    for_item(target, max_number_of_items) : generator
+        Returns a generator of up to `max_number_of_items` article IDs,
+        which are the articles most similar to the article with ID `target`.
+
+    for_items(targets, max_number_of_items) : tuple
+        Returns two 2-D arrays with the internal indices and the similarities
+        of up to `max_number_of_items` articles (columns) most similar to
+        each of the articles with IDs in `targets` (rows).
+
     Examples
     --------
     >>> reco = RecoBasedOn(data).using(algorithm).pruning_old
@@ -64,10 +128,16 @@ class RecoBasedOn:
     def __init__(self, data):
         self.__data = self.__transactions_type_checked(data)
         self.__only_new = True
+        self.__sparse = False
         self.__baseline = default_baseline().operating_on(data)
         self.__recommendation = DefaultAlgorithm().operating_on(data)
         self.__recommendation_for = {not RETURNING: self.__cold_start,
-                                         RETURNING: self.__calculated}
+                                         RETURNING: self.__ranked}
+        self.__cache = LRUCache(0)
+        self.__filters = {}
+        self.__filter_versions = {}
+        self.__filter_version = 0
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
 
     def using(self, algorithm):
         """Sets the algorithm object to compute recommendations.
@@ -92,8 +162,161 @@ class RecoBasedOn:
         self.__check_base_attributes_of(algorithm)
         self.__recommendation = algorithm.operating_on(self.__data)
         self.__check_data_attributes_of(algorithm)
+        self.__cache.clear()
+        return self
+
+    def caching(self, max_size, time_to_live=None):
+        """Enables a result cache for `for_one()`.
+
+        Results are cached per customer, number of requested articles,
+        setting of `only_new`, and version of the algorithm and baseline.
+        Algorithm and baseline objects report changes to their settings or
+        data through their `version` attribute, which invalidates all
+        results computed before. Objects without a `version` attribute
+        may change at any time, so results are not cached while such an
+        algorithm or baseline is used. Setting a new algorithm or baseline
+        empties the cache.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of results to keep. The least recently used
+            result is evicted first. A value of 0 disables the cache.
+
+        time_to_live : float, optional
+            Number of seconds after which a cached result expires.
+            Defaults to ``None``, meaning that results never expire.
+
+        Returns
+        -------
+        The `RecoBasedOn` instance it is called on with a new,
+        empty result cache.
+
+        Examples
+        --------
+        >>> recommendation = RecoBasedOn(data).caching(10000, 600)
+        >>> top_two = recommendation.for_one(customer, 2)
+        >>> top_two = recommendation.for_one(customer, 2)
+        >>> recommendation.cache_hits
+        1
+
+        """
+        self.__cache = LRUCache(max_size, time_to_live)
+        return self
+
+    def excluding(self, name, targets):
+        """Registers a named filter excluding articles from recommendations.
+
+        Filters are kept as boolean arrays over all articles. Articles
+        excluded by any of them are removed from the ratings before the
+        top articles are selected, by `for_one()`, `ranked_for_one()`,
+        `for_many()`, `for_basket()`, `for_item()`, and `for_items()`
+        alike, including cold-start recommendations. If fewer articles
+        than requested are left, only those are returned.
+
+        Parameters
+        ----------
+        name : str
+            Name of the filter, e.g., 'out_of_stock'. An existing filter
+            with the same name is replaced.
+
+        targets : iterable
+            IDs of the articles to exclude. Unknown articles are ignored.
+
+        Returns
+        -------
+        The `RecoBasedOn` instance it is called on with the filter set.
+
+        Examples
+        --------
+        >>> reco = RecoBasedOn(data).excluding('adult', adult_articles)
+        >>> reco.filters
+        {'adult': 0}
+
+        """
+        self.__check_string_type_of(name)
+        mask = zeros(self.__data.item.count, dtype=bool)
+        mask[self.__item_indices_of(targets)] = True
+        self.__filters[name] = mask
+        self.__filter_versions[name] = (
+            self.__filter_versions[name] + 1
+            if name in self.__filter_versions else 0)
+        self.__filter_version += 1
+        return self
+
+    def updating(self, name, excluded=(), included=()):
+        """Changes which articles a registered filter excludes.
+
+        Only the given articles are touched, which makes this cheap enough
+        to follow, e.g., every change of stock.
+
+        Parameters
+        ----------
+        name : str
+            Name of a registered filter.
+
+        excluded : iterable, optional
+            IDs of articles to exclude from now on. Defaults to none.
+
+        included : iterable, optional
+            IDs of articles not to exclude anymore. Defaults to none.
+
+        Returns
+        -------
+        The `RecoBasedOn` instance it is called on with the filter updated.
+
+        Examples
+        --------
+        >>> reco = reco.updating('out_of_stock', excluded=['bestPyMug'],
+        ...                      included=['bestPyBaseCap'])
+        >>> reco.filters
+        {'out_of_stock': 1}
+
+        """
+        mask = self.__registered(name)
+        mask[self.__item_indices_of(excluded)] = True
+        mask[self.__item_indices_of(included)] = False
+        self.__filter_versions[name] += 1
+        self.__filter_version += 1
+        return self
+
+    def dropping(self, name):
+        """Removes a registered filter.
+
+        Parameters
+        ----------
+        name : str
+            Name of a registered filter.
+
+        Returns
+        -------
+        The `RecoBasedOn` instance it is called on without the filter.
+
+        Examples
+        --------
+        >>> reco = reco.dropping('out_of_stock')
+        >>> reco.filters
+        {}
+
+        """
+        self.__registered(name)
+        del self.__filters[name]
+        del self.__filter_versions[name]
+        self.__filter_version += 1
         return self
 
+    @property
+    def filters(self):
+        return dict(self.__filter_versions)
+
+    @property
+    def cache_hits(self):
+        return self.__cache.hits
+
+    @property
+    def cache_misses(self):
+        return self.__cache.misses
+
     @property
     def algorithm(self):
         return self.__recommendation.__class__.__name__
@@ -112,6 +335,14 @@ class RecoBasedOn:
     def only_new(self):
         return self.__only_new
 
+    @property
+    def sparse(self):
+        return self.__sparse
+
+    @sparse.setter
+    def sparse(self, sparse):
+        self.__sparse = self.__boolean_type_checked(sparse)
+
     @property
     def baseline(self):
         return self.__baseline.__class__.__name__
@@ -121,6 +352,8 @@ class RecoBasedOn:
         self.__check_base_attributes_of(baseline)
         self.__baseline = baseline.operating_on(self.__data)
         self.__check_data_attributes_of(baseline)
+        self.__delete_baseline_ranking()
+        self.__cache.clear()
 
     def for_one(self, target, max_number_of_items=5):
         """Provides the actual recommendations.
@@ -152,13 +385,384 @@ class RecoBasedOn:
 
         """
         head = self.__integer_type_and_range_checked(max_number_of_items)
-        type_of = target in self.__data.user.index_of.keys()
-        item_scores = self.__recommendation_for[type_of](target)
-        sorted_item_indices = argpartition(item_scores, -head)[-head:]
+        versions = (version_of(self.__recommendation),
+                    version_of(self.__baseline))
+        if self.__cache.max_size and None not in versions:
+            key = (target, head, self.__only_new, self.__sparse,
+                   self.__filter_version) + versions
+            sorted_item_indices = self.__cache.get(key)
+            if sorted_item_indices is None:
+                sorted_item_indices = self.__top_item_indices(target, head)
+                self.__cache.put(key, sorted_item_indices)
+        else:
+            sorted_item_indices = self.__top_item_indices(target, head)
         return (self.__data.item.id_of[index] for index in sorted_item_indices)
 
-    def __cold_start(self, target=None):
+    def ranked_for_one(self, target, max_number_of_items=5, structured=False):
+        """Provides the recommendations together with their ratings.
+
+        If the algorithm has a `top_for_one()` method, it is asked for the
+        top articles directly (and for as many more as the customer bought,
+        if only new articles are recommended). Otherwise, the top articles
+        are found by partitioning the ratings of all articles and then
+        sorting only the selected ones. With N = `max_number_of_items`,
+        the cost is then O(number of articles + N log N).
+
+        Parameters
+        ----------
+        target : object
+            ID of the customer to provide a recommendation for.
+
+        max_number_of_items : int, optional
+            The number of recommendations to provide. If fewer
+            than that are available, only the available number
+            will be returned. Defaults to 5.
+
+        structured : bool, optional
+            Whether to return a numpy structured array with fields "item"
+            and "score" (``True``) instead of a generator (``False``).
+            Defaults to ``False``.
+
+        Returns
+        -------
+        recommendations : generator or numpy.ndarray
+            Up to `max_number_of_items` pairs of article ID and rating,
+            sorted by descending rating.
+
+        Examples
+        --------
+        >>> reco = RecoBasedOn(data).using(algorithm).keeping_old
+        >>> top_two = reco.ranked_for_one(customer, 2)
+        >>> for article, rating in top_two:
+        >>>     print(article, rating)
+        'bestPyHoodieMedium' 0.62820513
+        'bestPyBaseCap' 0.57692308
+
+        >>> reco.ranked_for_one(customer, 2, structured=True)
+        array([('bestPyHoodieMedium', 0.62820513),
+               ('bestPyBaseCap', 0.57692308)],
+              dtype=[('item', '<U18'), ('score', '<f8')])
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        self.__check_boolean_type_of(structured)
+        type_of = target in self.__data.user.index_of.keys()
+        items, scores = self.__recommendation_for[type_of](target, head)
+        item_ids = self.__item_ids()[items]
+        if structured:
+            ranked = empty(head, dtype=[('item', item_ids.dtype),
+                                        ('score', dtype(float))])
+            ranked['item'] = item_ids
+            ranked['score'] = scores
+            return ranked
+        return zip(item_ids.tolist(), scores.tolist())
+
+    def for_many(self, targets, max_number_of_items=5):
+        """Provides recommendations for many customers at once.
+
+        Customer IDs are resolved in one go and all unknown customers share
+        a single cold-start recommendation. Known customers are scored in
+        blocks by the algorithm, articles they already bought are masked
+        for the whole block at once, and the top articles are selected
+        row by row with vectorized partitioning and sorting.
+
+        Parameters
+        ----------
+        targets : iterable
+            IDs of the customers to provide recommendations for.
+
+        max_number_of_items : int, optional
+            The number of recommendations to provide per customer. If fewer
+            than that are available, only the available number will be
+            returned. Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            A 2-D integer array with the internal indices of the recommended
+            articles and a 2-D float array with their ratings. There is one
+            row per customer and each row is sorted by descending rating.
+            Use the `item.id_of` attribute of the data to translate the
+            article indices into article IDs.
+
+        Examples
+        --------
+        >>> reco = RecoBasedOn(data).using(algorithm).pruning_old
+        >>> items, ratings = reco.for_many([customer, other_customer], 2)
+        >>> items
+        array([[ 7, 19],
+               [ 2,  3]])
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        index_of = self.__data.user.index_of
+        target_indices = array([index_of.get(target, -1)
+                                for target in targets], dtype=int)
+        top_items = empty((target_indices.size, head), dtype=int)
+        top_scores = empty((target_indices.size, head))
+        unknown = target_indices < 0
+        if unknown.any():
+            log.info('{} unknown target users. Defaulting to baseline'
+                     ' recommendation.'.format(unknown.sum()))
+            items, scores = self.__baseline_ranking()
+            top_items[unknown] = items[:head]
+            top_scores[unknown] = scores[:head]
+        rows = (~unknown).nonzero()[0]
+        start = 0
+        for block_scores in self.__block_scores_for(target_indices[rows]):
+            block_rows = rows[start:start + block_scores.shape[0]]
+            if self.__only_new:
+                bought = self.__data.matrix.by_row[target_indices[block_rows]]
+                bought = bought.tocoo()
+                block_scores[bought.row, bought.col] = float('-inf')
+            top_items[block_rows], top_scores[block_rows] = self.__allowed_top(
+                block_scores, head)
+            start += block_scores.shape[0]
+        return top_items, top_scores
+
+    def for_basket(self, targets, max_number_of_items=5):
+        """Provides recommendations for an ad-hoc basket of articles.
+
+        Anonymous customers are not part of the data, but the articles in
+        their basket may well be. The algorithm rates all articles for a
+        customer with just these articles in their purchase history,
+        without changing the data or recomputing anything. This requires
+        an algorithm with a `for_history()` method, e.g.,
+        `bestPy.algorithms.CollaborativeFiltering` or
+        `bestPy.algorithms.TruncatedSVD`.
+
+        Parameters
+        ----------
+        targets : iterable
+            IDs of the articles in the basket. Articles may be repeated.
+            Unknown articles are ignored. If none are known, or if the
+            algorithm rates all articles the same, the baseline
+            recommendation is returned.
+
+        max_number_of_items : int, optional
+            The number of recommendations to provide. If fewer
+            than that are available, only the available number
+            will be returned. Defaults to 5.
+
+        Returns
+        -------
+        recommendations : generator
+            A generator for up to `max_number_of_items` article IDs,
+            sorted by descending rating. If `only_new` is ``True``, the
+            articles in the basket are not recommended.
+
+        Examples
+        --------
+        >>> reco = RecoBasedOn(data).using(algorithm).pruning_old
+        >>> basket = ['bestPyHoodieMedium', 'bestPyBaseCap']
+        >>> for article in reco.for_basket(basket, 2):
+        >>>     print(article)
+        'bestPyHoodieLarge'
+        'bestPyMug'
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        if not hasattr(self.__recommendation, 'for_history'):
+            log.error('Attempt to rate a basket with an algorithm lacking'
+                      ' a "for_history()" method.')
+            raise AttributeError('Algorithm cannot rate baskets! Use, e.g.,'
+                                 ' CollaborativeFiltering or TruncatedSVD.')
+        basket = self.__item_indices_of(targets)
+        if basket.size == 0:
+            log.info('No known articles in basket. Defaulting to baseline'
+                     ' recommendation.')
+            return self.__cold_start_for_basket(basket, head)
+        item_scores = self.__recommendation.for_history(basket)
+        if self.__only_new:
+            item_scores[basket] = float('-inf')
+        excluded = self.__excluded()
+        if excluded is not None:
+            item_scores[excluded] = float('-inf')
+        rated = item_scores[isfinite(item_scores)]
+        if rated.size == 0 or rated.min() == rated.max():
+            log.info('All articles rated the same for this basket.'
+                     ' Defaulting to baseline recommendation.')
+            return self.__cold_start_for_basket(basket, head)
+        items = self.__allowed_top(item_scores[newaxis, :], head)[0][0]
+        return (self.__data.item.id_of[index] for index in items)
+
+    def __cold_start_for_basket(self, basket, head):
+        items = self.__baseline_ranking()[0]
+        if self.__only_new:
+            items = items[~isin(items, basket)]
+        return (self.__data.item.id_of[index] for index in items[:head])
+
+    def for_item(self, target, max_number_of_items=5):
+        """Provides the articles most similar to a given article.
+
+        The algorithm must be able to look up similar articles, e.g.,
+        `bestPy.algorithms.CollaborativeFiltering`, which keeps a table
+        with the most similar articles of each article.
+
+        Parameters
+        ----------
+        target : object
+            ID of the article to find similar articles for.
+
+        max_number_of_items : int, optional
+            The number of similar articles to provide. If fewer
+            than that are available, only the available number
+            will be returned. Defaults to 5.
+
+        Returns
+        -------
+        similar articles : generator
+            A generator for up to `max_number_of_items` article IDs,
+            sorted by descending similarity to the specified article.
+
+        Examples
+        --------
+        >>> reco = RecoBasedOn(data).using(algorithm)
+        >>> similar = reco.for_item('bestPyHoodieMedium', 2)
+        >>> for article in similar:
+        >>>     print(article)
+        'bestPyHoodieLarge'
+        'bestPyBaseCap'
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        similar = self.__similar_items_source()
+        if target not in self.__data.item.index_of.keys():
+            items = self.__cold_start_for_item(head)[0]
+        else:
+            excluded = self.__excluded()
+            fetch = head if excluded is None else self.__data.item.count
+            items = similar.similar_to_one(self.__data.item.index_of[target],
+                                           fetch)[0]
+            if excluded is not None:
+                items = items[~excluded[items]][:head]
+        return (self.__data.item.id_of[index] for index in items)
+
+    def for_items(self, targets, max_number_of_items=5):
+        """Provides the articles most similar to many articles at once.
+
+        Parameters
+        ----------
+        targets : iterable
+            IDs of the articles to find similar articles for.
+
+        max_number_of_items : int, optional
+            The number of similar articles to provide per article.
+            Defaults to 5.
+
+        Returns
+        -------
+        tuple
+            A 2-D integer array with the internal indices of the similar
+            articles and a 2-D float array with their similarities. There
+            is one row per target article and each row is sorted by
+            descending similarity. Rows with fewer similar articles are
+            padded with index -1 and similarity -inf. Unknown articles get
+            the baseline recommendation. Use the `item.id_of` attribute of
+            the data to translate the article indices into article IDs.
+
+        Examples
+        --------
+        >>> reco = RecoBasedOn(data).using(algorithm)
+        >>> items, similarities = reco.for_items([article, other_article], 2)
+        >>> items
+        array([[ 7, 19],
+               [ 2, -1]])
+
+        """
+        head = self.__integer_type_and_range_checked(max_number_of_items)
+        similar = self.__similar_items_source()
+        index_of = self.__data.item.index_of
+        target_indices = array([index_of.get(target, -1)
+                                for target in targets], dtype=int)
+        top_items = full((target_indices.size, head), -1, dtype=int)
+        top_scores = full((target_indices.size, head), float('-inf'))
+        unknown = target_indices < 0
+        if unknown.any():
+            items, scores = self.__cold_start_for_item(head)
+            top_items[unknown] = items
+            top_scores[unknown] = scores
+        known = ~unknown
+        excluded = self.__excluded()
+        fetch = head if excluded is None else self.__data.item.count
+        items, scores = similar.similar_to_many(target_indices[known], fetch)
+        if excluded is not None:
+            dropped = (items < 0) | excluded[items]
+            kept = argsort(dropped, axis=1, kind='mergesort')[:, :head]
+            items = take_along_axis(items, kept, axis=1)
+            scores = take_along_axis(scores, kept, axis=1)
+            dropped = take_along_axis(dropped, kept, axis=1)
+            items[dropped] = -1
+            scores[dropped] = float('-inf')
+        top_items[known, :items.shape[1]] = items
+        top_scores[known, :scores.shape[1]] = scores
+        return top_items, top_scores
+
+    def __similar_items_source(self):
+        if not hasattr(self.__recommendation, 'similar_to_one'):
+            log.error('Attempt to find similar articles with an algorithm'
+                      ' lacking a "similar_to_one()" method.')
+            raise AttributeError('Algorithm cannot find similar articles!'
+                                 ' Use, e.g., CollaborativeFiltering.')
+        return self.__recommendation
+
+    def __cold_start_for_item(self, head):
+        log.info('Unknown target article. Defaulting to baseline'
+                 ' recommendation.')
+        items, scores = self.__baseline_ranking()
+        return items[:head], scores[:head]
+
+    def __top_item_indices(self, target, head):
+        if target not in self.__data.user.index_of.keys():
+            return self.__cold_start(target, head)[0]
+        if self.__sparse_output():
+            return self.__sparse_ranked(target, head)[0]
+        if hasattr(self.__recommendation, 'top_for_one'):
+            return self.__top_ranked(target, head)[0]
+        item_scores = self.__calculated(target)
+        excluded = self.__excluded()
+        if excluded is None:
+            return argpartition(item_scores, -head)[-head:]
+        allowed = self.__allowed()
+        return allowed[argpartition(item_scores[allowed], -head)[-head:]]
+
+    def __cold_start(self, target, head):
         log.info('Unknown target user. Defaulting to baseline recommendation.')
+        items, scores = self.__baseline_ranking()
+        return items[:head], scores[:head]
+
+    def __baseline_ranking(self):
+        """Articles sorted by descending baseline rating, with ratings.
+
+        The ranking is identical for all unknown customers. It is therefore
+        computed only once and recomputed only if the `version` attribute
+        of the baseline or any of the filters change. Baselines without a
+        `version` attribute can change at any time, so their ranking is
+        recomputed on every call. Articles excluded by filters are not part
+        of the ranking.
+
+        """
+        baseline_version = version_of(self.__baseline)
+        version = (baseline_version, self.__filter_version)
+        if baseline_version is None:
+            return self.__ranked_baseline()
+        if (not self.__has('ranking')) or (self.__ranking[0] != version):
+            self.__ranking = (version,) + self.__ranked_baseline()
+        return self.__ranking[1:]
+
+    def __ranked_baseline(self):
+        item_scores = self.__baseline_scores()
+        items = argsort(-item_scores, kind='mergesort')
+        excluded = self.__excluded()
+        if excluded is not None:
+            items = items[~excluded[items]]
+        return items, item_scores[items]
+
+    def __delete_baseline_ranking(self):
+        if self.__has('ranking'):
+            delattr(self, self.__class_prefix + 'ranking')
+
+    def __baseline_scores(self):
         try:
             cold_start_recommendation = self.__baseline.for_one()
         except TypeError:
@@ -168,6 +772,109 @@ class RecoBasedOn:
                             ' method is callable without argument "target"!')
         return cold_start_recommendation
 
+    def __ranked(self, target, head):
+        if self.__sparse_output():
+            return self.__sparse_ranked(target, head)
+        if hasattr(self.__recommendation, 'top_for_one'):
+            return self.__top_ranked(target, head)
+        item_scores = self.__calculated(target)[newaxis, :]
+        items, scores = self.__allowed_top(item_scores, head)
+        return items[0], scores[0]
+
+    def __sparse_output(self):
+        return self.__sparse and hasattr(self.__recommendation,
+                                         'sparse_for_one')
+
+    def __sparse_ranked(self, target, head):
+        """Top articles selected from the sparse output of the algorithm.
+
+        Already bought articles are pruned from the (few) articles rated by
+        the algorithm, and the top ones are selected among the rest. Only
+        if fewer than `head` remain are the missing ones filled in from
+        the baseline ranking, with a rating of 0, which is what the
+        algorithm rates all articles not returned.
+
+        """
+        index = self.__data.user.index_of[target]
+        items, scores = self.__recommendation.sparse_for_one(index)
+        bought = self.__allowed_bought_by(index)
+        items, scores = self.__pruned(items, scores, bought)
+        if items.size >= head:
+            top = argpartition(scores, -head)[-head:]
+            top = top[argsort(-scores[top], kind='mergesort')]
+            return items[top], scores[top]
+        top = argsort(-scores, kind='mergesort')
+        return self.__completed(items[top], scores[top], bought, head)
+
+    def __top_ranked(self, target, head):
+        """Top articles as selected by the algorithm itself.
+
+        Algorithms with a `top_for_one()` method can find their top articles
+        without rating all of them. To still have `head` articles left once
+        already bought and filtered ones are pruned, as many more as the
+        customer bought are requested, and twice as many whenever too many
+        were pruned. Should the algorithm run out of articles to return,
+        the missing ones are filled in as for the sparse output.
+
+        """
+        index = self.__data.user.index_of[target]
+        bought = self.__allowed_bought_by(index)
+        count = self.__data.item.count
+        requested = min(head + bought.size if self.__only_new else head,
+                        count)
+        while True:
+            items, scores = self.__recommendation.top_for_one(index,
+                                                              requested)
+            exhausted = len(items) < requested or requested == count
+            items, scores = self.__pruned(items, scores, bought)
+            if items.size >= head:
+                return items[:head], scores[:head]
+            if exhausted:
+                return self.__completed(items, scores, bought, head)
+            requested = min(2 * requested, count)
+
+    def __allowed_bought_by(self, index):
+        """Articles bought by a customer that no filter excludes."""
+        by_row = self.__data.matrix.by_row
+        bought = by_row.indices[by_row.indptr[index]:by_row.indptr[index + 1]]
+        excluded = self.__excluded()
+        if excluded is not None:
+            bought = bought[~excluded[bought]]
+        return bought
+
+    def __pruned(self, items, scores, bought):
+        """Drop articles bought (if only new ones) or excluded by filters."""
+        items = asarray(items, dtype=int)
+        scores = asarray(scores, dtype=float)
+        if self.__only_new:
+            new = ~isin(items, bought)
+            items, scores = items[new], scores[new]
+        excluded = self.__excluded()
+        if excluded is not None:
+            allowed = ~excluded[items]
+            items, scores = items[allowed], scores[allowed]
+        return items, scores
+
+    def __completed(self, items, scores, bought, head):
+        """Fill up sorted top articles from the baseline ranking.
+
+        Articles missing from the top are rated 0 and taken from the
+        baseline ranking. Only if that is not enough either are articles
+        already bought appended, rated -inf.
+
+        """
+        missing = head - items.size
+        taken = concatenate((items, bought)) if self.__only_new else items
+        ranking = self.__baseline_ranking()[0][:missing + taken.size]
+        filled = ranking[~isin(ranking, taken)][:missing]
+        items = concatenate((items, filled))
+        scores = concatenate((scores, zeros(filled.size)))
+        if items.size < head:
+            rest = bought[~isin(bought, items)][:head - items.size]
+            items = concatenate((items, rest))
+            scores = concatenate((scores, full(rest.size, float('-inf'))))
+        return items, scores
+
     def __calculated(self, target):
         target_index = self.__data.user.index_of[target]
         item_scores = self.__recommendation.for_one(target_index)
@@ -176,6 +883,73 @@ class RecoBasedOn:
             item_scores[already_bought] = float('-inf')
         return item_scores
 
+    def __item_ids(self):
+        """Array of article IDs, positioned at their internal index."""
+        if not self.__has('item_id_array'):
+            id_of = self.__data.item.id_of
+            self.__item_id_array = array([id_of[index] for index
+                                          in range(self.__data.item.count)])
+        return self.__item_id_array
+
+    def __block_scores_for(self, target_indices):
+        if hasattr(self.__recommendation, 'for_many'):
+            return self.__recommendation.for_many(target_indices)
+        return (self.__recommendation.for_one(target_index)[newaxis, :]
+                for target_index in target_indices)
+
+    def __allowed_top(self, block_scores, head):
+        """Row-wise top articles among those not excluded by filters."""
+        if self.__excluded() is None:
+            return self.__top(block_scores, head)
+        allowed = self.__allowed()
+        items, scores = self.__top(block_scores[:, allowed], head)
+        return allowed[items], scores
+
+    def __excluded(self):
+        """Boolean array of articles excluded by any filter, or None.
+
+        Filters are combined only once for each change to any of them.
+
+        """
+        if not self.__filters:
+            return None
+        if ((not self.__has('combined_filters')) or
+                (self.__combined_filters[0] != self.__filter_version)):
+            excluded = zeros(self.__data.item.count, dtype=bool)
+            for mask in self.__filters.values():
+                excluded |= mask
+            self.__combined_filters = (self.__filter_version, excluded,
+                                       flatnonzero(~excluded))
+        return self.__combined_filters[1]
+
+    def __allowed(self):
+        """Sorted indices of the articles not excluded by any filter."""
+        self.__excluded()
+        return self.__combined_filters[2]
+
+    def __item_indices_of(self, targets):
+        index_of = self.__data.item.index_of
+        return array([index_of[target] for target in targets
+                      if target in index_of], dtype=int)
+
+    def __registered(self, name):
+        if name not in self.__filters:
+            log.error('Attempt to change unregistered filter.')
+            raise KeyError('There is no filter named "{}"!'.format(name))
+        return self.__filters[name]
+
+    @staticmethod
+    def __top(block_scores, head):
+        """Row-wise top articles of a 2-D score block, best first."""
+        rows = arange(block_scores.shape[0])[:, newaxis]
+        candidates = argpartition(block_scores, -head, axis=1)[:, -head:]
+        candidate_scores = block_scores[rows, candidates]
+        ranks = argsort(-candidate_scores, axis=1, kind='mergesort')
+        return candidates[rows, ranks], candidate_scores[rows, ranks]
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
     @staticmethod
     def __transactions_type_checked(data):
         if not isinstance(data, Transactions):
@@ -216,6 +990,25 @@ class RecoBasedOn:
                       ' that is not callable.')
             raise TypeError('"for_one()" method of object not callable!')
 
+    @staticmethod
+    def __boolean_type_checked(sparse):
+        if not isinstance(sparse, bool):
+            log.error('Attempt to set "sparse" to non-boolean type.')
+            raise TypeError('Attribute "sparse" must be True or False!')
+        return sparse
+
+    @staticmethod
+    def __check_string_type_of(name):
+        if not isinstance(name, str):
+            log.error('Attempt to name filter with non-string type.')
+            raise TypeError('Filter name must be a string!')
+
+    @staticmethod
+    def __check_boolean_type_of(structured):
+        if not isinstance(structured, bool):
+            log.error('Attempt to set "structured" to non-boolean type.')
+            raise TypeError('Argument "structured" must be True or False!')
+
     def __integer_type_and_range_checked(self, requested):
         if not isinstance(requested, int):
             log.error('Requested number of recommendations is not an integer.')
@@ -226,6 +1019,12 @@ class RecoBasedOn:
             raise ValueError('Requested number of recommendations must be'
                              ' a positive integer!')
         available = self.__data.item.count
+        if self.__excluded() is not None:
+            available = self.__allowed().size
+        if available == 0:
+            log.error('All articles are excluded by filters.')
+            raise ValueError('No articles left to recommend! Drop or update'
+                             ' some filters.')
         if requested > available:
             log.warning('Requested {0} recommendations but only {1} available.'
                         ' Returning all {1}.'.format(requested, available))
@@ -5,6 +5,7 @@ import logging
 import unittest as ut
 from ....algorithms import Baseline
 from ....datastructures import Transactions
+from numpy import allclose
 
 
 class TestBaseline(ut.TestCase):
@@ -181,6 +182,117 @@ class TestBaseline(ut.TestCase):
         actually_is = len(self.baseline.for_one(target))
         self.assertEqual(should_be, actually_is)
 
+    def test_has_attribute_block_size(self):
+        self.assertTrue(hasattr(self.baseline, 'block_size'))
+
+    def test_default_block_size(self):
+        self.assertEqual(self.baseline.block_size, 1000)
+
+    def test_error_on_wrong_type_of_block_size(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to non-integer type.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.baseline.block_size = 2.5
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_block_size_smaller_than_one(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to value < 1.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.baseline.block_size = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_no_attribute_for_many_without_data(self):
+        self.assertFalse(hasattr(self.baseline, 'for_many'))
+
+    def test_has_attribute_for_many_with_data(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.assertTrue(hasattr(self.baseline, 'for_many'))
+
+    def test_for_many_yields_blocks_of_block_size(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        should_be = [(3, self.data.item.count),
+                     (3, self.data.item.count),
+                     (1, self.data.item.count)]
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.block_size = 3
+        blocks = self.baseline.for_many(targets)
+        actually_is = [block.shape for block in blocks]
+        self.assertListEqual(should_be, actually_is)
+
+    def test_for_many_agrees_with_for_one(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.block_size = 4
+        blocks = self.baseline.for_many(targets)
+        actually_is = [row for block in blocks for row in block.tolist()]
+        should_be = [self.baseline.for_one(target) for target in targets]
+        self.assertTrue(allclose(should_be, actually_is))
+
+    def test_version_increases_when_data_is_attached(self):
+        before = self.baseline.version
+        self.baseline = self.baseline.operating_on(self.data)
+        self.assertGreater(self.baseline.version, before)
+
+    def test_version_increases_when_binarize_changes(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        before = self.baseline.version
+        self.baseline.binarize = True
+        self.assertEqual(self.baseline.version, before)
+        self.baseline.binarize = False
+        self.assertGreater(self.baseline.version, before)
+
+    def test_cannot_set_attribute_version(self):
+        with self.assertRaises(AttributeError):
+            self.baseline.version = 3
+
+    def test_no_attribute_top_for_one_without_data(self):
+        self.assertFalse(hasattr(self.baseline, 'top_for_one'))
+
+    def test_has_attribute_top_for_one_with_data(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.assertTrue(hasattr(self.baseline, 'top_for_one'))
+
+    def test_top_for_one_binarized(self):
+        should_be = ([2, 3, 4], [5.0, 3.0, 2.0])
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.binarize = True
+        items, popularity = self.baseline.top_for_one(max_number_of_items=3)
+        self.assertTupleEqual(should_be, (items.tolist(), popularity.tolist()))
+
+    def test_top_for_one_not_binarized(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.binarize = False
+        popularity = self.baseline.for_one()
+        should_be = sorted(popularity.tolist(), reverse=True)[:4]
+        items, actually_is = self.baseline.top_for_one(7, 4)
+        self.assertListEqual(should_be, actually_is.tolist())
+        self.assertListEqual(popularity[items].tolist(), should_be)
+
+    def test_top_for_one_follows_binarize(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        before = self.baseline.top_for_one(max_number_of_items=5)[1]
+        self.baseline.binarize = False
+        after = self.baseline.top_for_one(max_number_of_items=5)[1]
+        self.assertFalse(before.tolist() == after.tolist())
+
+    def test_top_for_one_returns_all_articles_at_most(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        items, _ = self.baseline.top_for_one(max_number_of_items=100)
+        self.assertEqual(items.size, self.data.item.count)
+
+    def test_top_for_one_does_not_change(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        before = self.baseline.top_for_one(max_number_of_items=3)[1].tolist()
+        _, popularity = self.baseline.top_for_one(max_number_of_items=3)
+        popularity += 1
+        after = self.baseline.top_for_one(max_number_of_items=3)[1].tolist()
+        self.assertListEqual(before, after)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from ....algorithms import Sketched
+from ....datastructures import Transactions
+from .... import RecoBasedOn
+
+
+class TestSketched(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data50.csv'
+        self.data = Transactions.from_csv(file)
+        self.baseline = Sketched()
+        self.articles = [self.data.item.id_of[index] for index in range(5)]
+        self.events = [('x', 0), ('y', 0), ('x', 0), ('z', 1),
+                       ('x', 2), ('x', 2), ('x', 2)]
+
+    def consume_events(self):
+        for customer, item in self.events:
+            self.baseline.update(customer, self.articles[item])
+
+    def test_attribute_has_data_is_false_without_data(self):
+        self.assertFalse(self.baseline.has_data)
+
+    def test_no_attributes_update_and_for_one_without_data(self):
+        self.assertFalse(hasattr(self.baseline, 'update'))
+        self.assertFalse(hasattr(self.baseline, 'for_one'))
+
+    def test_has_attributes_update_and_for_one_with_data(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.assertTrue(self.baseline.has_data)
+        self.assertTrue(hasattr(self.baseline, 'update'))
+        self.assertTrue(hasattr(self.baseline, 'for_one'))
+
+    def test_error_on_setting_wrong_data_type(self):
+        log_msg = ['ERROR:root:Attempt to set incompatible data type.'
+                   ' Must be <Transactions>.']
+        err_msg = 'Data must be of type <Transactions>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = self.baseline.operating_on('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_default_settings(self):
+        self.assertTrue(self.baseline.binarize)
+        self.assertEqual(self.baseline.precision, 8)
+        self.assertEqual(self.baseline.width, 2048)
+        self.assertEqual(self.baseline.depth, 4)
+        self.assertEqual(self.baseline.number_of_heavy_hitters, 100)
+        self.assertEqual(self.baseline.refresh_every, 100)
+
+    def test_error_on_wrong_type_of_binarize(self):
+        log_msg = ['ERROR:root:Attempt to set "binarize" to non-boolean type.']
+        err_msg = 'Attribute "binarize" must be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.baseline.binarize = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_precision_out_of_range(self):
+        log_msg = ['ERROR:root:Attempt to set precision to value'
+                   ' outside [4, 16].']
+        err_msg = '"precision" must be between 4 and 16!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.baseline.precision = 17
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_memory_does_not_depend_on_customers(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        before = self.baseline.memory
+        for customer in range(1000):
+            self.baseline.update(customer, self.articles[0])
+        self.assertEqual(self.baseline.memory, before)
+        self.assertEqual(self.baseline.number_of_events, 1000)
+
+    def test_unique_buyers(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.consume_events()
+        should_be = [2.0, 1.0, 1.0, 0.0]
+        actually_is = self.baseline.for_one()[:4].round().tolist()
+        self.assertListEqual(should_be, actually_is)
+
+    def test_times_bought(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.consume_events()
+        self.baseline.binarize = False
+        should_be = [3.0, 1.0, 3.0, 0.0]
+        self.assertListEqual(should_be, self.baseline.for_one()[:4].tolist())
+
+    def test_skips_unknown_articles(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.update('x', 'unknown article')
+        self.assertEqual(self.baseline.number_of_events, 0)
+
+    def test_top_for_one_from_heavy_hitters(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.consume_events()
+        self.baseline.binarize = False
+        items, popularity = self.baseline.top_for_one(max_number_of_items=3)
+        self.assertSetEqual(set(items[:2].tolist()), {0, 2})
+        self.assertListEqual(popularity.tolist(), [3.0, 3.0, 1.0])
+
+    def test_top_for_one_beyond_heavy_hitters(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.number_of_heavy_hitters = 1
+        self.consume_events()
+        items, popularity = self.baseline.top_for_one(max_number_of_items=3)
+        self.assertEqual(items[0], 0)
+        self.assertEqual(len(items), 3)
+
+    def test_heavy_hitters_replace_weakest(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.number_of_heavy_hitters = 1
+        self.baseline.binarize = False
+        self.consume_events()
+        items, popularity = self.baseline.top_for_one(max_number_of_items=1)
+        self.assertListEqual(popularity.tolist(), [3.0])
+
+    def test_changing_sketch_settings_resets(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.consume_events()
+        log_msg = ['WARNING:root:Resetting the sketches filled with 7'
+                   ' purchase events.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            self.baseline.width = 512
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(self.baseline.for_one().sum(), 0.0)
+
+    def test_version_increases_with_events_and_binarize(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.refresh_every = 1
+        before = self.baseline.version
+        self.baseline.update('x', self.articles[0])
+        after_event = self.baseline.version
+        self.baseline.binarize = False
+        self.assertGreater(after_event, before)
+        self.assertGreater(self.baseline.version, after_event)
+
+    def test_version_increases_after_refresh_every_changes(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.binarize = False
+        self.baseline.refresh_every = 3
+        before = self.baseline.version
+        for customer in range(2):
+            self.baseline.update(customer, self.articles[0])
+        self.assertEqual(self.baseline.version, before)
+        self.baseline.update('x', self.articles[0])
+        self.assertEqual(self.baseline.version, before + 1)
+
+    def test_repeat_buyers_do_not_change_version(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.refresh_every = 1
+        self.baseline.update('x', self.articles[0])
+        before = self.baseline.version
+        for _ in range(10):
+            self.baseline.update('x', self.articles[0])
+        self.assertEqual(self.baseline.version, before)
+        self.baseline.binarize = False
+        after_binarize = self.baseline.version
+        self.baseline.update('x', self.articles[0])
+        self.assertGreater(self.baseline.version, after_binarize)
+
+    def test_error_on_wrong_value_of_refresh_every(self):
+        log_msg = ['ERROR:root:Attempt to set refresh_every to value < 1.']
+        err_msg = '"refresh_every" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.baseline.refresh_every = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_for_many(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.consume_events()
+        self.baseline.block_size = 2
+        blocks = list(self.baseline.for_many([1, 2, 3]))
+        self.assertListEqual([block.shape[0] for block in blocks], [2, 1])
+
+    def test_works_as_baseline_of_recommender(self):
+        recommender = RecoBasedOn(self.data)
+        recommender.baseline = self.baseline
+        self.consume_events()
+        with self.assertLogs(level=logging.INFO):
+            top = list(recommender.for_one('john doe', 1))
+        self.assertListEqual(top, [self.articles[0]])
+
+
+if __name__ == '__main__':
+    ut.main()
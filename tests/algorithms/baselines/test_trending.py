@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from datetime import datetime, timedelta
+from ....algorithms import Trending, CollaborativeFiltering
+from ....datastructures import Transactions
+from .... import RecoBasedOn
+
+
+class TestTrending(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data50.csv'
+        self.data = Transactions.from_csv(file)
+        self.baseline = Trending()
+        self.articles = [self.data.item.id_of[index] for index in range(5)]
+
+    def test_has_attribute_has_data(self):
+        self.assertTrue(hasattr(self.baseline, 'has_data'))
+
+    def test_attribute_has_data_is_false_without_data(self):
+        self.assertFalse(self.baseline.has_data)
+
+    def test_attribute_has_data_is_true_with_data(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.assertTrue(self.baseline.has_data)
+
+    def test_error_on_setting_wrong_data_type(self):
+        log_msg = ['ERROR:root:Attempt to set incompatible data type.'
+                   ' Must be <Transactions>.']
+        err_msg = 'Data must be of type <Transactions>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = self.baseline.operating_on('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_no_attributes_update_and_for_one_without_data(self):
+        self.assertFalse(hasattr(self.baseline, 'update'))
+        self.assertFalse(hasattr(self.baseline, 'for_one'))
+
+    def test_has_attributes_update_and_for_one_with_data(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.assertTrue(hasattr(self.baseline, 'update'))
+        self.assertTrue(hasattr(self.baseline, 'for_one'))
+
+    def test_default_settings(self):
+        self.assertEqual(self.baseline.window, 86400.0)
+        self.assertEqual(self.baseline.number_of_buckets, 24)
+        self.assertIsNone(self.baseline.half_life)
+        self.assertEqual(self.baseline.refresh_every, 100)
+
+    def test_error_on_wrong_type_of_window(self):
+        log_msg = ['ERROR:root:Attempt to set window to non-numeric type.']
+        err_msg = '"window" must be a positive number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.baseline.window = 'bar'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_non_positive_half_life(self):
+        log_msg = ['ERROR:root:Attempt to set half_life to value <= 0.']
+        err_msg = '"half_life" must be a positive number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.baseline.half_life = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_wrong_type_of_number_of_buckets(self):
+        log_msg = ['ERROR:root:Attempt to set number_of_buckets to'
+                   ' non-integer type.']
+        err_msg = '"number_of_buckets" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.baseline.number_of_buckets = 2.5
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_wrong_type_of_timestamp(self):
+        log_msg = ['ERROR:root:Attempt to update popularity with a timestamp'
+                   ' that is neither a number nor a datetime object.']
+        err_msg = 'Timestamp must be a number or a datetime!'
+        self.baseline = self.baseline.operating_on(self.data)
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.baseline.update('noon', 'foo', self.articles[0])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_popularity_is_zero_without_events(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        should_be = [0.0] * self.data.item.count
+        self.assertListEqual(should_be, self.baseline.for_one().tolist())
+
+    def test_sliding_window(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.window = 10
+        self.baseline.number_of_buckets = 5
+        events = [(0.0, self.articles[0]), (1.0, self.articles[1]),
+                  (2.5, self.articles[1]), (9.9, self.articles[2]),
+                  (11.0, self.articles[3])]
+        for timestamp, article in events:
+            self.baseline.update(timestamp, 'foo', article)
+        should_be = [0.0, 1.0, 1.0, 1.0, 0.0]
+        self.assertListEqual(should_be, self.baseline.for_one()[:5].tolist())
+        self.assertEqual(self.baseline.number_of_events, 5)
+
+    def test_repeated_purchases_expire_with_their_bucket(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.window = 10
+        self.baseline.number_of_buckets = 5
+        for timestamp in (0.0, 0.5, 1.0, 2.0, 2.5, 4.0):
+            self.baseline.update(timestamp, 'foo', self.articles[0])
+        self.baseline.update(4.0, 'foo', self.articles[1])
+        self.assertListEqual(self.baseline.for_one()[:2].tolist(), [6.0, 1.0])
+        self.baseline.update(10.0, 'foo', self.articles[2])
+        self.assertListEqual(self.baseline.for_one()[:3].tolist(),
+                             [3.0, 1.0, 1.0])
+        self.baseline.update(12.0, 'foo', self.articles[2])
+        self.assertListEqual(self.baseline.for_one()[:3].tolist(),
+                             [1.0, 1.0, 2.0])
+
+    def test_window_empties_after_long_pause(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.window = 10
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        self.baseline.update(100.0, 'foo', self.articles[1])
+        should_be = [0.0, 1.0, 0.0]
+        self.assertListEqual(should_be, self.baseline.for_one()[:3].tolist())
+
+    def test_skips_events_older_than_window(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.window = 10
+        self.baseline.update(100.0, 'foo', self.articles[0])
+        self.baseline.update(50.0, 'foo', self.articles[1])
+        self.assertEqual(self.baseline.number_of_events, 1)
+        self.assertEqual(self.baseline.number_of_skipped_events, 1)
+        self.assertEqual(self.baseline.for_one()[1], 0.0)
+
+    def test_skips_unknown_articles(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.update(1.0, 'foo', 'unknown article')
+        self.assertEqual(self.baseline.number_of_events, 0)
+        self.assertEqual(self.baseline.number_of_skipped_events, 1)
+
+    def test_accepts_datetime_timestamps(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.window = 3600
+        now = datetime(2017, 3, 20, 12)
+        self.baseline.update(now, 'foo', self.articles[0])
+        self.baseline.update(now + timedelta(hours=2), 'foo', self.articles[1])
+        should_be = [0.0, 1.0]
+        self.assertListEqual(should_be, self.baseline.for_one()[:2].tolist())
+
+    def test_decaying_weights(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.half_life = 10
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        self.baseline.update(10.0, 'foo', self.articles[1])
+        self.baseline.update(20.0, 'foo', self.articles[1])
+        should_be = [0.25, 1.5]
+        self.assertListEqual(should_be, self.baseline.for_one()[:2].tolist())
+
+    def test_decaying_weights_survive_long_streams(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.half_life = 1
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        self.baseline.update(10000.0, 'foo', self.articles[1])
+        self.baseline.update(10001.0, 'foo', self.articles[1])
+        should_be = [0.0, 1.5]
+        self.assertListEqual(should_be, self.baseline.for_one()[:2].tolist())
+
+    def test_changing_settings_resets_counts(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        log_msg = ['WARNING:root:Resetting the popularity counted from 1'
+                   ' purchase events.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            self.baseline.window = 60
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(self.baseline.number_of_events, 0)
+        self.assertEqual(self.baseline.for_one().sum(), 0.0)
+
+    def test_attaching_same_data_keeps_counts(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        self.baseline = self.baseline.operating_on(self.data)
+        self.assertEqual(self.baseline.for_one()[0], 1.0)
+
+    def test_version_increases_with_events(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.refresh_every = 1
+        before = self.baseline.version
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        self.assertGreater(self.baseline.version, before)
+
+    def test_version_increases_after_refresh_every_events(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.refresh_every = 3
+        before = self.baseline.version
+        for customer in range(2):
+            self.baseline.update(0.0, customer, self.articles[0])
+        self.assertEqual(self.baseline.version, before)
+        self.baseline.update(0.0, 'x', self.articles[0])
+        self.assertEqual(self.baseline.version, before + 1)
+
+    def test_error_on_wrong_value_of_refresh_every(self):
+        log_msg = ['ERROR:root:Attempt to set refresh_every to value < 1.']
+        err_msg = '"refresh_every" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.baseline.refresh_every = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_for_one_does_not_change(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        recommendation = self.baseline.for_one()
+        recommendation += 1
+        self.assertEqual(self.baseline.for_one()[0], 1.0)
+
+    def test_for_many(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        self.baseline.update(0.0, 'foo', self.articles[0])
+        block = next(self.baseline.for_many([1, 2, 3]))
+        self.assertTupleEqual(block.shape, (3, self.data.item.count))
+        self.assertListEqual(block[:, 0].tolist(), [1.0, 1.0, 1.0])
+
+    def test_top_for_one(self):
+        self.baseline = self.baseline.operating_on(self.data)
+        for article in (self.articles[3], self.articles[4],
+                        self.articles[4], self.articles[3],
+                        self.articles[3]):
+            self.baseline.update(0.0, 'foo', article)
+        items, popularity = self.baseline.top_for_one(max_number_of_items=2)
+        self.assertListEqual(items.tolist(), [3, 4])
+        self.assertListEqual(popularity.tolist(), [3.0, 2.0])
+
+    def test_works_as_baseline_of_recommender(self):
+        recommender = RecoBasedOn(self.data)
+        recommender.baseline = self.baseline
+        self.baseline.update(0.0, 'foo', self.articles[4])
+        with self.assertLogs(level=logging.INFO):
+            top = list(recommender.for_one('john doe', 1))
+        self.assertListEqual(top, [self.articles[4]])
+
+    def test_works_as_baseline_of_algorithm(self):
+        algorithm = CollaborativeFiltering()
+        algorithm.baseline = self.baseline
+        algorithm = algorithm.operating_on(self.data)
+        self.baseline.update(0.0, 'foo', self.articles[4])
+        with self.assertLogs(level=logging.INFO):
+            ratings = algorithm.for_one(6)
+        self.assertEqual(ratings[4], 1.0)
+
+
+if __name__ == '__main__':
+    ut.main()
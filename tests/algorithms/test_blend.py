@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from numpy import allclose, vstack, zeros
+from ...algorithms import Blend, Baseline, CollaborativeFiltering
+from ...algorithms import MostPopular, RandomWalk
+from ...datastructures import Transactions
+
+
+class TestBlend(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data50.csv'
+        self.data = Transactions.from_csv(file)
+        self.algorithm = Blend().blending(CollaborativeFiltering(),
+                                          RandomWalk(), MostPopular())
+
+    def ratings_of(self, target):
+        return [algorithm.operating_on(self.data).for_one(target)
+                for algorithm in (CollaborativeFiltering(),
+                                  RandomWalk(), MostPopular())]
+
+    def test_defaults(self):
+        algorithm = Blend()
+        self.assertEqual(algorithm.algorithms,
+                         ('CollaborativeFiltering', 'TruncatedSVD',
+                          'MostPopular'))
+        self.assertEqual(algorithm.weights, (1.0, 1.0, 1.0))
+        self.assertEqual(algorithm.normalization, 'minmax')
+        self.assertEqual(algorithm.block_size, 250)
+
+    def test_blending_nothing(self):
+        log_msg = ['ERROR:root:Attempt to blend no algorithms.']
+        err_msg = 'At least one algorithm to blend is required!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.blending()
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_blending_object_without_operating_on(self):
+        log_msg = ['ERROR:root:Attempt to set object lacking mandatory'
+                   ' "operating_on()" method.']
+        err_msg = 'Object lacks "operating_on()" method!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(AttributeError, msg=err_msg) as err:
+                self.algorithm.blending(Baseline(), 'foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_blending_returns_self_and_resets_weights(self):
+        self.algorithm.weights = (0.5, 0.2, 0.3)
+        algorithm = self.algorithm.blending(Baseline(), MostPopular())
+        self.assertIs(algorithm, self.algorithm)
+        self.assertEqual(self.algorithm.algorithms,
+                         ('Baseline', 'MostPopular'))
+        self.assertEqual(self.algorithm.weights, (1.0, 1.0))
+
+    def test_blending_with_data_attaches_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        baseline = Baseline()
+        self.algorithm.blending(baseline)
+        self.assertTrue(baseline.has_data)
+
+    def test_set_weights_to_wrong_number(self):
+        log_msg = ['ERROR:root:Attempt to set 2 weights for 3 algorithms.']
+        err_msg = '"weights" must be one non-negative number per algorithm!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.weights = (1.0, 2.0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_weights_to_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set weights to non-numeric type.']
+        err_msg = '"weights" must be one non-negative number per algorithm!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.weights = (1.0, 'foo', 2.0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_weights_to_negative_values(self):
+        log_msg = ['ERROR:root:Attempt to set weights to values < 0.']
+        err_msg = '"weights" must be one non-negative number per algorithm!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.weights = (1.0, -1.0, 2.0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_normalization_to_unknown_value(self):
+        log_msg = ['ERROR:root:Attempt to set normalization to'
+                   ' unknown value.']
+        err_msg = ('Attribute "normalization" must be one of:'
+                   ' max, minmax, none, zscore!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.normalization = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_has_no_hidden_methods_without_data(self):
+        self.assertFalse(self.algorithm.has_data)
+        self.assertFalse(hasattr(self.algorithm, 'for_one'))
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_operating_on_wrong_data_type(self):
+        log_msg = ['ERROR:root:Attempt to set incompatible data type.'
+                   ' Must be <Transactions>.']
+        err_msg = 'Data must be of type <Transactions>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.operating_on('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_for_one_without_normalization(self):
+        self.algorithm.normalization = 'none'
+        self.algorithm.weights = (0.5, 2, 0.1)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        cf, walk, popular = self.ratings_of(3)
+        should_be = 0.5 * cf + 2.0 * walk + 0.1 * popular
+        self.assertTrue(allclose(self.algorithm.for_one(3), should_be))
+
+    def test_for_one_with_max_normalization(self):
+        self.algorithm.normalization = 'max'
+        self.algorithm.weights = (0.5, 2, 0.1)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        cf, walk, popular = self.ratings_of(3)
+        should_be = (0.5 * cf / cf.max() + 2.0 * walk / walk.max() +
+                     0.1 * popular / popular.max())
+        self.assertTrue(allclose(self.algorithm.for_one(3), should_be))
+
+    def test_for_one_with_minmax_normalization(self):
+        self.algorithm.weights = (0.5, 2, 0.1)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        should_be = sum(weight * (r - r.min()) / (r.max() - r.min())
+                        for weight, r in zip((0.5, 2.0, 0.1),
+                                             self.ratings_of(3)))
+        self.assertTrue(allclose(self.algorithm.for_one(3), should_be))
+
+    def test_for_one_with_zscore_normalization(self):
+        self.algorithm.normalization = 'zscore'
+        self.algorithm = self.algorithm.operating_on(self.data)
+        should_be = sum((r - r.mean()) / r.std() for r in self.ratings_of(3))
+        self.assertTrue(allclose(self.algorithm.for_one(3), should_be))
+
+    def test_constant_ratings_normalized_to_zero(self):
+        class MockUp():
+            has_data = True
+            def operating_on(self, data):
+                return self
+            def for_one(self, target):
+                return zeros(23) + 2.0
+        self.algorithm.blending(MockUp(), MockUp())
+        self.algorithm = self.algorithm.operating_on(self.data)
+        for normalization in ('minmax', 'zscore'):
+            self.algorithm.normalization = normalization
+            self.assertTrue((self.algorithm.for_one(3) == 0.0).all())
+        self.algorithm.normalization = 'max'
+        self.assertTrue((self.algorithm.for_one(3) == 2.0).all())
+
+    def test_max_normalization_divides_by_largest_absolute_value(self):
+        class MockUp():
+            has_data = True
+            def operating_on(self, data):
+                return self
+            def for_one(self, target):
+                ratings = zeros(23)
+                ratings[:2] = (-4.0, 2.0)
+                return ratings
+        self.algorithm.blending(MockUp(), MockUp())
+        self.algorithm.normalization = 'max'
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertListEqual(self.algorithm.for_one(3)[:3].tolist(),
+                             [-2.0, 1.0, 0.0])
+
+    def test_for_many_agrees_with_for_one(self):
+        self.algorithm.block_size = 4
+        self.algorithm.weights = (0.5, 2, 0.1)
+        self.algorithm.normalization = 'zscore'
+        self.algorithm = self.algorithm.operating_on(self.data)
+        targets = [1, 3, 5, 8, 10, 11]
+        blocks = list(self.algorithm.for_many(targets))
+        self.assertEqual([block.shape[0] for block in blocks], [4, 2])
+        should_be = vstack([self.algorithm.for_one(target)
+                            for target in targets])
+        self.assertTrue(allclose(vstack(blocks), should_be))
+
+    def test_for_many_with_algorithm_without_for_many(self):
+        class MockUp():
+            has_data = True
+            def operating_on(self, data):
+                return self
+            def for_one(self, target):
+                return zeros(23) + target
+        self.algorithm.blending(MockUp(), MostPopular())
+        self.algorithm.normalization = 'none'
+        self.algorithm = self.algorithm.operating_on(self.data)
+        block = next(self.algorithm.for_many([1, 3]))
+        self.assertTrue(allclose(block, vstack([self.algorithm.for_one(1),
+                                                self.algorithm.for_one(3)])))
+
+    def test_top_for_one_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.top_for_one(3, 4)
+        ratings = self.algorithm.for_one(3)
+        self.assertTrue(allclose(scores, ratings[items]))
+        self.assertTrue(allclose(scores, sorted(ratings)[:-5:-1]))
+
+    def test_version_follows_settings_and_algorithms(self):
+        walk = RandomWalk()
+        self.algorithm.blending(walk, MostPopular())
+        self.algorithm = self.algorithm.operating_on(self.data)
+        version = self.algorithm.version
+        self.algorithm.weights = (1.0, 1.0)
+        self.assertEqual(self.algorithm.version, version)
+        walk.beta = 0.5
+        self.assertEqual(self.algorithm.version, version + 1)
+        self.algorithm.weights = (1.0, 2.0)
+        self.assertEqual(self.algorithm.version, version + 2)
+        self.algorithm.normalization = 'max'
+        self.assertEqual(self.algorithm.version, version + 3)
+
+    def test_version_never_repeats_when_algorithms_are_swapped(self):
+        walk = RandomWalk()
+        self.algorithm.blending(walk)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        walk.beta = 0.5
+        walk.beta = 0.7
+        before = self.algorithm.version
+        self.algorithm.blending(RandomWalk())
+        self.assertGreater(self.algorithm.version, before)
+
+
+if __name__ == '__main__':
+    ut.main()
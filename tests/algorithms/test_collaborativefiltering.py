@@ -6,6 +6,7 @@ import unittest as ut
 from ...algorithms import CollaborativeFiltering, Baseline, default_baseline
 from ...datastructures import Transactions
 from ...algorithms.similarities import default_similarity, sokalsneath
+from numpy import allclose
 
 class TestCollaborativeFiltering(ut.TestCase):
 
@@ -414,6 +415,268 @@ class TestCollaborativeFiltering(ut.TestCase):
         actually_is = len(self.algorithm.for_one(target))
         self.assertEqual(should_be, actually_is)
 
+    def test_no_attribute_top_for_one_without_data(self):
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_has_attribute_top_for_one_with_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_top_for_one_agrees_with_for_one(self):
+        target = 5
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.similarity = sokalsneath
+        for binarize in (True, False):
+            self.algorithm.binarize = binarize
+            ratings = self.algorithm.for_one(target)
+            items, scores = self.algorithm.top_for_one(target, 6)
+            should_be = sorted(ratings.tolist(), reverse=True)[:6]
+            self.assertListEqual(should_be, scores.tolist())
+            self.assertListEqual(ratings[items].tolist(), scores.tolist())
+
+    def test_top_for_one_returns_only_neighbours(self):
+        target = 5
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.top_for_one(target, 23)
+        should_be = self.algorithm.for_one(target).nonzero()[0].tolist()
+        self.assertListEqual(should_be, sorted(items.tolist()))
+
+    def test_top_for_one_uncomparable_user_returns_baseline(self):
+        target = 6
+        log_msg = ['INFO:root:Uncomparable user with ID 13. Returning baseline'
+                   ' recommendation.']
+        self.algorithm = self.algorithm.operating_on(self.data)
+        should_be = sorted(Baseline().operating_on(self.data).for_one(),
+                           reverse=True)[:3]
+        with self.assertLogs(level=logging.INFO) as log:
+            _, actually_is = self.algorithm.top_for_one(target, 3)
+        self.assertEqual(log.output, log_msg)
+        self.assertListEqual(should_be, actually_is.tolist())
+
+    def test_sparse_for_one_agrees_with_for_one(self):
+        target = 5
+        self.algorithm = self.algorithm.operating_on(self.data)
+        for binarize in (True, False):
+            self.algorithm.binarize = binarize
+            ratings = self.algorithm.for_one(target)
+            items, scores = self.algorithm.sparse_for_one(target)
+            self.assertListEqual(ratings.nonzero()[0].tolist(),
+                                 sorted(items.tolist()))
+            self.assertTrue(allclose(ratings[items], scores))
+
+    def test_sparse_for_one_uncomparable_user_returns_baseline(self):
+        target = 6
+        self.algorithm = self.algorithm.operating_on(self.data)
+        ratings = Baseline().operating_on(self.data).for_one()
+        with self.assertLogs(level=logging.INFO):
+            items, scores = self.algorithm.sparse_for_one(target)
+        self.assertListEqual(ratings.nonzero()[0].tolist(), items.tolist())
+        self.assertTrue(allclose(ratings[items], scores))
+
+    def test_top_for_one_error_on_wrong_number_type(self):
+        log_msg = ['ERROR:root:Requested number of recommendations is not'
+                   ' an integer.']
+        err_msg = ('Requested number of recommendations must be' +
+                   ' a positive integer!')
+        self.algorithm = self.algorithm.operating_on(self.data)
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = self.algorithm.top_for_one(5, 2.5)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_has_attribute_block_size(self):
+        self.assertTrue(hasattr(self.algorithm, 'block_size'))
+
+    def test_default_block_size(self):
+        self.assertEqual(self.algorithm.block_size, 1000)
+
+    def test_error_on_wrong_type_of_block_size(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to non-integer type.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.block_size = 2.5
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_block_size_smaller_than_one(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to value < 1.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.block_size = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_no_attribute_for_many_without_data(self):
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+
+    def test_has_attribute_for_many_with_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(hasattr(self.algorithm, 'for_many'))
+
+    def test_for_many_yields_blocks_of_block_size(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        should_be = [(3, self.data.item.count),
+                     (3, self.data.item.count),
+                     (1, self.data.item.count)]
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.block_size = 3
+        blocks = self.algorithm.for_many(targets)
+        actually_is = [block.shape for block in blocks]
+        self.assertListEqual(should_be, actually_is)
+
+    def test_for_many_agrees_with_for_one(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.block_size = 4
+        blocks = self.algorithm.for_many(targets)
+        actually_is = [row for block in blocks for row in block.tolist()]
+        should_be = [self.algorithm.for_one(target) for target in targets]
+        self.assertTrue(allclose(should_be, actually_is))
+
+    def test_version_increases_when_data_is_attached(self):
+        before = self.algorithm.version
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_version_increases_when_binarize_changes(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.binarize = True
+        self.assertEqual(self.algorithm.version, before)
+        self.algorithm.binarize = False
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_cannot_set_attribute_version(self):
+        with self.assertRaises(AttributeError):
+            self.algorithm.version = 3
+
+    def test_version_increases_when_similarity_changes(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.similarity = sokalsneath
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_for_history_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        for binarize in (True, False):
+            self.algorithm.binarize = binarize
+            history = self.data.matrix.by_row[5]
+            basket = history.indices.repeat(history.data.astype(int))
+            self.assertTrue(allclose(self.algorithm.for_history(basket),
+                                     self.algorithm.for_one(5)))
+
+    def test_for_history_leaves_data_unchanged(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        by_row = self.data.matrix.by_row.copy()
+        _ = self.algorithm.for_history([1, 3, 3, 7])
+        self.assertEqual((self.data.matrix.by_row != by_row).nnz, 0)
+        self.assertEqual(self.data.user.count, 12)
+
+    def test_for_history_with_unknown_article(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        log_msg = ['ERROR:root:Attempt to rate a history with unknown'
+                   ' articles.']
+        err_msg = 'Article indices must be between 0 and 22!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(IndexError, msg=err_msg) as err:
+                _ = self.algorithm.for_history([1, 23])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_version_never_repeats_when_baseline_is_swapped(self):
+        baseline = Baseline()
+        self.algorithm.baseline = baseline
+        self.algorithm = self.algorithm.operating_on(self.data)
+        baseline.binarize = False
+        before = self.algorithm.version
+        self.algorithm.baseline = Baseline()
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_version_is_none_with_unversioned_baseline(self):
+        class MockUp():
+            has_data = True
+            def operating_on(self, data):
+                return self
+            def for_one(self, target=None):
+                return None
+        self.algorithm.baseline = MockUp()
+        self.assertIsNone(self.algorithm.version)
+        self.algorithm.baseline = Baseline()
+        self.assertIsNotNone(self.algorithm.version)
+
+    def should_be_similar_to(self, item, similarity=default_similarity):
+        similarities = similarity(self.data)
+        column = similarities.toarray()[:, item]
+        others = [other for other in range(column.size)
+                  if other != item and column[other] != 0]
+        return sorted(others, key=lambda other: (-column[other], -other))
+
+    def test_default_max_similar_items(self):
+        self.assertEqual(self.algorithm.max_similar_items, 100)
+
+    def test_error_on_max_similar_items_smaller_than_one(self):
+        log_msg = ['ERROR:root:Attempt to set max_similar_items to value < 1.']
+        err_msg = '"max_similar_items" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.max_similar_items = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_similar_to_one_agrees_with_similarity_matrix(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        similarities = default_similarity(self.data)
+        for item in range(self.data.item.count):
+            items, scores = self.algorithm.similar_to_one(item, 30)
+            self.assertListEqual(items.tolist(),
+                                 self.should_be_similar_to(item))
+            self.assertTrue(allclose(scores,
+                                     similarities.toarray()[items, item]))
+
+    def test_similar_to_one_limited_by_max_similar_items(self):
+        self.algorithm.max_similar_items = 3
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.similar_to_one(7, 5)
+        self.assertListEqual(items.tolist(), self.should_be_similar_to(7)[:3])
+        self.algorithm.max_similar_items = 4
+        items, scores = self.algorithm.similar_to_one(7, 5)
+        self.assertListEqual(items.tolist(), self.should_be_similar_to(7)[:4])
+
+    def test_similar_to_many_agrees_with_similar_to_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.similar_to_many([7, 0, 2], 8)
+        self.assertEqual(items.shape, (3, 8))
+        for row, item in enumerate([7, 0, 2]):
+            one_items, one_scores = self.algorithm.similar_to_one(item, 8)
+            self.assertListEqual(items[row, :one_items.size].tolist(),
+                                 one_items.tolist())
+            self.assertTrue(allclose(scores[row, :one_scores.size],
+                                     one_scores))
+            self.assertTrue((items[row, one_items.size:] == -1).all())
+            self.assertTrue((scores[row, one_items.size:] ==
+                             float('-inf')).all())
+
+    def test_similar_items_follow_similarity(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        _ = self.algorithm.similar_to_one(7, 5)
+        self.algorithm.similarity = sokalsneath
+        items, scores = self.algorithm.similar_to_one(7, 30)
+        self.assertListEqual(items.tolist(),
+                             self.should_be_similar_to(7, sokalsneath))
+        should_be = sokalsneath(self.data).toarray()[items, 7]
+        self.assertTrue(allclose(scores, should_be))
+
+    def test_version_increases_when_baseline_changes(self):
+        baseline = Baseline()
+        self.algorithm.baseline = baseline
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        baseline.binarize = False
+        self.assertGreater(self.algorithm.version, before)
+
 
 if __name__ == '__main__':
     ut.main()
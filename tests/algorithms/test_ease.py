@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from numpy import allclose, eye, fill_diagonal, float32, vstack
+from numpy.linalg import inv
+from ...algorithms import EASE
+from ...datastructures import Transactions
+
+
+class TestEASE(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data50.csv'
+        self.data = Transactions.from_csv(file)
+        self.algorithm = EASE()
+        self.algorithm.regularization = 2.0
+        bought = self.data.matrix.bool_by_row.toarray()
+        inverse = inv(bought.T.dot(bought) + 2.0 * eye(bought.shape[1]))
+        self.weights = -inverse / inverse.diagonal()
+        fill_diagonal(self.weights, 0.0)
+        self.bought = bought
+
+    def test_defaults(self):
+        algorithm = EASE()
+        self.assertEqual(algorithm.regularization, 500.0)
+        self.assertEqual(algorithm.dtype, 'float64')
+        self.assertEqual(algorithm.max_memory, 4 * 2**30)
+        self.assertEqual(algorithm.block_size, 1000)
+        self.assertEqual(algorithm.baseline, 'Baseline')
+        self.assertEqual(algorithm.required_memory, 0)
+
+    def test_set_regularization_to_negative_value(self):
+        log_msg = ['ERROR:root:Attempt to set regularization to value < 0.']
+        err_msg = '"regularization" must be a non-negative number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.regularization = -1
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_unsupported_dtype(self):
+        log_msg = ['ERROR:root:Attempt to set dtype to unsupported type.']
+        err_msg = 'Attribute "dtype" must be "float32" or "float64"!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.dtype = 'float16'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_max_memory_to_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set max_memory to'
+                   ' non-integer type.']
+        err_msg = '"max_memory" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.max_memory = 1e9
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_has_no_hidden_methods_without_data(self):
+        self.assertFalse(self.algorithm.has_data)
+        self.assertFalse(hasattr(self.algorithm, 'for_one'))
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_operating_on_reveals_methods(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(self.algorithm.has_data)
+        self.assertTrue(callable(self.algorithm.for_one))
+        self.assertTrue(callable(self.algorithm.for_many))
+        self.assertTrue(callable(self.algorithm.top_for_one))
+
+    def test_operating_on_wrong_data_type(self):
+        log_msg = ['ERROR:root:Attempt to set incompatible data type.'
+                   ' Must be <Transactions>.']
+        err_msg = 'Data must be of type <Transactions>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.operating_on('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_required_memory(self):
+        self.algorithm.block_size = 7
+        self.algorithm = self.algorithm.operating_on(self.data)
+        n_items = self.data.item.count
+        self.assertEqual(self.algorithm.required_memory,
+                         8 * n_items * (n_items + 7))
+        self.algorithm.dtype = 'float32'
+        self.assertEqual(self.algorithm.required_memory,
+                         4 * n_items * (n_items + 7))
+
+    def test_refuses_catalog_that_does_not_fit(self):
+        self.algorithm.max_memory = 1000
+        log_msg = ['ERROR:root:EASE would need about 0.0 GB for 23 articles,'
+                   ' more than max_memory.']
+        err_msg = ('Catalog too large for EASE! Reduce the number of articles'
+                   ' or increase "max_memory".')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(MemoryError, msg=err_msg) as err:
+                self.algorithm.operating_on(self.data)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+        self.assertFalse(self.algorithm.has_data)
+
+    def test_refuses_to_fit_after_max_memory_is_lowered(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.max_memory = 1000
+        with self.assertLogs(level=logging.ERROR):
+            with self.assertRaises(MemoryError):
+                self.algorithm.for_one(3)
+
+    def test_for_one_with_closed_form_weights(self):
+        self.algorithm.block_size = 3
+        self.algorithm = self.algorithm.operating_on(self.data)
+        for customer in (1, 3, 5):
+            self.assertTrue(allclose(self.algorithm.for_one(customer),
+                                     self.bought[customer].dot(self.weights)))
+
+    def test_for_many_agrees_with_for_one(self):
+        self.algorithm.block_size = 4
+        self.algorithm = self.algorithm.operating_on(self.data)
+        targets = [0, 3, 5, 7, 9, 11]
+        blocks = list(self.algorithm.for_many(targets))
+        self.assertEqual([block.shape[0] for block in blocks], [4, 2])
+        should_be = vstack([self.algorithm.for_one(target)
+                            for target in targets])
+        self.assertTrue(allclose(vstack(blocks), should_be))
+
+    def test_for_items_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items = [7, 2, 19, 2]
+        for customer in (0, 3):
+            ratings = self.algorithm.for_one(customer)
+            self.assertTrue(allclose(self.algorithm.for_items(customer, items),
+                                     ratings[items]))
+
+    def test_top_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.top_for_one(3, 4)
+        ratings = self.algorithm.for_one(3)
+        self.assertTrue(allclose(scores, ratings[items]))
+        self.assertTrue(allclose(scores, sorted(ratings)[:-5:-1]))
+
+    def test_float32_dtype(self):
+        self.algorithm.dtype = 'float32'
+        self.algorithm = self.algorithm.operating_on(self.data)
+        ratings = self.algorithm.for_one(3)
+        self.assertEqual(ratings.dtype, float32)
+        self.assertEqual(next(self.algorithm.for_many([1, 3])).dtype, float32)
+        self.assertTrue(allclose(ratings, self.bought[3].dot(self.weights),
+                                 atol=1e-6))
+
+    def test_not_positive_definite(self):
+        self.algorithm.regularization = 0
+        self.algorithm = self.algorithm.operating_on(self.data)
+        log_msg = ['ERROR:root:Regularized Gram matrix is not positive'
+                   ' definite.']
+        err_msg = 'Cannot invert Gram matrix! Increase the "regularization".'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.for_one(3)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_uncomparable_customer_gets_baseline(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        log_msg = ['INFO:root:Uncomparable user with ID 4. Returning'
+                   ' baseline recommendation.']
+        with self.assertLogs(level=logging.INFO) as log:
+            ratings = self.algorithm.for_one(0)
+        self.assertEqual(log.output, log_msg)
+        baseline = self.algorithm._EASE__baseline.for_one(0)
+        self.assertTrue(allclose(ratings, baseline))
+
+    def test_version_increases_on_changed_settings_only(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        version = self.algorithm.version
+        self.algorithm.regularization = 2
+        self.algorithm.max_memory = 2**30
+        self.assertEqual(self.algorithm.version, version)
+        self.algorithm.regularization = 3
+        self.assertEqual(self.algorithm.version, version + 1)
+
+
+if __name__ == '__main__':
+    ut.main()
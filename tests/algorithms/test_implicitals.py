@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from numpy import allclose, array, eye, float32, vstack
+from numpy.linalg import solve
+from numpy.random import RandomState
+from ...algorithms import ImplicitALS
+from ...datastructures import Transactions
+
+
+class TestImplicitALS(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data50.csv'
+        self.data = Transactions.from_csv(file)
+        self.algorithm = ImplicitALS()
+        self.algorithm.number_of_factors = 3
+
+    def test_has_attribute_binarize(self):
+        self.assertTrue(hasattr(self.algorithm, 'binarize'))
+
+    def test_default_binarize(self):
+        self.assertTrue(self.algorithm.binarize)
+
+    def test_binarize_type(self):
+        log_msg = ['ERROR:root:Attempt to set "binarize" to non-boolean type.']
+        err_msg = 'Attribute "binarize" must be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.binarize = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_default_number_of_factors(self):
+        self.assertEqual(ImplicitALS().number_of_factors, 20)
+
+    def test_set_number_of_factors_to_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set number_of_factors to'
+                   ' non-integer type.']
+        err_msg = '"number_of_factors" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.number_of_factors = 'bar'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_default_alpha(self):
+        self.assertEqual(self.algorithm.alpha, 40.0)
+
+    def test_set_alpha_to_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set alpha to non-numeric type.']
+        err_msg = '"alpha" must be a non-negative number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.alpha = True
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_regularization_to_negative_value(self):
+        log_msg = ['ERROR:root:Attempt to set regularization to value < 0.']
+        err_msg = '"regularization" must be a non-negative number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.regularization = -0.5
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_default_number_of_iterations_and_cg_steps(self):
+        self.assertEqual(self.algorithm.number_of_iterations, 10)
+        self.assertEqual(self.algorithm.number_of_cg_steps, 3)
+
+    def test_default_number_of_threads(self):
+        self.assertEqual(self.algorithm.number_of_threads, 1)
+
+    def test_set_number_of_threads_to_zero(self):
+        log_msg = ['ERROR:root:Attempt to set number_of_threads to value < 1.']
+        err_msg = '"number_of_threads" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.number_of_threads = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_default_dtype(self):
+        self.assertEqual(self.algorithm.dtype, 'float64')
+
+    def test_set_unsupported_dtype(self):
+        log_msg = ['ERROR:root:Attempt to set dtype to unsupported type.']
+        err_msg = 'Attribute "dtype" must be "float32" or "float64"!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.dtype = 'int'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_has_no_data_and_hidden_methods_without_data(self):
+        self.assertFalse(self.algorithm.has_data)
+        self.assertFalse(hasattr(self.algorithm, 'for_one'))
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_operating_on_reveals_methods(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(self.algorithm.has_data)
+        self.assertTrue(callable(self.algorithm.for_one))
+        self.assertTrue(callable(self.algorithm.for_many))
+        self.assertTrue(callable(self.algorithm.top_for_one))
+
+    def test_operating_on_wrong_data_type(self):
+        log_msg = ['ERROR:root:Attempt to set incompatible data type.'
+                   ' Must be <Transactions>.']
+        err_msg = 'Data must be of type <Transactions>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.operating_on('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_for_one_length(self):
+        ratings = self.algorithm.operating_on(self.data).for_one(3)
+        self.assertEqual(len(ratings), self.data.item.count)
+
+    def test_enough_cg_steps_give_exact_alternating_least_squares(self):
+        self.algorithm.number_of_iterations = 1
+        self.algorithm.operating_on(self.data).for_one(0)
+        customers = self.algorithm._ImplicitALS__customer_factors
+        articles = self.algorithm._ImplicitALS__article_factors
+        random = RandomState(0)
+        _ = random.standard_normal(customers.shape)
+        initial = 0.01 * random.standard_normal(articles.shape)
+        bought = self.data.matrix.bool_by_row.toarray()
+        confidence = 1.0 + 40.0 * bought
+
+        def solved(fixed, confidence, preferences):
+            return vstack([solve(fixed.T.dot(c[:, None] * fixed) +
+                                 0.1 * eye(3), fixed.T.dot(c * p))
+                           for c, p in zip(confidence, preferences)])
+
+        should_be_customers = solved(initial, confidence, bought)
+        should_be_articles = solved(should_be_customers, confidence.T,
+                                    bought.T)
+        self.assertTrue(allclose(customers, should_be_customers))
+        self.assertTrue(allclose(articles, should_be_articles))
+
+    def test_bought_articles_rated_higher_than_average(self):
+        ratings = self.algorithm.operating_on(self.data).for_one(3)
+        bought = self.data.matrix.by_row[3].indices
+        self.assertTrue(ratings[bought].mean() > ratings.mean())
+
+    def test_for_many_agrees_with_for_one(self):
+        self.algorithm.block_size = 4
+        self.algorithm = self.algorithm.operating_on(self.data)
+        targets = array([0, 3, 5, 7, 9, 11])
+        blocks = list(self.algorithm.for_many(targets))
+        self.assertEqual([block.shape[0] for block in blocks], [4, 2])
+        should_be = vstack([self.algorithm.for_one(target)
+                            for target in targets])
+        self.assertTrue(allclose(vstack(blocks), should_be))
+
+    def test_for_items_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items = [7, 2, 19, 2]
+        ratings = self.algorithm.for_one(3)
+        self.assertTrue(allclose(self.algorithm.for_items(3, items),
+                                 ratings[items]))
+
+    def test_top_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.top_for_one(3, 4)
+        ratings = self.algorithm.for_one(3)
+        self.assertEqual(len(items), 4)
+        self.assertTrue(allclose(scores, ratings[items]))
+        self.assertTrue(all(scores[:-1] >= scores[1:]))
+        self.assertTrue(scores[-1] >= sorted(ratings)[-4])
+
+    def test_float32_dtype(self):
+        self.algorithm.dtype = 'float32'
+        ratings = self.algorithm.operating_on(self.data).for_one(3)
+        self.assertEqual(ratings.dtype, float32)
+
+    def test_threads_give_same_result(self):
+        self.algorithm.block_size = 3
+        ratings = self.algorithm.operating_on(self.data).for_one(3)
+        other = ImplicitALS()
+        other.number_of_factors = 3
+        other.block_size = 3
+        other.number_of_threads = 2
+        other_ratings = other.operating_on(self.data).for_one(3)
+        self.assertTrue(allclose(ratings, other_ratings))
+
+    def test_fitting_does_not_change_data(self):
+        should_be = self.data.matrix.bool_by_row.toarray()
+        self.algorithm.operating_on(self.data).for_one(3)
+        self.assertTrue((self.data.matrix.bool_by_row.toarray() ==
+                         should_be).all())
+
+    def test_version_increases_on_changed_settings_only(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        version = self.algorithm.version
+        self.algorithm.alpha = 40
+        self.algorithm.number_of_threads = 2
+        self.assertEqual(self.algorithm.version, version)
+        self.algorithm.alpha = 10
+        self.assertEqual(self.algorithm.version, version + 1)
+
+    def test_changed_settings_change_ratings(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        ratings = self.algorithm.for_one(3)
+        self.algorithm.regularization = 10.0
+        self.assertFalse(allclose(self.algorithm.for_one(3), ratings))
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -187,6 +187,104 @@ class TestMostPopular(ut.TestCase):
         actually_is = len(self.algorithm.for_one(target))
         self.assertEqual(should_be, actually_is)
 
+    def test_has_attribute_block_size(self):
+        self.assertTrue(hasattr(self.algorithm, 'block_size'))
+
+    def test_default_block_size(self):
+        self.assertEqual(self.algorithm.block_size, 1000)
+
+    def test_error_on_wrong_type_of_block_size(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to non-integer type.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.block_size = 2.5
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_block_size_smaller_than_one(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to value < 1.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.block_size = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_no_attribute_for_many_without_data(self):
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+
+    def test_has_attribute_for_many_with_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(hasattr(self.algorithm, 'for_many'))
+
+    def test_for_many_yields_blocks_of_block_size(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        should_be = [(3, self.data.item.count),
+                     (3, self.data.item.count),
+                     (1, self.data.item.count)]
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.block_size = 3
+        blocks = self.algorithm.for_many(targets)
+        actually_is = [block.shape for block in blocks]
+        self.assertListEqual(should_be, actually_is)
+
+    def test_for_many_agrees_with_for_one(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.block_size = 4
+        blocks = self.algorithm.for_many(targets)
+        actually_is = [row for block in blocks for row in block.tolist()]
+        should_be = [self.algorithm.for_one(target) for target in targets]
+        self.assertTrue(allclose(should_be, actually_is))
+
+    def test_version_increases_when_data_is_attached(self):
+        before = self.algorithm.version
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_version_increases_when_binarize_changes(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.binarize = True
+        self.assertEqual(self.algorithm.version, before)
+        self.algorithm.binarize = False
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_cannot_set_attribute_version(self):
+        with self.assertRaises(AttributeError):
+            self.algorithm.version = 3
+
+    def test_no_attribute_top_for_one_without_data(self):
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_has_attribute_top_for_one_with_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_top_for_one_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        for binarize in (True, False):
+            self.algorithm.binarize = binarize
+            for target in range(self.data.user.count):
+                ratings = self.algorithm.for_one(target)
+                items, actually_is = self.algorithm.top_for_one(target, 6)
+                should_be = sorted(ratings.tolist(), reverse=True)[:6]
+                self.assertTrue(allclose(should_be, actually_is))
+                self.assertTrue(allclose(ratings[items], actually_is))
+
+    def test_top_for_one_ranks_bought_articles_first(self):
+        target = 5
+        self.algorithm = self.algorithm.operating_on(self.data)
+        bought = self.data.matrix.by_row[target].indices.tolist()
+        items, _ = self.algorithm.top_for_one(target, len(bought))
+        self.assertSetEqual(set(bought), set(items.tolist()))
+
+    def test_top_for_one_returns_all_articles_at_most(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, _ = self.algorithm.top_for_one(5, 100)
+        self.assertEqual(items.size, self.data.item.count)
+
 
 if __name__ == '__main__':
     ut.main()
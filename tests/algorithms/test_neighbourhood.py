@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+from scipy.sparse import csr_matrix
+from ...algorithms.neighbourhood import neighbour_scores, largest
+
+
+class TestNeighbourhood(ut.TestCase):
+
+    def setUp(self):
+        self.neighbours = csr_matrix([[0.0, 0.5, 0.0, 0.25],
+                                      [0.5, 0.0, 1.0, 0.0],
+                                      [0.0, 0.0, 0.0, 0.0],
+                                      [0.0, 2.0, 0.0, 0.0]])
+
+    def test_neighbour_scores_agree_with_product(self):
+        items, scores = neighbour_scores(self.neighbours, [0, 3], [2, 1])
+        should_be = self.neighbours.T.dot([2.0, 0.0, 0.0, 1.0])
+        self.assertListEqual(sorted(items.tolist()), [1, 3])
+        self.assertListEqual(scores.tolist(), should_be[items].tolist())
+
+    def test_neighbour_scores_without_neighbours(self):
+        items, scores = neighbour_scores(self.neighbours, [2], [1])
+        self.assertEqual(items.size, 0)
+        self.assertEqual(scores.size, 0)
+
+    def test_largest_selects_ties_at_last_place_by_descending_index(self):
+        items, scores = largest([9, 3, 5, 8, 1], [0.5, 2.0, 0.5, 0.1, 0.5],
+                                2)
+        self.assertListEqual(items.tolist(), [3, 9])
+        self.assertListEqual(scores.tolist(), [2.0, 0.5])
+
+    def test_largest_breaks_ties_by_descending_index(self):
+        items, scores = largest([4, 1, 7, 2], [0.5, 1.0, 0.5, 0.1], 3)
+        self.assertListEqual(items.tolist(), [1, 7, 4])
+        self.assertListEqual(scores.tolist(), [1.0, 0.5, 0.5])
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from numpy import allclose, argsort, fill_diagonal, sort, vstack
+from ...algorithms import RandomWalk
+from ...datastructures import Transactions
+
+
+class TestRandomWalk(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data50.csv'
+        self.data = Transactions.from_csv(file)
+        self.algorithm = RandomWalk()
+
+    def should_be_transitions(self, alpha, beta, number_of_neighbours):
+        bought = self.data.matrix.bool_by_row.toarray()
+        to_article = (bought / bought.sum(axis=1)[:, None])**alpha
+        to_customer = (bought.T / bought.sum(axis=0)[:, None])**alpha
+        walks = to_customer.dot(to_article) / bought.sum(axis=0)**beta
+        fill_diagonal(walks, 0.0)
+        for row in walks:
+            row[argsort(-row, kind='mergesort')[number_of_neighbours:]] = 0.0
+        return walks
+
+    def test_has_attribute_binarize(self):
+        self.assertTrue(hasattr(self.algorithm, 'binarize'))
+
+    def test_binarize_type(self):
+        log_msg = ['ERROR:root:Attempt to set "binarize" to non-boolean type.']
+        err_msg = 'Attribute "binarize" must be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.binarize = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_defaults(self):
+        self.assertTrue(self.algorithm.binarize)
+        self.assertEqual(self.algorithm.alpha, 1.0)
+        self.assertEqual(self.algorithm.beta, 0.0)
+        self.assertEqual(self.algorithm.number_of_neighbours, 100)
+        self.assertEqual(self.algorithm.block_size, 1000)
+        self.assertEqual(self.algorithm.baseline, 'Baseline')
+
+    def test_set_alpha_to_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set alpha to non-numeric type.']
+        err_msg = '"alpha" must be a non-negative number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.alpha = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_beta_to_negative_value(self):
+        log_msg = ['ERROR:root:Attempt to set beta to value < 0.']
+        err_msg = '"beta" must be a non-negative number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.beta = -0.5
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_set_number_of_neighbours_to_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set number_of_neighbours to'
+                   ' non-integer type.']
+        err_msg = '"number_of_neighbours" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.number_of_neighbours = 2.0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_has_no_hidden_methods_without_data(self):
+        self.assertFalse(self.algorithm.has_data)
+        self.assertFalse(hasattr(self.algorithm, 'for_one'))
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_operating_on_reveals_methods(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(self.algorithm.has_data)
+        self.assertTrue(callable(self.algorithm.for_one))
+        self.assertTrue(callable(self.algorithm.for_many))
+        self.assertTrue(callable(self.algorithm.top_for_one))
+
+    def test_operating_on_wrong_data_type(self):
+        log_msg = ['ERROR:root:Attempt to set incompatible data type.'
+                   ' Must be <Transactions>.']
+        err_msg = 'Data must be of type <Transactions>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.operating_on('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_p3alpha_ratings(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        walks = self.should_be_transitions(1.0, 0.0, 100)
+        bought = self.data.matrix.bool_by_row.toarray()
+        self.assertTrue(allclose(self.algorithm.for_one(3),
+                                 bought[3].dot(walks)))
+
+    def test_rp3beta_ratings_computed_block_by_block(self):
+        self.algorithm.alpha = 0.5
+        self.algorithm.beta = 0.7
+        self.algorithm.block_size = 2
+        self.algorithm = self.algorithm.operating_on(self.data)
+        walks = self.should_be_transitions(0.5, 0.7, 100)
+        bought = self.data.matrix.bool_by_row.toarray()
+        for customer in (1, 3, 5):
+            self.assertTrue(allclose(self.algorithm.for_one(customer),
+                                     bought[customer].dot(walks)))
+
+    def test_transitions_pruned_to_most_likely_neighbours(self):
+        self.algorithm.beta = 0.7
+        self.algorithm.number_of_neighbours = 3
+        self.algorithm.block_size = 2
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.for_one(3)
+        walks = self.algorithm._RandomWalk__transitions_by_row
+        should_be = self.should_be_transitions(1.0, 0.7, 3)
+        self.assertTrue((walks.getnnz(axis=1) <= 3).all())
+        self.assertTrue(allclose(sort(walks.toarray(), axis=1),
+                                 sort(should_be, axis=1)))
+
+    def test_for_many_agrees_with_for_one(self):
+        self.algorithm.block_size = 4
+        self.algorithm = self.algorithm.operating_on(self.data)
+        targets = [0, 3, 5, 7, 9, 11]
+        blocks = list(self.algorithm.for_many(targets))
+        self.assertEqual([block.shape[0] for block in blocks], [4, 2])
+        should_be = vstack([self.algorithm.for_one(target)
+                            for target in targets])
+        self.assertTrue(allclose(vstack(blocks), should_be))
+
+    def test_top_for_one_agrees_with_for_one(self):
+        self.algorithm.beta = 0.5
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.top_for_one(3, 4)
+        ratings = self.algorithm.for_one(3)
+        self.assertTrue(allclose(scores, ratings[items]))
+        self.assertTrue(allclose(scores, sorted(ratings)[:-5:-1]))
+
+    def test_sparse_for_one_agrees_with_for_one(self):
+        self.algorithm.beta = 0.5
+        self.algorithm = self.algorithm.operating_on(self.data)
+        ratings = self.algorithm.for_one(3)
+        items, scores = self.algorithm.sparse_for_one(3)
+        self.assertListEqual(ratings.nonzero()[0].tolist(),
+                             sorted(items.tolist()))
+        self.assertTrue(allclose(ratings[items], scores))
+
+    def test_uncomparable_customer_gets_baseline(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        log_msg = ['INFO:root:Uncomparable user with ID 4. Returning'
+                   ' baseline recommendation.']
+        with self.assertLogs(level=logging.INFO) as log:
+            ratings = self.algorithm.for_one(0)
+        self.assertEqual(log.output, log_msg)
+        baseline = self.algorithm._RandomWalk__baseline.for_one(0)
+        self.assertTrue(allclose(ratings, baseline))
+
+    def test_version_increases_on_changed_settings_only(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        version = self.algorithm.version
+        self.algorithm.beta = 0
+        self.assertEqual(self.algorithm.version, version)
+        self.algorithm.beta = 0.3
+        self.assertEqual(self.algorithm.version, version + 1)
+
+    def test_changed_settings_change_ratings(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        ratings = self.algorithm.for_one(3)
+        self.algorithm.number_of_neighbours = 1
+        self.assertFalse(allclose(self.algorithm.for_one(3), ratings))
+
+
+if __name__ == '__main__':
+    ut.main()
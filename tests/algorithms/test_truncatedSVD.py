@@ -3,7 +3,9 @@
 
 import logging
 import unittest as ut
-from numpy import array, allclose
+from io import StringIO
+from numpy import array, allclose, zeros
+from numpy.linalg import svd
 from ...algorithms import TruncatedSVD
 from ...datastructures import Transactions
 
@@ -304,6 +306,453 @@ class TestCollaborativeFiltering(ut.TestCase):
         actually_is = len(self.algorithm.for_one(target))
         self.assertEqual(should_be, actually_is)
 
+    def test_has_attribute_block_size(self):
+        self.assertTrue(hasattr(self.algorithm, 'block_size'))
+
+    def test_default_block_size(self):
+        self.assertEqual(self.algorithm.block_size, 1000)
+
+    def test_error_on_wrong_type_of_block_size(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to non-integer type.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.block_size = 2.5
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_block_size_smaller_than_one(self):
+        log_msg = ['ERROR:root:Attempt to set block_size to value < 1.']
+        err_msg = '"block_size" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.block_size = 0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_no_attribute_for_many_without_data(self):
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+
+    def test_has_attribute_for_many_with_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(hasattr(self.algorithm, 'for_many'))
+
+    def test_for_many_yields_blocks_of_block_size(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        should_be = [(3, self.data.item.count),
+                     (3, self.data.item.count),
+                     (1, self.data.item.count)]
+        self.algorithm.number_of_factors = 3
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.block_size = 3
+        blocks = self.algorithm.for_many(targets)
+        actually_is = [block.shape for block in blocks]
+        self.assertListEqual(should_be, actually_is)
+
+    def test_for_many_agrees_with_for_one(self):
+        targets = [1, 2, 3, 4, 5, 7, 8]
+        self.algorithm.number_of_factors = 3
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.block_size = 4
+        blocks = self.algorithm.for_many(targets)
+        actually_is = [row for block in blocks for row in block.tolist()]
+        should_be = [self.algorithm.for_one(target) for target in targets]
+        self.assertTrue(allclose(should_be, actually_is))
+
+    def test_version_increases_when_data_is_attached(self):
+        before = self.algorithm.version
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_version_increases_when_binarize_changes(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.binarize = True
+        self.assertEqual(self.algorithm.version, before)
+        self.algorithm.binarize = False
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_cannot_set_attribute_version(self):
+        with self.assertRaises(AttributeError):
+            self.algorithm.version = 3
+
+    def test_version_increases_when_number_of_factors_changes(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.number_of_factors = 3
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_default_solver_settings(self):
+        self.assertEqual(self.algorithm.solver, 'arpack')
+        self.assertEqual(self.algorithm.oversampling, 10)
+        self.assertEqual(self.algorithm.power_iterations, 2)
+
+    def test_error_on_unknown_solver(self):
+        log_msg = ['ERROR:root:Attempt to set solver to unknown value.']
+        err_msg = 'Attribute "solver" must be one of: arpack, randomized!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.solver = 'lanczos'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_wrong_type_of_oversampling(self):
+        log_msg = ['ERROR:root:Attempt to set oversampling to non-integer'
+                   ' type.']
+        err_msg = '"oversampling" must be a non-negative integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.oversampling = 2.0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_negative_power_iterations(self):
+        log_msg = ['ERROR:root:Attempt to set power_iterations to value < 0.']
+        err_msg = '"power_iterations" must be a non-negative integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.power_iterations = -1
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_zero_power_iterations_allowed(self):
+        self.algorithm.power_iterations = 0
+        self.assertEqual(self.algorithm.power_iterations, 0)
+
+    def test_randomized_solver_agrees_with_arpack(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        targets = list(range(self.data.user.count))
+        arpack = next(self.algorithm.for_many(targets))
+        self.algorithm.solver = 'randomized'
+        randomized = next(self.algorithm.for_many(targets))
+        self.assertTrue(allclose(arpack, randomized))
+
+    def test_randomized_solver_is_reproducible(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.solver = 'randomized'
+        self.algorithm.number_of_factors = 2
+        self.algorithm.oversampling = 0
+        self.algorithm.power_iterations = 0
+        before = self.algorithm.for_one(5)
+        self.algorithm.binarize = False
+        self.algorithm.binarize = True
+        self.assertListEqual(before.tolist(),
+                             self.algorithm.for_one(5).tolist())
+
+    def test_version_increases_when_solver_changes(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.solver = 'arpack'
+        self.assertEqual(self.algorithm.version, before)
+        self.algorithm.solver = 'randomized'
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_randomized_settings_matter_only_for_randomized_solver(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.oversampling = 3
+        self.assertEqual(self.algorithm.version, before)
+        self.algorithm.solver = 'randomized'
+        before = self.algorithm.version
+        self.algorithm.power_iterations = 5
+        self.assertGreater(self.algorithm.version, before)
+
+    def test_no_attributes_fold_in_and_for_history_without_data(self):
+        self.assertFalse(hasattr(self.algorithm, 'fold_in'))
+        self.assertFalse(hasattr(self.algorithm, 'for_history'))
+
+    def test_has_attributes_fold_in_and_for_history_with_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.assertTrue(hasattr(self.algorithm, 'fold_in'))
+        self.assertTrue(hasattr(self.algorithm, 'for_history'))
+
+    def test_fold_in_returns_one_value_per_factor(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        self.assertEqual(self.algorithm.fold_in([1, 2]).shape, (3,))
+
+    def test_for_items_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        items = [7, 2, 19, 2]
+        should_be = self.algorithm.for_one(4)[items]
+        self.assertTrue(allclose(self.algorithm.for_items(4, items),
+                                 should_be))
+
+    def test_for_history_of_known_customer_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        for target in range(self.data.user.count):
+            history = self.data.matrix.bool_by_row[target].indices
+            should_be = self.algorithm.for_one(target)
+            actually_is = self.algorithm.for_history(history)
+            self.assertTrue(allclose(should_be, actually_is))
+
+    def test_for_history_counts_repeated_purchases_if_not_binarized(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        self.algorithm.binarize = False
+        for target in range(self.data.user.count):
+            row = self.data.matrix.by_row[target]
+            history = [item for item, count in zip(row.indices, row.data)
+                       for _ in range(int(count))]
+            should_be = self.algorithm.for_one(target)
+            actually_is = self.algorithm.for_history(history)
+            self.assertTrue(allclose(should_be, actually_is))
+
+    def test_for_history_ignores_repeated_purchases_if_binarized(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        once = self.algorithm.for_history([1, 2])
+        twice = self.algorithm.for_history([1, 2, 2])
+        self.assertListEqual(once.tolist(), twice.tolist())
+
+    def test_for_history_of_empty_history_is_zero(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        ratings = self.algorithm.for_history([])
+        self.assertEqual(len(ratings), self.data.item.count)
+        self.assertFalse(ratings.any())
+
+    def test_error_on_fold_in_of_unknown_article(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        n_items = self.data.item.count
+        log_msg = ['ERROR:root:Attempt to fold in purchases of unknown'
+                   ' articles.']
+        err_msg = 'Article indices must be between 0 and {}!'.format(
+            n_items - 1)
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(IndexError, msg=err_msg) as err:
+                self.algorithm.fold_in([n_items])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_default_incremental_settings(self):
+        self.assertFalse(self.algorithm.incremental)
+        self.assertEqual(self.algorithm.max_drift, 0.05)
+        self.assertEqual(self.algorithm.drift, 0.0)
+
+    def test_error_on_wrong_type_of_incremental(self):
+        log_msg = ['ERROR:root:Attempt to set "incremental" to'
+                   ' non-boolean type.']
+        err_msg = 'Attribute "incremental" must be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.incremental = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_negative_max_drift(self):
+        log_msg = ['ERROR:root:Attempt to set max_drift to value < 0.']
+        err_msg = '"max_drift" must be a non-negative number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.max_drift = -0.1
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def first_and_all_transactions(self):
+        with open('./bestPy/tests/data/data50.csv') as stream:
+            lines = stream.readlines()
+        first = Transactions.from_csv(StringIO(''.join(lines[:35])))
+        return first, self.data
+
+    def ratings_of_all_customers(self, data):
+        return array([self.algorithm.for_one(target)
+                      for target in range(data.user.count)])
+
+    def test_incremental_update_is_best_approximation_of_update(self):
+        first, data = self.first_and_all_transactions()
+        self.algorithm.incremental = True
+        self.algorithm.max_drift = 1.0
+        self.algorithm = self.algorithm.operating_on(first)
+        self.algorithm.number_of_factors = 3
+        approximation = zeros(data.matrix.by_row.shape)
+        n_users, n_items = first.matrix.by_row.shape
+        approximation[:n_users, :n_items] = self.ratings_of_all_customers(
+            first)
+        approximation[:n_users, :n_items] -= first.matrix.bool_by_row.A
+        approximation += data.matrix.bool_by_row.A
+        U, s, V = svd(approximation)
+        should_be = U[:, :3].dot(s[:3, None] * V[:3])
+        self.algorithm = self.algorithm.operating_on(data)
+        actually_is = self.ratings_of_all_customers(data)
+        self.assertTrue(allclose(should_be, actually_is))
+
+    def test_incremental_update_keeps_factors_orthonormal(self):
+        first, data = self.first_and_all_transactions()
+        self.algorithm.incremental = True
+        self.algorithm.max_drift = 1.0
+        self.algorithm = self.algorithm.operating_on(first)
+        self.algorithm.number_of_factors = 3
+        _ = self.algorithm.for_one(0)
+        self.algorithm = self.algorithm.operating_on(data)
+        projection = array([self.algorithm.for_history([item])
+                            for item in range(data.item.count)])
+        self.assertTrue(allclose(projection.dot(projection), projection))
+        self.assertAlmostEqual(projection.trace(), 3.0)
+        self.assertNotEqual(self.algorithm.drift, 0.0)
+
+    def test_attaching_same_data_again_keeps_factors(self):
+        self.algorithm.incremental = True
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        before = self.ratings_of_all_customers(self.data)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        after = self.ratings_of_all_customers(self.data)
+        self.assertTrue(allclose(before, after))
+        self.assertAlmostEqual(self.algorithm.drift, 0.0)
+
+    def test_full_recompute_when_drift_exceeds_max_drift(self):
+        first, data = self.first_and_all_transactions()
+        self.algorithm.solver = 'randomized'
+        self.algorithm.incremental = True
+        self.algorithm = self.algorithm.operating_on(first)
+        self.algorithm.number_of_factors = 1
+        _ = self.algorithm.for_one(0)
+        with self.assertLogs(level=logging.INFO) as log:
+            self.algorithm = self.algorithm.operating_on(data)
+        self.assertEqual(len(log.output), 1)
+        self.assertTrue(log.output[0].startswith('INFO:root:Factors drifted'
+                                                 ' by 0.0'))
+        self.assertTrue(log.output[0].endswith('> 0.05. Recomputing the'
+                                               ' SVD.'))
+        actually_is = self.ratings_of_all_customers(data)
+        recomputed = TruncatedSVD()
+        recomputed.solver = 'randomized'
+        recomputed = recomputed.operating_on(data)
+        recomputed.number_of_factors = 1
+        should_be = array([recomputed.for_one(target)
+                           for target in range(data.user.count)])
+        self.assertTrue(allclose(should_be, actually_is))
+
+    def test_no_update_unless_incremental(self):
+        first, data = self.first_and_all_transactions()
+        self.algorithm = self.algorithm.operating_on(first)
+        self.algorithm.number_of_factors = 2
+        _ = self.algorithm.for_one(0)
+        self.algorithm = self.algorithm.operating_on(data)
+        self.assertEqual(self.algorithm.drift, 0.0)
+
+    def fresh_ratings_with(self, number_of_factors, solver='arpack'):
+        algorithm = TruncatedSVD()
+        algorithm.solver = solver
+        algorithm = algorithm.operating_on(self.data)
+        algorithm.number_of_factors = number_of_factors
+        return array([algorithm.for_one(target)
+                      for target in range(self.data.user.count)])
+
+    def test_fewer_factors_are_sliced_from_more(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 4
+        _ = self.algorithm.for_one(0)
+        self.algorithm.number_of_factors = 2
+        actually_is = self.ratings_of_all_customers(self.data)
+        self.assertTrue(allclose(self.fresh_ratings_with(2), actually_is))
+
+    def test_more_factors_are_computed_when_needed(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 2
+        _ = self.algorithm.for_one(0)
+        self.algorithm.number_of_factors = 3
+        actually_is = self.ratings_of_all_customers(self.data)
+        self.assertTrue(allclose(self.fresh_ratings_with(3), actually_is))
+
+    def test_more_factors_with_warm_started_randomized_solver(self):
+        self.algorithm.solver = 'randomized'
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 1
+        _ = self.algorithm.for_one(0)
+        self.algorithm.number_of_factors = 3
+        actually_is = self.ratings_of_all_customers(self.data)
+        should_be = self.fresh_ratings_with(3, 'randomized')
+        self.assertTrue(allclose(should_be, actually_is))
+
+    def test_changing_number_of_factors_back_and_forth(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        before = self.ratings_of_all_customers(self.data)
+        self.algorithm.number_of_factors = 1
+        _ = self.algorithm.for_one(0)
+        self.algorithm.number_of_factors = 3
+        after = self.ratings_of_all_customers(self.data)
+        self.assertTrue(allclose(before, after))
+
+    def test_changing_number_of_factors_after_incremental_update(self):
+        first, data = self.first_and_all_transactions()
+        self.algorithm.incremental = True
+        self.algorithm.max_drift = 1.0
+        self.algorithm = self.algorithm.operating_on(first)
+        self.algorithm.number_of_factors = 3
+        _ = self.algorithm.for_one(0)
+        self.algorithm = self.algorithm.operating_on(data)
+        self.algorithm.number_of_factors = 2
+        actually_is = self.ratings_of_all_customers(data)
+        self.assertTrue(allclose(self.fresh_ratings_with(2), actually_is))
+        self.assertEqual(self.algorithm.drift, 0.0)
+
+    def test_default_index_settings(self):
+        self.assertEqual(self.algorithm.number_of_clusters, 0)
+        self.assertEqual(self.algorithm.number_of_probes, 8)
+
+    def test_error_on_negative_number_of_clusters(self):
+        log_msg = ['ERROR:root:Attempt to set number_of_clusters to'
+                   ' value < 0.']
+        err_msg = '"number_of_clusters" must be a non-negative integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.number_of_clusters = -1
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_wrong_type_of_number_of_probes(self):
+        log_msg = ['ERROR:root:Attempt to set number_of_probes to'
+                   ' non-integer type.']
+        err_msg = '"number_of_probes" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.number_of_probes = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_no_attribute_top_for_one_without_data(self):
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+
+    def test_exact_top_for_one_agrees_with_for_one(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        ratings = self.algorithm.for_one(4)
+        items, scores = self.algorithm.top_for_one(4, 3)
+        self.assertTrue(allclose(scores, sorted(ratings)[::-1][:3]))
+        self.assertTrue(allclose(ratings[items], scores))
+
+    def test_approximate_top_for_one_with_all_clusters_is_exact(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        exact_items, exact_scores = self.algorithm.top_for_one(4, 3)
+        self.algorithm.number_of_clusters = 4
+        self.algorithm.number_of_probes = 4
+        items, scores = self.algorithm.top_for_one(4, 3)
+        self.assertTrue(allclose(exact_scores, scores))
+
+    def test_approximate_top_for_one_scores_are_ratings(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.algorithm.number_of_factors = 3
+        self.algorithm.number_of_clusters = 4
+        self.algorithm.number_of_probes = 1
+        ratings = self.algorithm.for_one(4)
+        items, scores = self.algorithm.top_for_one(4, 5)
+        self.assertEqual(len(items), 5)
+        self.assertTrue(allclose(ratings[items], scores))
+
+    def test_version_increases_when_index_settings_change(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        before = self.algorithm.version
+        self.algorithm.number_of_clusters = 4
+        after_clusters = self.algorithm.version
+        self.algorithm.number_of_probes = 2
+        self.assertGreater(after_clusters, before)
+        self.assertGreater(self.algorithm.version, after_clusters)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from numpy import allclose, inf, isinf, unique, vstack
+from ...algorithms import TwoStage, EASE, Baseline, CollaborativeFiltering
+from ...algorithms import MostPopular
+from ...datastructures import Transactions
+
+
+class TestTwoStage(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data50.csv'
+        self.data = Transactions.from_csv(file)
+        self.algorithm = TwoStage()
+        self.algorithm.number_of_candidates = 4
+        self.scorer = EASE()
+        self.scorer.regularization = 2.0
+
+    def test_defaults(self):
+        algorithm = TwoStage()
+        self.assertEqual(algorithm.sources,
+                         ('CollaborativeFiltering', 'Baseline'))
+        self.assertEqual(algorithm.scorer, 'TruncatedSVD')
+        self.assertEqual(algorithm.number_of_candidates, 100)
+        self.assertEqual(algorithm.block_size, 1000)
+
+    def test_set_number_of_candidates_to_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set number_of_candidates to'
+                   ' non-integer type.']
+        err_msg = '"number_of_candidates" must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.number_of_candidates = 'foo'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_generating_from_nothing(self):
+        log_msg = ['ERROR:root:Attempt to set no candidate sources.']
+        err_msg = 'At least one candidate source is required!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.algorithm.generating_from()
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_generating_from_object_without_operating_on(self):
+        log_msg = ['ERROR:root:Attempt to set object lacking mandatory'
+                   ' "operating_on()" method.']
+        err_msg = 'Object lacks "operating_on()" method!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(AttributeError, msg=err_msg) as err:
+                self.algorithm.generating_from(Baseline(), 'foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_generating_from_and_scoring_with_return_self(self):
+        algorithm = self.algorithm.generating_from(Baseline())
+        self.assertIs(algorithm, self.algorithm)
+        algorithm = self.algorithm.scoring_with(self.scorer)
+        self.assertIs(algorithm, self.algorithm)
+        self.assertEqual(self.algorithm.sources, ('Baseline',))
+        self.assertEqual(self.algorithm.scorer, 'EASE')
+
+    def test_setting_sources_and_scorer_with_data_attaches_data(self):
+        self.algorithm = self.algorithm.operating_on(self.data)
+        source = Baseline()
+        self.algorithm.generating_from(source).scoring_with(self.scorer)
+        self.assertTrue(source.has_data)
+        self.assertTrue(self.scorer.has_data)
+
+    def test_has_no_hidden_methods_without_data(self):
+        self.assertFalse(self.algorithm.has_data)
+        self.assertFalse(hasattr(self.algorithm, 'candidates_for'))
+        self.assertFalse(hasattr(self.algorithm, 'for_one'))
+        self.assertFalse(hasattr(self.algorithm, 'for_many'))
+        self.assertFalse(hasattr(self.algorithm, 'top_for_one'))
+        self.assertFalse(hasattr(self.algorithm, 'sparse_for_one'))
+
+    def test_operating_on_wrong_data_type(self):
+        log_msg = ['ERROR:root:Attempt to set incompatible data type.'
+                   ' Must be <Transactions>.']
+        err_msg = 'Data must be of type <Transactions>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.algorithm.operating_on('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_candidates_are_union_of_top_items_of_sources(self):
+        cf = CollaborativeFiltering().operating_on(self.data)
+        baseline = Baseline().operating_on(self.data)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        bought = self.data.matrix.by_row[3].indices.tolist()
+        head = 4 + len(bought)
+        should_be = []
+        for source in (cf, baseline):
+            top = [item for item in source.top_for_one(3, head)[0]
+                   if item not in bought]
+            should_be.extend(top[:4])
+        self.assertListEqual(self.algorithm.candidates_for(3).tolist(),
+                             unique(should_be).tolist())
+
+    def test_sources_without_top_for_one(self):
+        self.algorithm.generating_from(MostPopular())
+        self.algorithm = self.algorithm.operating_on(self.data)
+        popularity = MostPopular().operating_on(self.data).for_one(3)
+        popularity[self.data.matrix.by_row[3].indices] = -inf
+        should_be = sorted(popularity)[-4:]
+        candidates = self.algorithm.candidates_for(3)
+        self.assertEqual(candidates.size, 4)
+        self.assertListEqual(sorted(popularity[candidates]), should_be)
+
+    def test_candidates_exclude_purchases(self):
+        bought = self.data.matrix.by_row[5].indices
+        self.assertGreaterEqual(bought.size, 4)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        candidates = self.algorithm.candidates_for(5)
+        self.assertEqual(len(set(candidates) & set(bought)), 0)
+        self.assertGreater(candidates.size, 0)
+
+    def test_candidates_exclude_purchases_without_top_for_one(self):
+        bought = self.data.matrix.by_row[5].indices
+        self.algorithm.generating_from(MostPopular())
+        self.algorithm.scoring_with(self.scorer)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        candidates = self.algorithm.candidates_for(5)
+        self.assertEqual(candidates.size, 4)
+        self.assertEqual(len(set(candidates) & set(bought)), 0)
+        ratings = vstack(list(self.algorithm.for_many(range(12))))[5]
+        self.assertEqual(isinf(ratings[bought]).sum(), bought.size)
+        self.assertEqual((~isinf(ratings)).sum(), 4)
+
+    def test_for_one_rates_candidates_only(self):
+        self.algorithm.scoring_with(self.scorer)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        candidates = self.algorithm.candidates_for(3)
+        ratings = self.algorithm.for_one(3)
+        self.assertEqual(ratings.size, self.data.item.count)
+        self.assertTrue(allclose(ratings[candidates],
+                                 self.scorer.for_one(3)[candidates]))
+        self.assertEqual(isinf(ratings).sum(),
+                         self.data.item.count - candidates.size)
+
+    def test_scorer_without_for_items(self):
+        self.algorithm.scoring_with(MostPopular())
+        self.algorithm = self.algorithm.operating_on(self.data)
+        candidates = self.algorithm.candidates_for(3)
+        popularity = MostPopular().operating_on(self.data).for_one(3)
+        self.assertTrue(allclose(self.algorithm.for_one(3)[candidates],
+                                 popularity[candidates]))
+
+    def test_for_many_agrees_with_for_one(self):
+        self.algorithm.block_size = 4
+        self.algorithm.scoring_with(self.scorer)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        targets = [1, 3, 5, 8, 10, 11]
+        blocks = list(self.algorithm.for_many(targets))
+        self.assertEqual([block.shape[0] for block in blocks], [4, 2])
+        should_be = vstack([self.algorithm.for_one(target)
+                            for target in targets])
+        self.assertTrue((vstack(blocks) == should_be).all())
+
+    def test_for_many_agrees_with_for_one_without_top_or_for_items(self):
+        self.algorithm.block_size = 4
+        self.algorithm.generating_from(MostPopular(), Baseline())
+        self.algorithm.scoring_with(MostPopular())
+        self.algorithm = self.algorithm.operating_on(self.data)
+        targets = [1, 3, 5, 8, 10, 11]
+        should_be = vstack([self.algorithm.for_one(target)
+                            for target in targets])
+        blocks = vstack(list(self.algorithm.for_many(targets)))
+        self.assertTrue((blocks == should_be).all())
+
+    def test_sparse_for_one_rates_candidates_only(self):
+        self.algorithm.scoring_with(self.scorer)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.sparse_for_one(3)
+        self.assertListEqual(items.tolist(),
+                             self.algorithm.candidates_for(3).tolist())
+        self.assertTrue((scores == self.algorithm.for_one(3)[items]).all())
+
+    def test_top_for_one_is_top_of_candidates(self):
+        self.algorithm.scoring_with(self.scorer)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.top_for_one(3, 3)
+        ratings = self.algorithm.for_one(3)
+        self.assertTrue(allclose(scores, ratings[items]))
+        self.assertTrue(allclose(scores, sorted(ratings)[:-4:-1]))
+
+    def test_top_for_one_returns_at_most_all_candidates(self):
+        self.algorithm.generating_from(Baseline())
+        self.algorithm = self.algorithm.operating_on(self.data)
+        items, scores = self.algorithm.top_for_one(3, 10)
+        self.assertEqual(items.size, 4)
+
+    def test_version_follows_settings_sources_and_scorer(self):
+        self.algorithm.scoring_with(self.scorer)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        version = self.algorithm.version
+        self.algorithm.number_of_candidates = 4
+        self.assertEqual(self.algorithm.version, version)
+        self.scorer.regularization = 3.0
+        self.assertEqual(self.algorithm.version, version + 1)
+        self.algorithm.number_of_candidates = 5
+        self.assertEqual(self.algorithm.version, version + 2)
+
+    def test_version_never_repeats_when_scorer_is_swapped(self):
+        self.algorithm.scoring_with(self.scorer)
+        self.algorithm = self.algorithm.operating_on(self.data)
+        self.scorer.regularization = 3.0
+        self.scorer.regularization = 4.0
+        before = self.algorithm.version
+        self.algorithm.scoring_with(EASE())
+        self.assertGreater(self.algorithm.version, before)
+
+
+if __name__ == '__main__':
+    ut.main()
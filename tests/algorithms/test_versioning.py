@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+from ...algorithms.versioning import version_of, combined_version
+from ...algorithms.versioning import version_before_replacing
+
+
+class Versioned():
+
+    def __init__(self, version):
+        self.version = version
+
+
+class TestVersioning(ut.TestCase):
+
+    def test_version_of_versioned_object(self):
+        self.assertEqual(version_of(Versioned(3)), 3)
+
+    def test_version_of_unversioned_object(self):
+        self.assertIsNone(version_of(object()))
+        self.assertIsNone(version_of(Versioned(None)))
+
+    def test_combined_version_adds_versions(self):
+        self.assertEqual(combined_version(2, [Versioned(3), Versioned(4)]),
+                         9)
+
+    def test_combined_version_none_if_any_is_unversioned(self):
+        self.assertIsNone(combined_version(2, [Versioned(3), object()]))
+
+    def test_version_before_replacing_skips_replaced_versions(self):
+        old = [Versioned(3), Versioned(4)]
+        own = version_before_replacing(2, old)
+        self.assertEqual(own, 10)
+        self.assertGreater(combined_version(own, [Versioned(0)]),
+                           combined_version(2, old))
+
+    def test_version_before_replacing_unversioned(self):
+        self.assertEqual(version_before_replacing(2, [object()]), 3)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from numpy import argsort
+from numpy.random import RandomState
+from ....datastructures.auxiliary import InnerProductIndex
+
+
+class TestInnerProductIndex(ut.TestCase):
+
+    def setUp(self):
+        random = RandomState(3)
+        self.vectors = random.standard_normal((500, 8))
+        self.query = random.standard_normal(8)
+        self.index = InnerProductIndex(self.vectors, 16)
+
+    def exact_top(self, n):
+        return argsort(-self.vectors.dot(self.query))[:n].tolist()
+
+    def test_attributes(self):
+        self.assertEqual(self.index.number_of_clusters, 16)
+        self.assertEqual(self.index.number_of_items, 500)
+
+    def test_number_of_clusters_capped_at_number_of_items(self):
+        index = InnerProductIndex(self.vectors[:5], 16)
+        self.assertEqual(index.number_of_clusters, 5)
+
+    def test_search_returns_sorted_inner_products(self):
+        items, scores = self.index.search(self.query, 10, 4)
+        self.assertListEqual(scores.tolist(),
+                             self.vectors[items].dot(self.query).tolist())
+        self.assertListEqual(scores.tolist(), sorted(scores, reverse=True))
+
+    def test_probing_all_clusters_is_exact(self):
+        items, _ = self.index.search(self.query, 10, 16)
+        self.assertListEqual(items.tolist(), self.exact_top(10))
+
+    def test_more_probes_do_not_lower_recall(self):
+        exact = set(self.exact_top(10))
+        recalls = [len(exact & set(self.index.search(self.query, 10,
+                                                     probes)[0]))
+                   for probes in (1, 4, 16)]
+        self.assertListEqual(recalls, sorted(recalls))
+
+    def test_always_returns_requested_number_if_possible(self):
+        items, _ = self.index.search(self.query, 100, 1)
+        self.assertEqual(len(items), 100)
+        self.assertEqual(len(set(items.tolist())), 100)
+
+    def test_returns_all_items_if_fewer_than_requested(self):
+        items, _ = self.index.search(self.query, 1000, 1)
+        self.assertEqual(len(items), 500)
+
+    def test_error_on_wrong_number_of_probes(self):
+        log_msg = ['ERROR:root:Attempt to set number of probes to value < 1.']
+        err_msg = 'The number of probes must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.index.search(self.query, 10, 0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+from time import sleep
+from ....datastructures.auxiliary import LRUCache
+
+
+class TestInstantiateLRUCache(ut.TestCase):
+
+    def test_error_on_wrong_type_of_max_size(self):
+        log_msg = ['ERROR:root:Attempt to set cache size to non-integer type.']
+        err_msg = 'Cache size must be an integer >= 0!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = LRUCache('foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_negative_max_size(self):
+        log_msg = ['ERROR:root:Attempt to set cache size to value < 0.']
+        err_msg = 'Cache size must be an integer >= 0!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = LRUCache(-1)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_wrong_type_of_time_to_live(self):
+        log_msg = ['ERROR:root:Attempt to set time to live of cache entries'
+                   ' to non-numeric type.']
+        err_msg = 'Time to live must be a positive number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = LRUCache(3, 'bar')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_non_positive_time_to_live(self):
+        log_msg = ['ERROR:root:Attempt to set time to live of cache entries'
+                   ' to value <= 0.']
+        err_msg = 'Time to live must be a positive number!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = LRUCache(3, 0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestLRUCache(ut.TestCase):
+
+    def setUp(self):
+        self.cache = LRUCache(2)
+
+    def test_miss_on_empty_cache(self):
+        self.assertIsNone(self.cache.get('foo'))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_hit_after_put(self):
+        self.cache.put('foo', 1)
+        self.assertEqual(self.cache.get('foo'), 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put('foo', 1)
+        self.cache.put('bar', 2)
+        _ = self.cache.get('foo')
+        self.cache.put('baz', 3)
+        self.assertEqual(self.cache.size, 2)
+        self.assertIsNone(self.cache.get('bar'))
+        self.assertEqual(self.cache.get('foo'), 1)
+        self.assertEqual(self.cache.get('baz'), 3)
+
+    def test_clear(self):
+        self.cache.put('foo', 1)
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+        self.assertIsNone(self.cache.get('foo'))
+
+    def test_zero_size_stores_nothing(self):
+        cache = LRUCache(0)
+        cache.put('foo', 1)
+        self.assertEqual(cache.size, 0)
+
+    def test_entries_expire(self):
+        cache = LRUCache(2, 0.01)
+        cache.put('foo', 1)
+        sleep(0.02)
+        self.assertIsNone(cache.get('foo'))
+        self.assertEqual(cache.size, 0)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from ....datastructures.auxiliary import HyperLogLogs, CountMinSketch
+
+
+class TestHyperLogLogs(ut.TestCase):
+
+    def setUp(self):
+        self.counters = HyperLogLogs(3, precision=10)
+
+    def test_empty_counters_estimate_zero(self):
+        self.assertListEqual(self.counters.estimates().tolist(), [0.0] * 3)
+
+    def test_memory_is_fixed(self):
+        self.assertEqual(self.counters.nbytes, 3 * (2**10 + 12))
+        for key in range(1000):
+            self.counters.add(0, key)
+        self.assertEqual(self.counters.nbytes, 3 * (2**10 + 12))
+
+    def test_duplicates_are_not_counted(self):
+        for _ in range(100):
+            self.counters.add(1, 'customer')
+        self.assertAlmostEqual(self.counters.estimate(1), 1.0, delta=0.01)
+
+    def test_small_counts_are_accurate(self):
+        for key in range(20):
+            self.counters.add(2, key)
+        self.assertAlmostEqual(self.counters.estimate(2), 20, delta=1)
+
+    def test_large_counts_within_error(self):
+        for key in range(20000):
+            self.counters.add(0, key)
+        self.assertAlmostEqual(self.counters.estimate(0), 20000, delta=2000)
+
+    def test_estimate_agrees_with_estimates(self):
+        for key in range(300):
+            self.counters.add(key % 3, key)
+        estimates = self.counters.estimates()
+        for slot in range(3):
+            self.assertEqual(self.counters.estimate(slot), estimates[slot])
+
+    def test_slots_are_independent(self):
+        for key in range(50):
+            self.counters.add(0, key)
+        estimates = self.counters.estimates()
+        self.assertEqual(estimates[1], 0.0)
+        self.assertEqual(estimates[2], 0.0)
+
+    def test_error_on_precision_out_of_range(self):
+        log_msg = ['ERROR:root:Attempt to set precision to value'
+                   ' out of range.']
+        err_msg = 'The precision is out of range!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = HyperLogLogs(3, precision=20)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestCountMinSketch(ut.TestCase):
+
+    def setUp(self):
+        self.sketch = CountMinSketch(10, width=64, depth=3)
+
+    def test_memory_is_fixed(self):
+        self.assertEqual(self.sketch.nbytes, 64 * 3 * 8 + 3 * 3 * 8)
+
+    def test_memory_does_not_depend_on_number_of_keys(self):
+        sketch = CountMinSketch(10**6, width=64, depth=3)
+        self.assertEqual(sketch.nbytes, self.sketch.nbytes)
+        sketch.add(10**6 - 1, 5)
+        self.assertEqual(sketch.estimates()[-1], 5)
+        self.assertEqual(sketch.nbytes, self.sketch.nbytes)
+
+    def test_add_returns_estimate(self):
+        self.sketch.add(3)
+        self.assertEqual(self.sketch.add(3, 2), self.sketch.estimate(3))
+
+    def test_never_undercounts(self):
+        for key in range(10):
+            for _ in range(key):
+                self.sketch.add(key)
+        estimates = self.sketch.estimates()
+        for key in range(10):
+            self.assertGreaterEqual(estimates[key], key)
+            self.assertEqual(estimates[key], self.sketch.estimate(key))
+
+    def test_exact_without_collisions(self):
+        self.sketch = CountMinSketch(10, width=4096, depth=4)
+        for key in range(10):
+            self.sketch.add(key, key)
+        self.assertListEqual(self.sketch.estimates().tolist(), list(range(10)))
+        self.assertEqual(self.sketch.total, 45)
+
+    def test_error_on_wrong_type_of_width(self):
+        log_msg = ['ERROR:root:Attempt to set width to non-integer type.']
+        err_msg = 'The width must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = CountMinSketch(10, width=2.0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -199,6 +199,20 @@ class TestTransactions(ut.TestCase):
         actual = [self.data._users_who_bought(i).tolist() for i in range(6)]
         self.assertListEqual(should_be, actual)
 
+    def test_uncomparable_users(self):
+        should_be = [True, True, True, True]
+        actually_is = self.data._uncomparable_users.tolist()
+        self.assertListEqual(should_be, actually_is)
+
+    def test_uncomparable_users_agrees_with_users_who_bought(self):
+        file = './bestPy/tests/data/data50.csv'
+        data = Transactions.from_csv(file)
+        should_be = [data._users_who_bought(
+                         data.matrix.by_row[user].indices).size == 1
+                     for user in range(data.user.count)]
+        actually_is = data._uncomparable_users.tolist()
+        self.assertListEqual(should_be, actually_is)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -380,8 +380,8 @@ class TestRecommender(ut.TestCase):
 
     def test_recommendation_for_unknown_user_is_baseline(self):
         target = 'john doe'
-        should_be = ['CA189EL29AGOALID-170', 'BL152EL82CRXALID-1817',
-                     'SA848EL83DOYALID-2416', 'OL756EL65HDYALID-4834']
+        should_be = ['SA848EL83DOYALID-2416', 'BL152EL82CRXALID-1817',
+                     'CA189EL29AGOALID-170', 'OL756EL65HDYALID-4834']
         self.recommender = self.recommender.pruning_old
         with self.assertLogs(level=logging.INFO):
             actually_is = list(self.recommender.for_one(target, 4))
@@ -394,16 +394,16 @@ class TestRecommender(ut.TestCase):
     def test_recommendation_for_known_user_is_algorithm(self):
         target = '7'
         self.recommender = self.recommender.pruning_old
-        should_be = ['PI794EL32ENZALID-3067', 'AC016EL67BJWALID-932',
-                     'VI962EL59EFGALID-2840', 'MO717EL47ARKALID-452']
+        should_be = ['MO717EL47ARKALID-452', 'SA848EL83DOYALID-2416',
+                     'BL152EL82CRXALID-1817', 'CA189EL29AGOALID-170']
         actually_is = list(self.recommender.for_one(target, 4))
         self.assertListEqual(actually_is, should_be)
 
     def test_recommendation_keeping_old_known_user(self):
         target = '7'
         self.recommender = self.recommender.keeping_old
-        should_be = ['AC016EL56BKHALID-943', 'OL756EL55HAMALID-4744',
-                     'OL756EL65HDYALID-4834', 'AC016EL58BKFALID-941']
+        should_be = ['OL756EL65HDYALID-4834', 'AC016EL58BKFALID-941',
+                     'AP082EL03BMIALID-996', 'AP082EL13BLYALID-986']
         actually_is = list(self.recommender.for_one(target, 4))
         self.assertListEqual(actually_is, should_be)
 
@@ -428,6 +428,613 @@ class TestRecommender(ut.TestCase):
         actually_is = len(list(recommender.for_one(1, 23)))
         self.assertEqual(should_be, actually_is)
 
+    def test_has_method_for_many(self):
+        self.assertTrue(hasattr(self.recommender, 'for_many'))
+
+    def test_for_many_shape(self):
+        targets = ['4', '7', 'john doe']
+        with self.assertLogs(level=logging.INFO):
+            items, scores = self.recommender.for_many(targets, 3)
+        self.assertTupleEqual(items.shape, (3, 3))
+        self.assertTupleEqual(scores.shape, (3, 3))
+
+    def test_for_many_logs_unknown_users_once(self):
+        targets = ['john doe', '7', 'jane doe']
+        log_msg = ['INFO:root:2 unknown target users. Defaulting to baseline'
+                   ' recommendation.']
+        with self.assertLogs(level=logging.INFO) as log:
+            _ = self.recommender.for_many(targets, 3)
+        self.assertEqual(log.output, log_msg)
+
+    def test_for_many_rows_are_sorted(self):
+        targets = list(self.data.user.index_of.keys())
+        _, scores = self.recommender.keeping_old.for_many(targets, 6)
+        for row in scores.tolist():
+            self.assertListEqual(sorted(row, reverse=True), row)
+
+    def test_for_many_agrees_with_algorithm(self):
+        targets = list(self.data.user.index_of.keys())
+        algorithm = DefaultAlgorithm().operating_on(self.data)
+        for recommender in (self.recommender.keeping_old,
+                            self.recommender.pruning_old):
+            with self.assertLogs(level=logging.INFO):
+                items, scores = recommender.for_many(targets, 4)
+                ratings_of = [algorithm.for_one(self.data.user.index_of[user])
+                              for user in targets]
+            for row, target in enumerate(targets):
+                ratings = ratings_of[row]
+                if recommender.only_new:
+                    index = self.data.user.index_of[target]
+                    bought = self.data.matrix.by_row[index].indices
+                    ratings[bought] = float('-inf')
+                should_be = sorted(ratings.tolist(), reverse=True)[:4]
+                self.assertListEqual(should_be, scores[row].tolist())
+                self.assertListEqual(ratings[items[row]].tolist(),
+                                     scores[row].tolist())
+
+    def test_for_many_unknown_user_gets_baseline(self):
+        targets = ['john doe']
+        should_be = ['SA848EL83DOYALID-2416', 'BL152EL82CRXALID-1817']
+        with self.assertLogs(level=logging.INFO):
+            items, _ = self.recommender.for_many(targets, 2)
+        actually_is = [self.data.item.id_of[item] for item in items[0]]
+        self.assertListEqual(should_be, actually_is)
+
+    def test_for_many_with_algorithm_lacking_for_many(self):
+        class MockUp():
+            has_data = True
+            def operating_on(self, data):
+                self.baseline = default_baseline().operating_on(data)
+                return self
+            def for_one(self, target):
+                return self.baseline.for_one()
+        targets = ['4', '7']
+        recommender = self.recommender.using(MockUp()).keeping_old
+        items, _ = recommender.for_many(targets, 2)
+        should_be = ['SA848EL83DOYALID-2416', 'BL152EL82CRXALID-1817']
+        for row in items:
+            actually_is = [self.data.item.id_of[item] for item in row]
+            self.assertListEqual(should_be, actually_is)
+
+    def test_has_method_ranked_for_one(self):
+        self.assertTrue(hasattr(self.recommender, 'ranked_for_one'))
+
+    def test_ranked_for_one_known_user(self):
+        target = '7'
+        should_be = [0.6282051282051282, 0.5769230769230769,
+                     0.5769230769230769, 0.5769230769230769]
+        recommender = self.recommender.keeping_old
+        ranked = list(recommender.ranked_for_one(target, 4))
+        self.assertEqual(ranked[0][0], 'OL756EL65HDYALID-4834')
+        self.assertListEqual(should_be, [score for _, score in ranked])
+
+    def test_ranked_for_one_unknown_user(self):
+        target = 'john doe'
+        should_be = [('SA848EL83DOYALID-2416', 5.0),
+                     ('BL152EL82CRXALID-1817', 3.0)]
+        with self.assertLogs(level=logging.INFO):
+            actually_is = list(self.recommender.ranked_for_one(target, 2))
+        self.assertListEqual(should_be, actually_is)
+
+    def test_ranked_for_one_agrees_with_for_one(self):
+        target = '4'
+        should_be = set(self.recommender.keeping_old.for_one(target, 3))
+        ranked = self.recommender.keeping_old.ranked_for_one(target, 3)
+        actually_is = set(article for article, _ in ranked)
+        self.assertSetEqual(should_be, actually_is)
+
+    def test_ranked_for_one_structured(self):
+        target = '7'
+        recommender = self.recommender.keeping_old
+        ranked = recommender.ranked_for_one(target, 4, structured=True)
+        should_be = list(recommender.ranked_for_one(target, 4))
+        self.assertTupleEqual(ranked.dtype.names, ('item', 'score'))
+        self.assertListEqual(should_be, ranked.tolist())
+
+    def test_ranked_for_one_error_on_wrong_type_of_structured(self):
+        log_msg = ['ERROR:root:Attempt to set "structured" to'
+                   ' non-boolean type.']
+        err_msg = 'Argument "structured" must be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = self.recommender.ranked_for_one('7', 4, 'yes')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_sparse_false_by_default(self):
+        self.assertFalse(self.recommender.sparse)
+
+    def test_error_on_wrong_type_of_sparse(self):
+        log_msg = ['ERROR:root:Attempt to set "sparse" to non-boolean type.']
+        err_msg = 'Attribute "sparse" must be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.recommender.sparse = 'yes'
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_sparse_ranked_for_one_agrees_with_dense(self):
+        for recommender in (self.recommender.keeping_old,
+                            self.recommender.pruning_old):
+            for target in self.data.user.index_of.keys():
+                recommender.sparse = False
+                with self.assertLogs(level=logging.INFO):
+                    logging.info('Log at least once.')
+                    dense = list(recommender.ranked_for_one(target, 6))
+                recommender.sparse = True
+                with self.assertLogs(level=logging.INFO):
+                    logging.info('Log at least once.')
+                    sparse = list(recommender.ranked_for_one(target, 6))
+                self.assertListEqual([score for _, score in dense],
+                                     [score for _, score in sparse])
+                self.assertEqual(len(set(sparse)), 6)
+
+    def test_sparse_prunes_bought_and_fills_from_baseline(self):
+        class MockUp():
+            has_data = True
+            def operating_on(self, data):
+                return self
+            def for_one(self, target):
+                raise AssertionError('Dense ratings should not be needed.')
+            def sparse_for_one(self, target):
+                return [3, 7, 2], [0.5, 0.75, 0.25]
+        recommender = self.recommender.using(MockUp())
+        recommender.sparse = True
+        target = '7'
+        index = self.data.user.index_of[target]
+        bought = self.data.matrix.by_row[index].indices.tolist()
+        items, scores = recommender._RecoBasedOn__sparse_ranked(target, 6)
+        should_be = [item for item in [7, 3, 2] if item not in bought]
+        self.assertListEqual(items[:len(should_be)].tolist(), should_be)
+        baseline_items = recommender._RecoBasedOn__baseline_ranking()[0]
+        should_be += [item for item in baseline_items.tolist()
+                      if item not in bought + should_be]
+        self.assertListEqual(items.tolist(), should_be[:6])
+        self.assertTrue((scores[len(should_be) - 6 + 3:] == 0).all())
+        self.assertEqual(len(list(recommender.for_one(target, 6))), 6)
+
+    def test_sparse_keeps_bought_if_not_enough_new(self):
+        class MockUp():
+            has_data = True
+            def operating_on(self, data):
+                return self
+            def for_one(self, target):
+                raise AssertionError('Dense ratings should not be needed.')
+            def sparse_for_one(self, target):
+                return [], []
+        recommender = self.recommender.using(MockUp()).pruning_old
+        recommender.sparse = True
+        count = self.data.item.count
+        ranked = recommender.ranked_for_one('7', count, structured=True)
+        self.assertEqual(len(set(ranked['item'].tolist())), count)
+        index = self.data.user.index_of['7']
+        bought = self.data.matrix.by_row[index].indices.size
+        self.assertTrue((ranked['score'][-bought:] == float('-inf')).all())
+
+    def test_cache_distinguishes_sparse(self):
+        recommender = self.recommender.caching(10)
+        _ = list(recommender.for_one('7', 4))
+        recommender.sparse = True
+        _ = list(recommender.for_one('7', 4))
+        self.assertEqual(recommender.cache_hits, 0)
+
+    def top_for_one_only(self):
+        algorithm = self.algorithm.operating_on(self.data)
+        class MockUp():
+            has_data = True
+            requested = []
+            def operating_on(self, data):
+                return self
+            def for_one(self, target):
+                raise AssertionError('Dense ratings should not be needed.')
+            def top_for_one(self, target, max_number_of_items):
+                self.requested.append(max_number_of_items)
+                return algorithm.top_for_one(target, max_number_of_items)
+        return MockUp()
+
+    def test_top_for_one_is_used_instead_of_dense_ratings(self):
+        algorithm = self.top_for_one_only()
+        recommender = self.recommender.using(algorithm)
+        for target in self.data.user.index_of.keys():
+            index = self.data.user.index_of[target]
+            bought = self.data.matrix.by_row[index].indices
+            with self.assertLogs(level=logging.INFO):
+                logging.info('Log at least once.')
+                items = list(recommender.pruning_old.for_one(target, 3))
+                ranked = recommender.pruning_old.ranked_for_one(
+                    target, 3, structured=True)
+            self.assertListEqual(items, ranked['item'].tolist())
+            self.assertEqual(algorithm.requested[-1], 3 + bought.size)
+            item_scores = self.algorithm.for_one(index)
+            item_scores[bought] = float('-inf')
+            should_be = sorted(item_scores, reverse=True)[:3]
+            self.assertListEqual(ranked['score'].tolist(), should_be)
+
+    def test_top_for_one_asks_for_more_if_too_many_pruned(self):
+        algorithm = self.top_for_one_only()
+        recommender = self.recommender.using(algorithm).keeping_old
+        should_be = [item for item, _ in recommender.ranked_for_one('7', 6)]
+        self.assertListEqual(algorithm.requested, [6])
+        recommender.excluding('stock', should_be[:2])
+        recommended = list(recommender.for_one('7', 2))
+        self.assertListEqual(recommended, should_be[2:4])
+        self.assertListEqual(algorithm.requested, [6, 2, 4])
+
+    def test_for_basket_agrees_with_known_customer(self):
+        index = self.data.user.index_of['7']
+        bought = self.data.matrix.by_row[index].indices
+        basket = [self.data.item.id_of[item] for item in bought]
+        item_scores = self.algorithm.operating_on(self.data).for_one(index)
+        for recommender in (self.recommender.pruning_old,
+                            self.recommender.keeping_old):
+            should_be = [score for _, score
+                         in recommender.ranked_for_one('7', 4)]
+            actually_is = [item_scores[self.data.item.index_of[item]]
+                           for item in recommender.for_basket(basket, 4)]
+            self.assertListEqual(actually_is, should_be)
+
+    def test_for_basket_ignores_unknown_articles(self):
+        basket = [self.data.item.id_of[7], 'foo', self.data.item.id_of[2]]
+        self.assertListEqual(list(self.recommender.for_basket(basket)),
+                             list(self.recommender.for_basket(basket[::2])))
+
+    def test_for_basket_prunes_basket_only_if_only_new(self):
+        basket = [self.data.item.id_of[7], self.data.item.id_of[2]]
+        count = self.data.item.count
+        pruned = list(self.recommender.pruning_old.for_basket(basket,
+                                                               count - 2))
+        self.assertEqual(len(set(pruned) & set(basket)), 0)
+        kept = list(self.recommender.keeping_old.for_basket(basket, count))
+        self.assertEqual(len(set(kept) & set(basket)), 2)
+
+    def test_for_basket_without_known_articles_gets_baseline(self):
+        log_msg = ['INFO:root:No known articles in basket. Defaulting to'
+                   ' baseline recommendation.']
+        baseline = default_baseline().operating_on(self.data)
+        should_be = [self.data.item.id_of[index] for index
+                     in baseline.top_for_one(None, 3)[0]]
+        with self.assertLogs(level=logging.INFO) as log:
+            recommended = list(self.recommender.for_basket(['foo'], 3))
+        self.assertEqual(log.output, log_msg)
+        self.assertListEqual(recommended, should_be)
+
+    def test_for_basket_rated_all_the_same_gets_baseline(self):
+        log_msg = ['INFO:root:All articles rated the same for this basket.'
+                   ' Defaulting to baseline recommendation.']
+        uncomparable = self.data.user.index_of['4']
+        basket = [self.data.item.id_of[item] for item
+                  in self.data.matrix.by_row[uncomparable].indices]
+        baseline = default_baseline().operating_on(self.data)
+        should_be = [self.data.item.id_of[index] for index
+                     in baseline.top_for_one(None, 10)[0]
+                     if self.data.item.id_of[index] not in basket][:3]
+        with self.assertLogs(level=logging.INFO) as log:
+            recommended = list(self.recommender.for_basket(basket, 3))
+        self.assertEqual(log.output, log_msg)
+        self.assertListEqual(recommended, should_be)
+
+    def test_for_basket_leaves_data_unchanged(self):
+        by_row = self.data.matrix.by_row.copy()
+        basket = [self.data.item.id_of[7], self.data.item.id_of[2]]
+        for algorithm in (DefaultAlgorithm(), TruncatedSVD()):
+            with self.assertLogs(level=logging.WARNING):
+                logging.warning('Log at least once.')
+                _ = list(self.recommender.using(algorithm).for_basket(basket))
+        self.assertEqual((self.data.matrix.by_row != by_row).nnz, 0)
+        self.assertEqual(self.data.user.count, 12)
+
+    def test_for_basket_with_algorithm_lacking_for_history(self):
+        log_msg = ['ERROR:root:Attempt to rate a basket with an algorithm'
+                   ' lacking a "for_history()" method.']
+        err_msg = ('Algorithm cannot rate baskets! Use, e.g.,'
+                   ' CollaborativeFiltering or TruncatedSVD.')
+        recommender = self.recommender.using(default_baseline())
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(AttributeError, msg=err_msg) as err:
+                _ = recommender.for_basket([self.data.item.id_of[7]], 3)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_for_item_returns_most_similar_articles(self):
+        algorithm = DefaultAlgorithm().operating_on(self.data)
+        item = 7
+        should_be = [self.data.item.id_of[index] for index
+                     in algorithm.similar_to_one(item, 4)[0]]
+        similar = self.recommender.for_item(self.data.item.id_of[item], 4)
+        self.assertListEqual(list(similar), should_be)
+
+    def test_for_item_unknown_article_gets_baseline(self):
+        log_msg = ['INFO:root:Unknown target article. Defaulting to'
+                   ' baseline recommendation.']
+        baseline = default_baseline().operating_on(self.data)
+        should_be = [self.data.item.id_of[index] for index
+                     in baseline.top_for_one(None, 3)[0]]
+        with self.assertLogs(level=logging.INFO) as log:
+            similar = list(self.recommender.for_item('foo', 3))
+        self.assertEqual(log.output, log_msg)
+        self.assertListEqual(similar, should_be)
+
+    def test_for_item_with_algorithm_lacking_similar_articles(self):
+        log_msg = ['ERROR:root:Attempt to find similar articles with an'
+                   ' algorithm lacking a "similar_to_one()" method.']
+        err_msg = ('Algorithm cannot find similar articles!'
+                   ' Use, e.g., CollaborativeFiltering.')
+        recommender = self.recommender.using(TruncatedSVD())
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(AttributeError, msg=err_msg) as err:
+                _ = recommender.for_item(self.data.item.id_of[7], 3)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_for_items_agrees_with_for_item(self):
+        targets = [self.data.item.id_of[index] for index in (7, 0, 2)]
+        targets.append('foo')
+        with self.assertLogs(level=logging.INFO):
+            items, scores = self.recommender.for_items(targets, 8)
+        self.assertEqual(items.shape, (4, 8))
+        self.assertEqual(scores.shape, (4, 8))
+        for row, target in enumerate(targets):
+            with self.assertLogs(level=logging.INFO):
+                logging.info('Log at least once.')
+                similar = list(self.recommender.for_item(target, 8))
+            known = items[row][items[row] >= 0]
+            self.assertListEqual([self.data.item.id_of[index]
+                                  for index in known], similar)
+        self.assertTrue((items[1] == -1).all())
+
+    def item_ids(self, indices):
+        return [self.data.item.id_of[index] for index in indices]
+
+    def test_no_filters_by_default(self):
+        self.assertDictEqual(self.recommender.filters, {})
+
+    def test_filter_methods_return_recommender(self):
+        recommender = self.recommender.excluding('foo', [])
+        self.assertIs(recommender, self.recommender)
+        recommender = self.recommender.updating('foo', excluded=[])
+        self.assertIs(recommender, self.recommender)
+        recommender = self.recommender.dropping('foo')
+        self.assertIs(recommender, self.recommender)
+
+    def test_filter_versions(self):
+        self.recommender.excluding('stock', self.item_ids([1, 2]))
+        self.recommender.excluding('adult', self.item_ids([3]))
+        self.recommender.updating('stock', excluded=self.item_ids([4]))
+        self.recommender.updating('stock', included=self.item_ids([1]))
+        self.assertDictEqual(self.recommender.filters,
+                             {'stock': 2, 'adult': 0})
+        self.recommender.excluding('adult', self.item_ids([5]))
+        self.assertDictEqual(self.recommender.filters,
+                             {'stock': 2, 'adult': 1})
+        self.recommender.dropping('stock')
+        self.assertDictEqual(self.recommender.filters, {'adult': 1})
+
+    def test_error_on_wrong_type_of_filter_name(self):
+        log_msg = ['ERROR:root:Attempt to name filter with non-string type.']
+        err_msg = 'Filter name must be a string!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.recommender.excluding(1, self.item_ids([1]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_changing_unregistered_filter(self):
+        log_msg = ['ERROR:root:Attempt to change unregistered filter.']
+        err_msg = 'There is no filter named "stock"!'
+        for change in (self.recommender.dropping, self.recommender.updating):
+            with self.assertLogs(level=logging.ERROR) as log:
+                with self.assertRaises(KeyError, msg=err_msg) as err:
+                    change('stock')
+            self.assertEqual(log.output, log_msg)
+            self.assertEqual(err.msg, err_msg)
+
+    def test_error_if_filters_exclude_all_articles(self):
+        log_msg = ['ERROR:root:All articles are excluded by filters.']
+        err_msg = ('No articles left to recommend! Drop or update'
+                   ' some filters.')
+        self.recommender.excluding('all', self.item_ids(range(23)))
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = self.recommender.for_one('7')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_filters_apply_to_all_recommendations(self):
+        excluded = self.item_ids(range(10)) + self.item_ids([20, 21, 22])
+        self.recommender.excluding('stock', excluded[:10])
+        self.recommender.excluding('adult', excluded[10:])
+        for recommender in (self.recommender.pruning_old,
+                            self.recommender.keeping_old):
+            for sparse in (False, True):
+                recommender.sparse = sparse
+                for target in ('7', '4', 'foo'):
+                    with self.assertLogs(level=logging.WARNING):
+                        recommended = list(recommender.for_one(target, 23))
+                        ranked = recommender.ranked_for_one(target, 23,
+                                                            structured=True)
+                    self.assertEqual(len(recommended), 10)
+                    self.assertEqual(len(ranked), 10)
+                    self.assertFalse(set(recommended) & set(excluded))
+                    self.assertFalse(set(ranked['item']) & set(excluded))
+        with self.assertLogs(level=logging.WARNING):
+            items, _ = self.recommender.for_many(['7', '4', 'foo'], 23)
+        self.assertEqual(items.shape, (3, 10))
+        self.assertTrue((items >= 10).all() & (items < 20).all())
+        with self.assertLogs(level=logging.WARNING):
+            basket = list(self.recommender.for_basket(self.item_ids([7]), 23))
+        self.assertFalse(set(basket) & set(excluded))
+
+    def test_filtered_for_one_is_unfiltered_minus_excluded(self):
+        excluded = self.item_ids([22, 21, 8])
+        should_be = [item for item, _ in self.recommender.ranked_for_one(
+            '7', 23) if item not in excluded]
+        with self.assertLogs(level=logging.WARNING):
+            self.recommender.excluding('stock', excluded)
+            recommended = self.recommender.ranked_for_one('7', 23)
+        self.assertListEqual([item for item, _ in recommended], should_be)
+
+    def test_filters_apply_to_similar_articles(self):
+        similar = list(self.recommender.for_item(self.item_ids([7])[0], 6))
+        self.recommender.excluding('stock', similar[:2])
+        filtered = list(self.recommender.for_item(self.item_ids([7])[0], 6))
+        self.assertListEqual(filtered, similar[2:])
+        items, scores = self.recommender.for_items(self.item_ids([7]), 6)
+        self.assertListEqual(self.item_ids(items[0, :4]), similar[2:])
+        self.assertTrue((items[0, 4:] == -1).all())
+        self.assertTrue((scores[0, 4:] == float('-inf')).all())
+
+    def test_updating_filter_changes_recommendations(self):
+        top = list(self.recommender.for_one('7', 1))
+        self.recommender.excluding('stock', [])
+        self.recommender.updating('stock', excluded=top)
+        self.assertNotEqual(list(self.recommender.for_one('7', 1)), top)
+        self.recommender.updating('stock', included=top)
+        self.assertEqual(list(self.recommender.for_one('7', 1)), top)
+
+    def test_cache_follows_filters(self):
+        recommender = self.recommender.caching(10)
+        top = list(recommender.for_one('7', 1))
+        recommender.excluding('stock', top)
+        self.assertNotEqual(list(recommender.for_one('7', 1)), top)
+        self.assertEqual(recommender.cache_hits, 0)
+
+    def test_cache_recomputes_after_baseline_of_algorithm_is_swapped(self):
+        baseline = default_baseline()
+        algorithm = DefaultAlgorithm()
+        algorithm.baseline = baseline
+        recommender = self.recommender.using(algorithm).caching(100)
+        baseline.binarize = False
+        targets = list(self.data.user.index_of.keys())
+        with self.assertLogs(level=logging.INFO):
+            for target in targets:
+                _ = list(recommender.for_one(target, 5))
+            version = algorithm.version
+            algorithm.baseline = default_baseline()
+            self.assertGreater(algorithm.version, version)
+            cached = [list(recommender.for_one(target, 5))
+                      for target in targets]
+        self.assertEqual(recommender.cache_hits, 0)
+        fresh = RecoBasedOn(self.data).using(algorithm)
+        with self.assertLogs(level=logging.INFO):
+            should_be = [list(fresh.for_one(target, 5)) for target in targets]
+        self.assertListEqual(cached, should_be)
+
+    def test_cache_skipped_for_unversioned_baseline(self):
+        class MockUp():
+            has_data = True
+            calls = 0
+            def operating_on(self, data):
+                self.baseline = default_baseline().operating_on(data)
+                return self
+            def for_one(self, target=None):
+                MockUp.calls += 1
+                return self.baseline.for_one() * (-1) ** MockUp.calls
+        self.recommender.baseline = MockUp()
+        recommender = self.recommender.caching(10)
+        with self.assertLogs(level=logging.INFO):
+            first = list(recommender.for_one('john doe', 3))
+            second = list(recommender.for_one('john doe', 3))
+        self.assertFalse(first == second)
+        self.assertEqual(recommender.cache_hits, 0)
+        self.assertEqual(recommender.cache_misses, 0)
+
+    def test_cache_disabled_by_default(self):
+        _ = list(self.recommender.for_one('7', 4))
+        _ = list(self.recommender.for_one('7', 4))
+        self.assertEqual(self.recommender.cache_hits, 0)
+        self.assertEqual(self.recommender.cache_misses, 0)
+
+    def test_caching_returns_recommender(self):
+        recommender = self.recommender.caching(10)
+        self.assertIsInstance(recommender, RecoBasedOn)
+
+    def test_cache_hits_and_misses(self):
+        recommender = self.recommender.caching(10)
+        should_be = list(recommender.for_one('7', 4))
+        actually_is = list(recommender.for_one('7', 4))
+        _ = list(recommender.for_one('7', 3))
+        self.assertListEqual(should_be, actually_is)
+        self.assertEqual(recommender.cache_hits, 1)
+        self.assertEqual(recommender.cache_misses, 2)
+
+    def test_cache_distinguishes_only_new(self):
+        recommender = self.recommender.caching(10)
+        pruned = list(recommender.pruning_old.for_one('7', 4))
+        kept = list(recommender.keeping_old.for_one('7', 4))
+        self.assertFalse(pruned == kept)
+        self.assertEqual(recommender.cache_hits, 0)
+
+    def test_cache_invalidated_by_algorithm_change(self):
+        algorithm = TruncatedSVD()
+        algorithm.number_of_factors = 2
+        recommender = self.recommender.using(algorithm).caching(10)
+        before = list(recommender.for_one('7', 4))
+        algorithm.binarize = False
+        after = list(recommender.for_one('7', 4))
+        self.assertFalse(before == after)
+        self.assertEqual(recommender.cache_hits, 0)
+
+    def test_cache_emptied_by_setting_algorithm(self):
+        recommender = self.recommender.caching(10)
+        _ = list(recommender.for_one('7', 4))
+        algorithm = TruncatedSVD()
+        algorithm.number_of_factors = 2
+        _ = list(recommender.using(algorithm).for_one('7', 4))
+        self.assertEqual(recommender.cache_hits, 0)
+
+    def test_cold_start_ranking_computed_once(self):
+        class MockUp():
+            has_data = True
+            version = 0
+            calls = 0
+            def operating_on(self, data):
+                self.baseline = default_baseline().operating_on(data)
+                return self
+            def for_one(self, target=None):
+                MockUp.calls += 1
+                return self.baseline.for_one()
+        self.recommender.baseline = MockUp()
+        with self.assertLogs(level=logging.INFO):
+            first = list(self.recommender.for_one('john doe', 2))
+            second = list(self.recommender.for_one('jane doe', 3))
+            _ = self.recommender.for_many(['jim doe'], 4)
+        self.assertListEqual(first, second[:2])
+        self.assertEqual(MockUp.calls, 1)
+
+    def test_cold_start_ranking_follows_baseline_version(self):
+        baseline = default_baseline()
+        self.recommender.baseline = baseline
+        with self.assertLogs(level=logging.INFO):
+            before = list(self.recommender.ranked_for_one('john doe', 3))
+            baseline.binarize = False
+            after = list(self.recommender.ranked_for_one('john doe', 3))
+        should_be = sorted(baseline.for_one().tolist(), reverse=True)[:3]
+        self.assertFalse(before == after)
+        self.assertListEqual(should_be, [score for _, score in after])
+
+    def test_cold_start_ranking_without_baseline_version(self):
+        class MockUp():
+            has_data = True
+            calls = 0
+            def operating_on(self, data):
+                self.baseline = default_baseline().operating_on(data)
+                return self
+            def for_one(self, target=None):
+                MockUp.calls += 1
+                item_scores = self.baseline.for_one()
+                if MockUp.calls > 1:
+                    item_scores = -item_scores
+                return item_scores
+        self.recommender.baseline = MockUp()
+        with self.assertLogs(level=logging.INFO):
+            first = list(self.recommender.ranked_for_one('john doe', 3))
+            second = list(self.recommender.ranked_for_one('john doe', 3))
+        self.assertEqual(MockUp.calls, 2)
+        self.assertFalse(first == second)
+        should_be = sorted((-default_baseline().operating_on(self.data)
+                            .for_one()).tolist(), reverse=True)[:3]
+        self.assertListEqual(should_be, [score for _, score in second])
+
 
 if __name__ == '__main__':
     ut.main()